@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Vault Link Benchmarks
+Times every converter's core functions and full-tree runs on reproducible
+synthetic vaults, and writes the results as JSON for comparing commits
+
+Usage:
+    python3 scripts/bench-vault.py                             # 1k and 10k note vaults
+    python3 scripts/bench-vault.py --sizes 1k,10k,100k,1M      # Larger vaults
+    python3 scripts/bench-vault.py --only micro --repeat 5     # Core functions only
+    python3 scripts/bench-vault.py --out new.json --compare old.json
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vaultlinks.cli import run_command
+
+if __name__ == "__main__":
+    exit(run_command('bench'))
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Broken Link Checker
+Reports markdown links whose target does not exist in the vault, with
+file and line, and exits non-zero so CI can fail on them
+
+Usage:
+    python3 scripts/check-links.py                    # Check the vault in the current directory
+    python3 scripts/check-links.py --jobs 0 /vault    # One worker per CPU
+    python3 scripts/check-links.py --wikilinks        # Also report [[links]] to missing notes
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vaultlinks.cli import run_command
+
+if __name__ == "__main__":
+    exit(run_command('check'))
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Move Note
+Moves a note or a whole folder inside the vault and fixes the links to it.
+Only the notes that link to what moved (found through the persisted
+backlink index) are read and rewritten, plus the moved notes themselves.
+
+Usage:
+    python3 scripts/move-note.py "API Design.md" 02-backend/api/         # Into a folder
+    python3 scripts/move-note.py 02-backend/auth 02-backend/security     # Rename a folder
+    python3 scripts/move-note.py --dry-run Old.md New.md                 # Show what would change
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vaultlinks.cli import run_command
+
+if __name__ == "__main__":
+    exit(run_command('move'))
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Vault Doctor
+Runs the link fixers as stages of a single pass: each note is read once,
+every enabled fixer is applied in memory, and the note is written at most once
+
+Usage:
+    python3 scripts/vault-doctor.py                          # The --convert stage
+    python3 scripts/vault-doctor.py --convert --fix-encoding # Chosen stages only
+    python3 scripts/vault-doctor.py --mapping moves.json     # Also remap moved notes
+    python3 scripts/vault-doctor.py --jobs 0 /path/to/vault  # One worker per CPU
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vaultlinks.cli import run_command
+
+if __name__ == "__main__":
+    exit(run_command('doctor'))
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Vault Links
+Single entry point for the link commands; only the module of the command
+being run is imported
+
+Usage:
+    python3 scripts/vault.py convert --staged          # What the pre-commit hook runs
+    python3 scripts/vault.py check --jobs 0            # Any command, see --help
+    python3 scripts/vault.py serve &                   # Keep the commands loaded
+    python3 scripts/vault.py --server convert --staged # Run through the server
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from vaultlinks.cli import main
+
+if __name__ == "__main__":
+    exit(main())
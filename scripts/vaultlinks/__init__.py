@@ -0,0 +1,3 @@
+"""
+Shared helpers for the vault link maintenance scripts
+"""
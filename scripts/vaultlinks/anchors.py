@@ -0,0 +1,146 @@
+"""
+Heading slugs and block ids of a note, for [[Note#Heading]] links
+
+GitHub gives every heading an anchor: its rendered text lower-cased,
+with punctuation removed and spaces turned into hyphens, and -1, -2 ...
+appended to repeated slugs. read_anchors() computes these once per note
+and maps what an Obsidian link can name to them:
+
+    heading key (case-folded heading text, as written or as rendered)  -> slug
+    ^block id  -> slug of the enclosing heading
+
+GitHub has no anchors for blocks, so [[Note#^id]] links to the section
+the block is in. The note index stores these maps, so resolving an
+anchor is a dictionary lookup on the target note's entry.
+"""
+
+import re
+import unicodedata
+
+# Heading lines and fence lines (after their line break), and ^block ids
+# at the end of a line. Every match starts with '\n' or '^', which lets
+# the regex engine skip ahead to those characters instead of trying a
+# match at every offset.
+_ANCHOR_LINE = re.compile(r'''
+    \n[ ]{0,3}(?:
+        (?P<fence>(?P<fence_char>[`~])(?P=fence_char){2,})(?P<info>[^\n]*)
+        |\#{1,6}(?:[ \t]+(?P<heading>[^\n]*?))??(?:[ \t]+\#+)?[ \t]*
+    )$
+    |\^(?P<block>[A-Za-z0-9-]+)[ \t]*$
+''', re.VERBOSE | re.MULTILINE)
+
+_FRONTMATTER = re.compile(r'---[ \t]*\n(?:.*?\n)??(?:---|\.\.\.)[ \t]*(?:\n|\Z)', re.DOTALL)
+
+# Characters Obsidian does not keep in a link to a heading
+_LINK_UNSAFE = re.compile(r'[#^|:\[\]\\]+')
+
+_CODE_SPAN = re.compile(r'(`+)(.+?)\1')
+_IMAGE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+_WIKILINK = re.compile(r'\[\[(?:[^\]|]*\|)?([^\]]*)\]\]')
+_HTML_TAG = re.compile(r'<[^>\n]+>')
+# Underscores delimiting emphasis, not the ones inside snake_case words
+_EMPHASIS_UNDERSCORE = re.compile(r'(?<![^\W_])_+|_+(?![^\W_])')
+
+
+def heading_key(text):
+    """How a [[Note#Heading]] fragment and a heading are matched: case-folded, unsafe characters as spaces"""
+    return ' '.join(_LINK_UNSAFE.sub(' ', text).split()).casefold()
+
+
+def _rendered_text(heading):
+    """Approximate text of a heading as GitHub renders it, markup removed"""
+    parts = []
+    pos = 0
+    for match in _CODE_SPAN.finditer(heading):
+        parts.append(_plain_text(heading[pos:match.start()]))
+        parts.append(match.group(2))
+        pos = match.end()
+    parts.append(_plain_text(heading[pos:]))
+    return ''.join(parts)
+
+
+def _plain_text(text):
+    text = _IMAGE.sub('', text)
+    text = _LINK.sub(r'\1', text)
+    text = _WIKILINK.sub(r'\1', text)
+    text = _HTML_TAG.sub('', text)
+    return _EMPHASIS_UNDERSCORE.sub('', text)
+
+
+def heading_slug(heading):
+    """GitHub's anchor for a heading, before repeated slugs are numbered"""
+    kept = []
+    for char in _rendered_text(heading).strip().lower():
+        if char == ' ':
+            kept.append('-')
+        elif char == '-' or char.isalnum() or unicodedata.category(char) in ('Pc', 'Mn', 'Mc', 'Me'):
+            kept.append(char)
+    return ''.join(kept)
+
+
+def fragment_slug(fragment):
+    """Best-effort anchor of a link fragment without an index of the target note
+
+    The last heading of a 'Heading#Subheading' path is slugged; block ids
+    give '', as they only resolve through the note's headings.
+    """
+    last = fragment.split('#')[-1].strip()
+    if not last or last.startswith('^'):
+        return ''
+    return heading_slug(last)
+
+
+def read_anchors(segments):
+    """{heading key or ^block id: slug} of a note
+
+    `segments` yields (text, in_code) pieces of the note, as
+    vaultlinks.stream.segments does; a note read whole is one
+    [(text, False)]. The first heading with a key wins, as in Obsidian.
+    """
+    anchors = {}
+    seen = {}
+    section = ''
+    first = True
+    for text, in_code in segments:
+        if in_code:
+            first = False
+            continue
+        # Offsets in text are one less than in the scanned copy, so the
+        # frontmatter ends just before the line break that starts the body
+        start = 0
+        if first:
+            first = False
+            frontmatter = _FRONTMATTER.match(text)
+            if frontmatter is not None:
+                start = frontmatter.end()
+        text = '\n' + text
+
+        fence = None
+        for match in _ANCHOR_LINE.finditer(text, start):
+            fence_open = match.group('fence')
+            if fence is not None:
+                if fence_open is not None and fence_open[0] == fence[0] and len(fence_open) >= len(fence) \
+                        and not match.group('info').strip():
+                    fence = None
+                continue
+            if fence_open is not None:
+                fence = fence_open
+            elif match.group('block') is not None:
+                # Block ids follow a space, or stand on a line of their own
+                if text[match.start() - 1] in ' \t\n':
+                    anchors.setdefault('^' + match.group('block'), section)
+            else:
+                heading = (match.group('heading') or '').strip()
+                slug = heading_slug(heading)
+                # github-slugger numbers repeats from the first slug: a, a-1, a-2
+                if slug in seen:
+                    base = slug
+                    while slug in seen:
+                        seen[base] += 1
+                        slug = f'{base}-{seen[base]}'
+                seen[slug] = 0
+                section = slug
+                anchors.setdefault(heading_key(heading), slug)
+                anchors.setdefault(heading_key(_rendered_text(heading)), slug)
+    return anchors
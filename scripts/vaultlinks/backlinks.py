@@ -0,0 +1,292 @@
+"""
+Persisted reverse-reference (backlink) index and note moves
+
+For every note the index records the vault paths its links point to,
+with the offsets of each link, and inverts that into target -> referencing
+notes. It is stored under .cache/vaultlinks/ and refreshed like the note
+index: only notes whose size or mtime changed are scanned again. Moving a
+note then only has to read and patch the notes that link to it.
+
+Markdown link targets depend only on the linking note, but a [[wikilink]]
+resolves differently when notes are added, renamed or given aliases. The
+cache therefore keeps wikilink names as written, and every build resolves
+them again against the current note index.
+"""
+
+import json
+import os
+import posixpath
+import urllib.parse
+
+from . import scanner
+from .manifest import CACHE_DIR
+from .noteindex import walk_notes
+
+FORMAT_VERSION = 3
+
+INDEX_NAME = 'backlinks.json'
+
+
+def split_fragment(target):
+    """'path#heading' -> ('path', '#heading')"""
+    path, hash_mark, fragment = target.partition('#')
+    return path, hash_mark + fragment
+
+
+def link_relpath(target, source_relpath):
+    """Vault-relative path a markdown link target points to, or None
+
+    The target is URL-decoded and resolved against the linking note's
+    folder; a leading '/' is relative to the vault root. Pure #anchors,
+    external URLs and paths leaving the vault give None.
+    """
+    if scanner.is_external(target):
+        return None
+    path = split_fragment(target)[0].strip()
+    if path.startswith('<') and path.endswith('>'):
+        path = path[1:-1]
+    if not path:
+        return None
+
+    path = urllib.parse.unquote(path)
+    if path.startswith('/'):
+        relpath = posixpath.normpath(path.lstrip('/'))
+    else:
+        relpath = posixpath.normpath(posixpath.join(posixpath.dirname(source_relpath), path))
+    if relpath == '..' or relpath.startswith('../'):
+        return None
+    return relpath
+
+
+def token_relpath(token, source_relpath, note_index=None):
+    """Vault-relative path a scanned link refers to, or None"""
+    if token.kind == scanner.LINK:
+        return link_relpath(token.target, source_relpath)
+    if token.kind in (scanner.WIKILINK, scanner.ALIAS) and note_index is not None:
+        return note_index.resolve_link(split_fragment(token.target)[0], source_relpath)
+    return None
+
+
+class BacklinkIndex:
+    """Outgoing links per note, inverted into target path -> referencing notes"""
+
+    def __init__(self, root, note_index=None):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, CACHE_DIR, INDEX_NAME)
+        self.note_index = note_index
+        # relpath -> [size, mtime_ns, [[target, start, end], ...], [[wikilink name, start, end], ...]]
+        self.notes = {}
+        self.links = {}     # relpath -> [[target, start, end], ...] of every resolved link
+        self.referrers = {}
+        self.dirty = False
+
+    @classmethod
+    def build(cls, root, note_index=None, persist=True):
+        """Load the cached index and rescan notes changed since it was written"""
+        index = cls(root, note_index)
+        cached = {}
+        written_ns = 0
+        if persist:
+            try:
+                with open(index.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    written_ns = os.fstat(f.fileno()).st_mtime_ns
+                if data.get('format') == FORMAT_VERSION:
+                    cached = data.get('notes', {})
+            except (OSError, ValueError):
+                pass
+
+        for relpath, st in walk_notes(index.root):
+            entry = cached.get(relpath)
+            # Entries not older than the cache file itself are racy; rescan them
+            if (entry is None or entry[0] != st.st_size or entry[1] != st.st_mtime_ns
+                    or entry[1] >= written_ns):
+                entry = index._scan(relpath, st)
+                index.dirty = True
+            index.notes[relpath] = entry
+
+        if len(index.notes) != len(cached):
+            index.dirty = True
+
+        index._build_referrers()
+        if persist:
+            index.save()
+        return index
+
+    def _scan(self, relpath, st):
+        links = []
+        wikilinks = []
+        try:
+            with open(os.path.join(self.root, relpath), 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return [st.st_size, st.st_mtime_ns, links, wikilinks]
+
+        for token in scanner.scan(content):
+            if token.kind in (scanner.WIKILINK, scanner.ALIAS):
+                name = split_fragment(token.target)[0]
+                if name.strip():
+                    wikilinks.append([name, token.start, token.end])
+                continue
+            target = token_relpath(token, relpath)
+            if target is not None:
+                links.append([target, token.start, token.end])
+        return [st.st_size, st.st_mtime_ns, links, wikilinks]
+
+    def _resolve_links(self):
+        """Resolve every note's wikilinks against the note index, merged with its other links"""
+        self.links = {}
+        resolved = {}   # (name, folder of the linking note) -> relpath, as resolution only depends on those
+        for source, (_, _, links, wikilinks) in self.notes.items():
+            if not wikilinks or self.note_index is None:
+                self.links[source] = links
+                continue
+            folder = posixpath.dirname(source)
+            merged = list(links)
+            for name, start, end in wikilinks:
+                key = (name, folder)
+                if key not in resolved:
+                    resolved[key] = self.note_index.resolve_link(name, source)
+                if resolved[key] is not None:
+                    merged.append([resolved[key], start, end])
+            merged.sort(key=lambda link: link[1])
+            self.links[source] = merged
+
+    def _build_referrers(self):
+        self._resolve_links()
+        self.referrers = {}
+        for source, links in self.links.items():
+            for target, _, _ in links:
+                sources = self.referrers.setdefault(target, [])
+                if not sources or sources[-1] != source:
+                    sources.append(source)
+
+    def update(self, relpaths):
+        """Rescan the given notes (vault-relative) after they were written, moved or deleted"""
+        for relpath in relpaths:
+            try:
+                st = os.stat(os.path.join(self.root, relpath))
+            except OSError:
+                self.notes.pop(relpath, None)
+                continue
+            if relpath.endswith('.md'):
+                self.notes[relpath] = self._scan(relpath, st)
+        self.dirty = True
+        self._build_referrers()
+
+    def backlinks(self, target):
+        """[(source, start, end), ...] for every link to the vault path target"""
+        result = []
+        for source in self.referrers.get(target, []):
+            for link_target, start, end in self.links[source]:
+                if link_target == target:
+                    result.append((source, start, end))
+        return result
+
+    def referencing(self, targets):
+        """Notes linking to any of the given vault paths, sorted"""
+        sources = set()
+        for target in targets:
+            sources.update(self.referrers.get(target, []))
+        return sorted(sources)
+
+    def save(self):
+        """Write the index atomically if anything changed"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': FORMAT_VERSION, 'notes': self.notes}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def plan_moves(root, source, destination):
+    """Vault-relative {old path: new path} for moving a file or folder
+
+    As with mv, a destination that is an existing folder receives the
+    source inside it. Hidden files are not moved.
+    """
+    root = os.path.abspath(root)
+    source = os.path.abspath(source)
+    destination = os.path.abspath(destination)
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source))
+    if os.path.exists(destination):
+        raise ValueError(f"{os.path.relpath(destination)} already exists")
+
+    def rel(path):
+        relpath = os.path.relpath(path, root).replace(os.sep, '/')
+        if relpath == '..' or relpath.startswith('../'):
+            raise ValueError(f"{path} is outside the vault")
+        return relpath
+
+    if os.path.isfile(source):
+        return {rel(source): rel(destination)}
+    if not os.path.isdir(source):
+        raise ValueError(f"{source} does not exist")
+
+    moves = {}
+    for folder, dirs, files in os.walk(source):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+        for name in sorted(files):
+            if name.startswith('.'):
+                continue
+            old = os.path.join(folder, name)
+            moves[rel(old)] = rel(os.path.join(destination, os.path.relpath(old, source)))
+    return moves
+
+
+def _link_target(relpath, fragment, source_relpath):
+    target = posixpath.relpath(relpath, posixpath.dirname(source_relpath) or '.')
+    return urllib.parse.quote(target) + fragment
+
+
+def _wikilink_name(token, old_target, new_target):
+    """New name for a [[wikilink]] to a moved note, or None if it still resolves"""
+    name, fragment = split_fragment(token.target)
+    # Notes are named without .md, other files with their extension
+    new_name = new_target[:-3] if new_target.endswith('.md') else new_target
+    if '/' in name.replace('\\', '/'):
+        return new_name + fragment
+    if posixpath.basename(old_target) != posixpath.basename(new_target):
+        return posixpath.basename(new_name) + fragment
+    return None
+
+
+def patch_links(content, old_source, new_source, moves, note_index=None):
+    """Rewrite the links in one note for a move; returns (new_content, count)
+
+    Links to moved files are pointed at their new location, and when the
+    note itself moved, its other relative links are re-based on its new
+    folder. Links to unmoved files from unmoved notes are left untouched.
+    """
+    source_moved = old_source != new_source
+
+    def replace_link(token):
+        old_target = token_relpath(token, old_source, note_index)
+        if old_target is None:
+            return None
+        new_target = moves.get(old_target, old_target)
+        if new_target == old_target and not source_moved:
+            return None
+
+        if token.kind == scanner.LINK:
+            old_path = posixpath.relpath(old_target, posixpath.dirname(old_source) or '.')
+            new_path = posixpath.relpath(new_target, posixpath.dirname(new_source) or '.')
+            if old_path == new_path:
+                return None
+            fragment = split_fragment(token.target)[1]
+            return f'[{token.text}]({_link_target(new_target, fragment, new_source)})'
+
+        name = _wikilink_name(token, old_target, new_target) if new_target != old_target else None
+        if name is None:
+            return None
+        bang = '!' if token.embed else ''
+        if token.kind == scanner.ALIAS:
+            return f'{bang}[[{name}|{token.text}]]'
+        return f'{bang}[[{name}]]'
+
+    content, _, rewritten = scanner.rewrite(content, replace_link)
+    return content, sum(rewritten.values())
@@ -0,0 +1,137 @@
+"""
+Conversion results keyed by git blob id, shared through a git notes ref
+
+Whether a note needs converting depends only on its content, so the
+verdict can be keyed by the note's blob id and reused by every clone
+that has the same blob: a fresh CI checkout skips the notes some other
+machine already found clean, without opening them. Results live as git
+notes on the blobs under refs/notes/vaultlinks, one line per converter
+and version:
+
+    convert-obsidian-links 1 clean
+    convert-obsidian-links 1 <converted blob id> <links fixed>
+
+The ref is pushed and fetched like any other:
+
+    git push origin refs/notes/vaultlinks
+    git fetch origin refs/notes/vaultlinks:refs/notes/vaultlinks
+
+Lines only ever get added for a blob, so concurrent updates merge with
+`git notes --ref=vaultlinks merge -s cat_sort_uniq`. New results are
+written in one `git fast-import` commit on top of the ref; if the ref
+moved meanwhile, the update is dropped and the results are recorded again
+on a later run.
+"""
+
+import hashlib
+import time
+
+from .gitindex import read_blobs, run_git
+
+NOTES_REF = 'refs/notes/vaultlinks'
+
+CLEAN = 'clean'
+
+COMMITTER = 'vaultlinks <vaultlinks@localhost>'
+
+
+def blob_id(data):
+    """Git blob id of raw bytes, as `git hash-object` computes it"""
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class BlobCache:
+    """One converter's results, by blob id: CLEAN or (converted blob id, links fixed)"""
+
+    def __init__(self, name, version, cwd=None):
+        self.key = f'{name} {version}'
+        self.cwd = cwd
+        self.tip = None
+        self.paths = {}     # annotated blob id -> path of its note in the notes tree
+        self.lines = {}     # annotated blob id -> lines of other converters and versions
+        self.results = {}
+        self.pending = {}
+
+    @classmethod
+    def load(cls, name, version, cwd=None):
+        """Read the notes ref; None outside a git repository"""
+        cache = cls(name, version, cwd)
+        try:
+            run_git(['rev-parse', '--git-dir'], cwd=cwd)
+        except (RuntimeError, OSError):
+            return None
+        try:
+            cache.tip = run_git(['rev-parse', '--verify', '--quiet', f'{NOTES_REF}^{{commit}}'],
+                                cwd=cwd).decode('ascii').strip()
+        except RuntimeError:
+            return cache
+
+        # "<mode> blob <note blob>\t<annotated id, maybe fanned out as ab/cdef...>"
+        notes = {}
+        for record in run_git(['ls-tree', '-r', '-z', cache.tip], cwd=cwd).split(b'\0'):
+            if not record:
+                continue
+            meta, path = record.decode('ascii').split('\t', 1)
+            annotated = path.replace('/', '')
+            cache.paths[annotated] = path
+            notes[annotated] = meta.split(' ')[2]
+
+        # Most blobs share the note "... clean", so few note blobs are read
+        contents = read_blobs(list(notes.values()), cwd)
+        parsed = {}
+        for note_blob, data in contents.items():
+            mine, others = None, []
+            for line in data.decode('utf-8', 'replace').splitlines():
+                if line.startswith(cache.key + ' '):
+                    mine = cache._parse(line[len(cache.key) + 1:])
+                elif line:
+                    others.append(line)
+            parsed[note_blob] = (mine, others)
+        for annotated, note_blob in notes.items():
+            mine, others = parsed[note_blob]
+            if mine is not None:
+                cache.results[annotated] = mine
+            if others:
+                cache.lines[annotated] = others
+        return cache
+
+    @staticmethod
+    def _parse(value):
+        if value == CLEAN:
+            return CLEAN
+        fields = value.split(' ')
+        if len(fields) == 2 and fields[1].isdigit():
+            return fields[0], int(fields[1])
+        return None
+
+    def result(self, blob):
+        """CLEAN, (converted blob id, links fixed), or None if the blob was never seen"""
+        return self.results.get(blob)
+
+    def record(self, blob, result):
+        """Remember a result for the next save"""
+        if self.results.get(blob) != result:
+            self.results[blob] = result
+            self.pending[blob] = result
+
+    def save(self):
+        """Commit the new results onto the notes ref; True if it was updated"""
+        if not self.pending:
+            return False
+        message = f'Record {len(self.pending)} conversion results\n'.encode('utf-8')
+        stream = [f'commit {NOTES_REF}\n'
+                  f'committer {COMMITTER} {int(time.time())} +0000\n'.encode('utf-8'),
+                  b'data %d\n' % len(message), message]
+        if self.tip is not None:
+            stream.append(f'from {self.tip}\n'.encode('ascii'))
+        for blob, result in sorted(self.pending.items()):
+            line = f'{self.key} {result}' if result == CLEAN else f'{self.key} {result[0]} {result[1]}'
+            content = ('\n'.join(sorted(self.lines.get(blob, []) + [line])) + '\n').encode('utf-8')
+            stream.append(f'M 100644 inline {self.paths.get(blob, blob)}\n'.encode('ascii'))
+            stream.append(b'data %d\n' % len(content) + content)
+        try:
+            run_git(['fast-import', '--quiet'], input=b''.join(stream), cwd=self.cwd)
+        except RuntimeError:
+            return False
+        self.pending = {}
+        return True
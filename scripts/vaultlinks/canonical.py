@@ -0,0 +1,37 @@
+"""
+Canonical encoding of link targets
+
+Links that went through the converters several times end up encoded
+several times over: a space becomes %20, then %2520, %252520 and so on.
+canonical_target() collapses any depth of nesting for any character in
+one regex pass, leaving every escape encoded exactly once, instead of
+replacing a fixed list of known patterns across the whole note.
+"""
+
+import functools
+import re
+
+# A percent sign encoded one or more extra times, in front of an escape:
+# %2520, %252520, %25252F, %25C3%25A9 ...
+_NESTED_ESCAPE = re.compile(r'%(?:25)+(?=[0-9A-Fa-f]{2})')
+
+
+def collapse_encoding(text):
+    """Strip the extra encoding layers, keeping every escape single-encoded"""
+    return _NESTED_ESCAPE.sub('%', text)
+
+
+@functools.lru_cache(maxsize=65536)
+def canonical_target(target):
+    """Canonical form of a link target: every escape encoded exactly once
+
+    Only the extra layers are removed, so a target gives the same result
+    however many times it was encoded: %2F, %252F and %25252F all become
+    %2F, and %2520 becomes %20. Single escapes are never decoded, as they
+    can be part of the name (an encoded '/' is not a folder separator),
+    and characters left unencoded stay as they are. Relative paths, URLs
+    and #fragments follow the same rule.
+    """
+    if _NESTED_ESCAPE.search(target) is None:
+        return target
+    return collapse_encoding(target)
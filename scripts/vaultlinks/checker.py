@@ -0,0 +1,128 @@
+"""
+Broken-link checking against an in-memory set of vault paths
+
+Every file and folder path in the vault is collected once into a set.
+Link targets are normalized (URL-decoded, resolved against the linking
+note's folder) and checked with a set lookup, so no link costs a
+filesystem call. Notes are checked in a process pool with the path set
+installed once per worker.
+"""
+
+import bisect
+import os
+import posixpath
+from collections import namedtuple
+
+from . import prefilter, scanner, stream
+from .backlinks import link_relpath, split_fragment
+
+BrokenLink = namedtuple('BrokenLink', 'source line link target')
+BrokenLink.__doc__ = """A link whose target is not in the vault; `target` is the resolved vault path"""
+
+
+def vault_paths(root):
+    """Set of vault-relative posix paths of every file and folder, skipping hidden ones"""
+    paths = set()
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(root, rel_dir)))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            relpath = posixpath.join(rel_dir, entry.name) if rel_dir else entry.name
+            paths.add(relpath)
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(relpath)
+    return paths
+
+
+class _Lines:
+    """Offset -> 1-based line number, computed only if a note has broken links"""
+
+    def __init__(self, content):
+        self.content = content
+        self.starts = None
+
+    def line(self, offset):
+        if self.starts is None:
+            self.starts = [0]
+            pos = self.content.find('\n')
+            while pos != -1:
+                self.starts.append(pos + 1)
+                pos = self.content.find('\n', pos + 1)
+        return bisect.bisect_right(self.starts, offset)
+
+
+def check_content(content, source_relpath, paths, note_index=None, first_line=1):
+    """BrokenLinks in one note's content
+
+    Markdown links must point at an existing vault path. [[Wikilinks]] are
+    only checked when a note index is given, and are broken when no note
+    name, path or alias, and no other file of the vault, matches. `first_line` numbers the first line of
+    content, for a piece of a larger note.
+    """
+    broken = []
+    lines = _Lines(content)
+    for token in scanner.scan(content):
+        if token.kind == scanner.LINK:
+            target = link_relpath(token.target, source_relpath)
+            if target is None or target in paths:
+                continue
+        elif token.kind in (scanner.WIKILINK, scanner.ALIAS) and note_index is not None:
+            name = split_fragment(token.target)[0]
+            if not name.strip() or note_index.resolve_link(name, source_relpath) is not None:
+                continue
+            target = name
+        else:
+            continue
+        broken.append(BrokenLink(source_relpath, lines.line(token.start) + first_line - 1,
+                                 content[token.start:token.end], target))
+    return broken
+
+
+def check_file(filepath, source_relpath, paths, note_index=None):
+    """BrokenLinks in one note on disk
+
+    Notes without links are skipped unread, and notes too large to load
+    are checked piece by piece.
+    """
+    triggers = prefilter.MARKDOWN_LINKS
+    if note_index is not None:
+        triggers = prefilter.union(triggers, prefilter.WIKILINKS)
+    _, data, _ = prefilter.read_note(filepath, triggers, stream=True)
+    if data is None:
+        return []
+    if data is prefilter.STREAM:
+        broken = []
+        line = 1
+        with open(filepath, 'rb') as f:
+            for text, in_code in stream.segments(f):
+                if not in_code:
+                    broken.extend(check_content(text, source_relpath, paths, note_index, line))
+                line += text.count('\n')
+        return broken
+    return check_content(prefilter.decode(data), source_relpath, paths, note_index)
+
+
+# Path set and note index shared with pool workers through init_worker
+_worker_paths = None
+_worker_note_index = None
+
+
+def init_worker(paths, note_index=None):
+    """Pool initializer: install the vault's path set in a worker process"""
+    global _worker_paths, _worker_note_index
+    _worker_paths = paths
+    _worker_note_index = note_index
+
+
+def check_file_job(filepath, source_relpath):
+    """Worker-side check_file: returns (broken_links, error)"""
+    try:
+        return check_file(filepath, source_relpath, _worker_paths, _worker_note_index), None
+    except (OSError, UnicodeDecodeError) as e:
+        return [], str(e)
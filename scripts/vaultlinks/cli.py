@@ -0,0 +1,89 @@
+"""
+Single entry point for every vault link command
+
+    python3 scripts/vault.py <command> [options]
+
+Only the module of the command being run is imported, so the pre-commit
+hook does not pay for commands it never uses. With --server (or
+VAULTLINKS_SERVER=1) the command is sent to a running `vault serve`
+process over its local socket instead, and this process imports nothing
+beyond socket and json; if no server answers, the command runs here.
+"""
+
+import os
+import sys
+
+# Command name -> (module in vaultlinks.commands, one-line summary)
+COMMANDS = {
+    'convert': ('convert', "convert [[links]] to GitHub-compatible links (pre-commit hook)"),
+    'doctor': ('doctor', "run the link fixers as stages of one pass over the vault"),
+    'check': ('check', "report links to files that do not exist"),
+    'graph': ('graph', "query the link graph: backlinks, orphans, components, reachability"),
+    'export': ('export', "write a GitHub-ready mirror of the vault to another folder"),
+    'move': ('move', "move a note or folder and update the links to it"),
+    'rewrite-history': ('rewrite_history', "convert the links in every commit of the history"),
+    'undo': ('undo', "restore the notes changed by the last run"),
+    'remap': ('remap', "update links after notes moved, from an old -> new mapping"),
+    'convert-links': ('convert_links', "convert top-level [[links]] to [links](file.md)"),
+    'fix-all-links': ('fix_all_links', "URL-encode markdown link targets"),
+    'fix-encoding': ('fix_encoding', "fix double encoding and unencoded spaces"),
+    'fix-multiple-encoding': ('fix_multiple_encoding', "collapse %252520-style encoding"),
+    'bench': ('bench', "benchmark the commands on synthetic vaults"),
+    'serve': ('serve', "keep the commands loaded and serve them over a local socket"),
+}
+
+SERVER_ENV = 'VAULTLINKS_SERVER'
+
+
+def load_command(name):
+    """Import the module implementing a command"""
+    import importlib
+
+    module_name, _ = COMMANDS[name]
+    return importlib.import_module(f'{__package__}.commands.{module_name}')
+
+
+def run_command(name, argv=None, prog=None):
+    """Parse argv for one command and run it; returns the exit code"""
+    import argparse
+
+    module = load_command(name)
+    parser = argparse.ArgumentParser(prog=prog, description=module.DESCRIPTION)
+    module.add_arguments(parser)
+    args = parser.parse_args(argv)
+    return module.run(args)
+
+
+def usage():
+    lines = ["usage: vault.py [--server] <command> [options]", "", "commands:"]
+    lines.extend(f"  {name:<24}{summary}" for name, (_, summary) in COMMANDS.items())
+    lines.extend(["", "Run `vault.py <command> --help` for the options of a command."])
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Dispatch `vault.py [--server] <command> ...`"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    use_server = os.environ.get(SERVER_ENV) == '1'
+    if argv and argv[0] == '--server':
+        use_server = True
+        argv.pop(0)
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 1
+
+    name, argv = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"❌ Unknown command: {name}\n\n{usage()}", file=sys.stderr)
+        return 1
+
+    if use_server and name != 'serve':
+        from . import client
+
+        status = client.request([name] + argv)
+        if status is not None:
+            return status
+
+    return run_command(name, argv, prog=f"vault.py {name}")
@@ -0,0 +1,108 @@
+"""
+Client side of `vault serve`
+
+A request is one JSON line: {"argv": [...], "cwd": "...", "env": {...}},
+where env holds the client's GIT_* variables, so a hook run by `git
+commit -a` has the server read the same temporary index as git itself.
+The server streams the command's output back and ends with a NUL byte
+followed by the exit status. Only socket and json are imported here, so a hook
+talking to the server starts as fast as the interpreter itself.
+"""
+
+import json
+import os
+import socket
+import sys
+
+SOCKET_NAME = os.path.join('.cache', 'vaultlinks', 'server.sock')
+
+# Separates the command output from the exit status in a response
+END_OF_OUTPUT = b'\0'
+
+# GIT_* variables holding a path, which may be relative to the client's directory
+GIT_PATH_VARIABLES = ('GIT_DIR', 'GIT_WORK_TREE', 'GIT_INDEX_FILE', 'GIT_OBJECT_DIRECTORY', 'GIT_COMMON_DIR')
+
+
+def socket_path(root):
+    return os.path.join(root, SOCKET_NAME)
+
+
+def find_socket(start):
+    """Socket of a server for the vault containing `start`, or None"""
+    path = os.path.abspath(start)
+    while True:
+        candidate = socket_path(path)
+        if os.path.exists(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def git_environment(cwd):
+    """The GIT_* variables of this process, with paths made absolute against cwd"""
+    env = {}
+    for name, value in os.environ.items():
+        if name.startswith('GIT_'):
+            env[name] = os.path.join(cwd, value) if name in GIT_PATH_VARIABLES and value else value
+    return env
+
+
+def connect(path):
+    """Connected socket, or None when no server is listening"""
+    if path is None or not hasattr(socket, 'AF_UNIX'):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(argv, cwd=None, out=None):
+    """Run a command on the server, streaming its output to `out`
+
+    Returns the command's exit status, or None when no server answered
+    (the caller then runs the command itself).
+    """
+    cwd = os.path.abspath(cwd or os.getcwd())
+    out = out or sys.stdout.buffer
+    sock = connect(find_socket(cwd))
+    if sock is None:
+        return None
+
+    with sock:
+        sock.sendall(json.dumps({'argv': argv, 'cwd': cwd, 'env': git_environment(cwd)}).encode('utf-8') + b'\n')
+        trailer = None
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            if trailer is not None:
+                trailer += chunk
+                continue
+            head, sep, tail = chunk.partition(END_OF_OUTPUT)
+            out.write(head)
+            if sep:
+                trailer = tail
+        out.flush()
+
+    if trailer is None:
+        print("❌ vault server closed the connection before the command finished", file=sys.stderr)
+        return 1
+    return int(trailer.decode('ascii').strip() or 1)
+
+
+def stop(root):
+    """Ask the server of a vault to exit; True if one was running"""
+    sock = connect(socket_path(root))
+    if sock is None:
+        return False
+    with sock:
+        sock.sendall(json.dumps({'stop': True}).encode('utf-8') + b'\n')
+        while sock.recv(65536):
+            pass
+    return True
@@ -0,0 +1,6 @@
+"""
+Vault link commands
+
+One module per subcommand of scripts/vault.py. Each provides DESCRIPTION,
+add_arguments(parser) and run(args), which returns the exit code.
+"""
@@ -0,0 +1,302 @@
+"""
+`bench`: time every converter's core functions and full-tree runs on
+reproducible synthetic vaults, and write the results as JSON for comparing
+commits (bench-vault.py)
+"""
+
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+from .. import convert, fixers, parallel, pipeline, scanner, synthvault
+from ..manifest import Manifest
+from ..noteindex import NoteIndex, find_markdown_files
+from ..remap import LinkRemapper, load_mapping
+from . import convert as convert_command
+from . import convert_links, doctor, fix_all_links, fix_encoding, fix_multiple_encoding, remap
+
+DESCRIPTION = "Benchmark the link converters on synthetic vaults"
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Notes read into memory for the core-function benchmarks
+MICRO_SAMPLE = 2000
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1M' -> 1000000"""
+    text = text.strip()
+    multiplier = {'k': 1000, 'K': 1000, 'm': 1000000, 'M': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('kKmM')) * multiplier)
+
+
+def git_commit():
+    """Commit being benchmarked, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(func, repeat):
+    """Run func() `repeat` times; returns (seconds per run, last result)"""
+    seconds = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return seconds, result
+
+
+# Core functions, each applied to the content of every sampled note
+MICRO_BENCHMARKS = [
+    ('scanner.scan', lambda content, remapper: sum(1 for _ in scanner.scan(content))),
+    ('convert_content', lambda content, remapper: convert.convert_content(content)),
+    ('fix_markdown_links', lambda content, remapper: fixers.fix_markdown_links(content)),
+    ('fix_links', lambda content, remapper: fixers.fix_links(content)),
+    ('fix_multiple_encoding', lambda content, remapper: fixers.fix_multiple_encoding(content)),
+    ('LinkRemapper.remap', lambda content, remapper: remapper.remap(content, remapper.root)),
+]
+
+
+def run_micro(vault_dir, paths, repeat):
+    """Time the in-memory transforms on a sample of the vault's notes"""
+    sample = paths[:MICRO_SAMPLE]
+    contents = []
+    for path in sample:
+        with open(os.path.join(vault_dir, path), 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+    size = sum(len(content.encode('utf-8')) for content in contents)
+    remapper = LinkRemapper(load_mapping(os.path.join(vault_dir, synthvault.MAPPING_NAME)), root=vault_dir)
+
+    for name, func in MICRO_BENCHMARKS:
+        seconds, _ = timed(lambda: [func(content, remapper) for content in contents], repeat)
+        yield name, seconds, len(contents), size
+
+
+# Full-tree runs. Each gets a freshly generated vault, since the runs
+# rewrite notes; follow-up runs reuse the vault their predecessor left.
+def tree_convert(vault_dir, args):
+    files = find_markdown_files(vault_dir)
+    index = NoteIndex.build(vault_dir, persist=False)
+    for _ in convert_command.process_files(files, None, args.jobs, index):
+        pass
+    return len(files)
+
+
+def tree_convert_manifest(vault_dir, args):
+    files = find_markdown_files(vault_dir)
+    index = NoteIndex.build(vault_dir, persist=True)
+    manifest = Manifest.load(vault_dir, 'convert-obsidian-links', convert_command.CONVERTER_VERSION)
+    for _ in convert_command.process_files(files, manifest, args.jobs, index):
+        pass
+    manifest.save()
+    return len(files)
+
+
+def tree_note_index(vault_dir, args):
+    return len(NoteIndex.build(vault_dir, persist=False).notes)
+
+
+def tree_convert_links(vault_dir, args):
+    # convert-links.py only ever looked at the vault's top-level notes
+    convert_links.process_markdown_files(vault_dir)
+    return None
+
+
+def tree_fix_all_links(vault_dir, args):
+    fix_all_links.process_all_markdown_files(vault_dir, use_cache=False)
+    return None
+
+
+def tree_fix_encoding(vault_dir, args):
+    fix_encoding.process_files(vault_dir, args.jobs)
+    return None
+
+
+def tree_fix_multiple_encoding(vault_dir, args):
+    fix_multiple_encoding.fix_all_files(vault_dir, args.jobs)
+    return None
+
+
+def tree_update_structure_links(vault_dir, args):
+    remapper = LinkRemapper(load_mapping(os.path.join(vault_dir, synthvault.MAPPING_NAME)), root=vault_dir)
+    files = find_markdown_files(vault_dir)
+    for filepath in files:
+        remap.update_links_in_file(filepath, remapper)
+    return len(files)
+
+
+def tree_vault_doctor(vault_dir, args):
+    stages = [pipeline.fixer_stage(name) for name, _, _, _ in pipeline.FIXER_STAGES]
+    return sum(1 for _ in doctor.run_pipeline(vault_dir, stages, None, args.jobs))
+
+
+# (name, benchmark, runs on the vault left by the previous benchmark)
+TREE_BENCHMARKS = [
+    ('note-index', tree_note_index, False),
+    ('convert-obsidian-links', tree_convert, False),
+    ('convert-obsidian-links:manifest-cold', tree_convert_manifest, False),
+    ('convert-obsidian-links:manifest-warm', tree_convert_manifest, True),
+    ('convert-links', tree_convert_links, False),
+    ('fix-all-links', tree_fix_all_links, False),
+    ('fix-encoding', tree_fix_encoding, False),
+    ('fix-multiple-encoding', tree_fix_multiple_encoding, False),
+    ('update-structure-links', tree_update_structure_links, False),
+    ('vault-doctor', tree_vault_doctor, False),
+]
+
+
+def vault_bytes(vault_dir, paths):
+    return sum(os.path.getsize(os.path.join(vault_dir, path)) for path in paths)
+
+
+def run_size(spec, args, workdir):
+    """All selected benchmarks on vaults of spec.notes notes; yields result dicts"""
+    vault_dir = os.path.join(workdir, f"vault-{spec.notes}")
+
+    def fresh_vault():
+        shutil.rmtree(vault_dir, ignore_errors=True)
+        return synthvault.generate(vault_dir, spec)
+
+    start = time.perf_counter()
+    paths = fresh_vault()
+    size = vault_bytes(vault_dir, paths)
+    yield {'benchmark': 'generate', 'kind': 'setup', 'seconds': [time.perf_counter() - start],
+           'files': len(paths), 'bytes': size}
+
+    if args.only in (None, 'micro'):
+        for name, seconds, files, sample_bytes in run_micro(vault_dir, paths, args.repeat):
+            yield {'benchmark': name, 'kind': 'micro', 'seconds': seconds,
+                   'files': files, 'bytes': sample_bytes}
+
+    if args.only in (None, 'tree'):
+        dirty = False
+        for name, benchmark, follow_up in TREE_BENCHMARKS:
+            seconds = []
+            for _ in range(args.repeat):
+                if not follow_up and dirty:
+                    fresh_vault()
+                if follow_up:
+                    tree_convert_manifest(vault_dir, args)
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    run_seconds, _ = timed(lambda: benchmark(vault_dir, args), 1)
+                seconds.extend(run_seconds)
+                dirty = True
+            yield {'benchmark': name, 'kind': 'tree', 'seconds': seconds,
+                   'files': len(paths), 'bytes': size}
+
+    if not args.keep:
+        shutil.rmtree(vault_dir, ignore_errors=True)
+
+
+def summarize(result):
+    """Add best time and throughput to a result"""
+    best = min(result['seconds'])
+    result['best'] = best
+    result['mb_per_s'] = round(result['bytes'] / best / 1e6, 3) if best > 0 else None
+    return result
+
+
+def compare(results, baseline_path):
+    """Print best-time ratios against a previous results file"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    old = {(r['notes'], r['benchmark']): r['best'] for r in baseline['results']}
+
+    print(f"\n📊 Compared with {baseline_path} ({(baseline.get('commit') or 'unknown')[:10]})")
+    for result in results:
+        before = old.get((result['notes'], result['benchmark']))
+        if before:
+            ratio = result['best'] / before
+            marker = '🐢' if ratio > 1.1 else ('🚀' if ratio < 0.9 else '  ')
+            print(f"   {marker} {result['notes']:>8} {result['benchmark']:<40} "
+                  f"{before:9.3f}s -> {result['best']:9.3f}s  x{ratio:.2f}")
+
+
+def add_arguments(parser):
+    """Command line options"""
+    defaults = synthvault.VaultSpec(0)
+    parser.add_argument('--sizes', default='1k,10k',
+                        help="comma-separated vault sizes in notes, e.g. 1k,10k,100k,1M (default: %(default)s)")
+    parser.add_argument('--only', choices=['micro', 'tree'],
+                        help="run only the core-function or only the full-tree benchmarks")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per benchmark (default: %(default)s)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="--jobs passed to the scripts that take it (default: %(default)s)")
+
+    vault = parser.add_argument_group('synthetic vault')
+    vault.add_argument('--seed', type=int, default=defaults.seed)
+    vault.add_argument('--links-per-note', type=int, default=defaults.links_per_note)
+    vault.add_argument('--depth', type=int, default=defaults.depth, help="folder nesting depth")
+    vault.add_argument('--fanout', type=int, default=defaults.fanout, help="subfolders per folder")
+    vault.add_argument('--no-unicode', action='store_true', help="ASCII-only note names")
+    vault.add_argument('--encoded-ratio', type=float, default=defaults.encoded_ratio,
+                       help="share of links written %%252520-encoded")
+    vault.add_argument('--fence-ratio', type=float, default=defaults.fence_ratio,
+                       help="chance of a code fence after each paragraph")
+    vault.add_argument('--moved-ratio', type=float, default=defaults.moved_ratio,
+                       help="share of notes linked under a remapped legacy name")
+
+    parser.add_argument('--workdir', help="where vaults are generated (default: a temporary directory)")
+    parser.add_argument('--keep', action='store_true', help="keep the generated vaults")
+    parser.add_argument('--out', default='bench-results.json', help="JSON results file (default: %(default)s)")
+    parser.add_argument('--compare', metavar='FILE', help="previous results file to compare against")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='vault-bench-')
+    os.makedirs(workdir, exist_ok=True)
+
+    print("⏱️  Vault Link Benchmarks")
+    print("=" * 50)
+
+    results = []
+    params = {}
+    try:
+        for notes in sizes:
+            spec = synthvault.VaultSpec(notes, seed=args.seed, links_per_note=args.links_per_note,
+                                        depth=args.depth, fanout=args.fanout, unicode=not args.no_unicode,
+                                        encoded_ratio=args.encoded_ratio, fence_ratio=args.fence_ratio,
+                                        moved_ratio=args.moved_ratio)
+            params = dict(spec._asdict(), notes=sizes)
+            print(f"📁 {notes} notes")
+            for result in run_size(spec, args, workdir):
+                result = summarize(dict(result, notes=notes))
+                results.append(result)
+                print(f"   {result['benchmark']:<40} {result['best']:9.3f}s  "
+                      f"{result['mb_per_s'] or 0:8.2f} MB/s")
+    finally:
+        if not args.workdir and not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'jobs': parallel.resolve_jobs(args.jobs),
+        'repeat': args.repeat,
+        'vault': params,
+        'results': results,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print("=" * 50)
+    print(f"💾 Results written to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
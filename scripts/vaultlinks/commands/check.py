@@ -0,0 +1,78 @@
+"""
+`check`: broken link checker (scripts/check-links.py)
+
+Reports markdown links whose target does not exist in the vault, with
+file and line, and exits non-zero so CI can fail on them.
+"""
+
+import os
+
+from .. import checker, parallel
+from ..noteindex import NoteIndex, walk_notes
+
+DESCRIPTION = "Find links to files that do not exist in the vault"
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument('--wikilinks', action='store_true',
+                        help="also report [[links]] that match no note name, path or alias")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="print only the summary")
+
+
+def case_hints(broken, paths):
+    """Existing paths differing only in case from broken targets"""
+    folded = {}
+    for path in paths:
+        folded.setdefault(path.casefold(), path)
+    return {link.target: folded[link.target.casefold()]
+            for link in broken if link.target.casefold() in folded}
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    root = os.path.abspath(args.vault_dir)
+
+    print("🔎 Broken Link Checker")
+    print("=" * 50)
+
+    paths = checker.vault_paths(root)
+    note_index = NoteIndex.build(root) if args.wikilinks else None
+
+    notes = [(os.path.join(root, relpath), relpath, st.st_size) for relpath, st in walk_notes(root)]
+    print(f"📁 Checking {len(notes)} notes against {len(paths)} vault paths")
+
+    results = parallel.imap(checker.check_file_job, [(filepath, relpath) for filepath, relpath, _ in notes],
+                            args.jobs, sizes=[size for _, _, size in notes],
+                            initializer=checker.init_worker, initargs=(paths, note_index))
+
+    broken = []
+    errors = 0
+    for (_, relpath, _), (note_broken, error) in zip(notes, results):
+        if error is not None:
+            errors += 1
+            print(f"❌ Error reading {relpath}: {error}")
+        broken.extend(note_broken)
+    # The walk yields notes in no useful order; report them by path and line
+    broken.sort(key=lambda link: (link.source, link.line))
+
+    hints = case_hints(broken, paths) if broken else {}
+    if not args.quiet:
+        for link in broken:
+            hint = f" (did you mean {hints[link.target]}?)" if link.target in hints else ""
+            print(f"{link.source}:{link.line}: broken link {link.link}{hint}")
+
+    print("=" * 50)
+    if broken:
+        sources = len({link.source for link in broken})
+        print(f"💥 {len(broken)} broken links in {sources} notes")
+        return 1
+    if errors:
+        return 1
+    print("✅ All links point to existing files!")
+    return 0
@@ -0,0 +1,754 @@
+"""
+`convert`: Obsidian to GitHub link conversion (scripts/convert-obsidian-links.py)
+
+Converts [[Obsidian links]] to [GitHub links](File%20Name.md) format.
+This is what the pre-commit hook runs.
+"""
+
+import os
+import sys
+
+from .. import parallel, prefilter, stream, writeback
+from ..convert import CONVERT_TRIGGERS, convert_content, describe_changes, note_resolver
+from ..fsio import IOPool
+from ..manifest import Manifest
+from ..metrics import NULL_METRICS, Metrics
+from ..noteindex import NoteIndex, find_markdown_files, walk_notes
+from ..writeback import Stager, WriteBack
+
+DESCRIPTION = "Convert Obsidian [[links]] to GitHub-compatible links"
+
+# Bump whenever the conversion rules change, so notes recorded as clean by an
+# older converter are read again
+CONVERTER_VERSION = 1
+
+# Name of the manifest, and of this converter's lines in the shared blob cache
+CACHE_NAME = 'convert-obsidian-links'
+
+# Git config setting that turns on the shared blob cache, like --notes-cache
+NOTES_CACHE_CONFIG = 'vaultlinks.notesCache'
+
+
+def convert_file(filepath, clean_hash=None, note_index=None, want_hash=False, metrics=NULL_METRICS, writer=None):
+    """Convert one file on disk
+
+    Notes without any conversion trigger are skipped on their raw bytes,
+    before decoding. `clean_hash` is the manifest's hash of the last clean
+    content, if any; matching content is not converted again. Wikilinks are
+    resolved through `note_index` when one is given. Returns (was_modified,
+    changes, clean_record) where clean_record is (stat, hash) for a file
+    left unchanged, to be recorded in the manifest; the hash is only
+    computed with want_hash. Time and bytes per stage go to `metrics`.
+    Converted notes go through `writer` (see vaultlinks.writeback), or
+    are replaced one by one without it.
+    """
+    with metrics.timer('read'):
+        st, data, digest = prefilter.read_note(filepath, CONVERT_TRIGGERS,
+                                               want_hash=want_hash or clean_hash is not None, stream=True)
+
+    content, changes, clean_record = convert_data(filepath, st, data, digest, clean_hash, note_index, metrics,
+                                                  writer)
+
+    # Write back if changed (large notes were already streamed back)
+    if content is not None:
+        if content is not True:
+            with metrics.timer('write'):
+                writeback.write(filepath, content, writer)
+            metrics.count('files_written')
+            metrics.count('bytes_written', len(content.encode('utf-8')))
+
+        return True, changes, None
+
+    return False, [], clean_record
+
+
+def convert_data(filepath, st, data, digest, clean_hash=None, note_index=None, metrics=NULL_METRICS, writer=None):
+    """CPU half of convert_file, given what prefilter.read_note returned
+
+    Returns (new_content, changes, clean_record); new_content is None when
+    the note needs no change, and True for a note too large to load, which
+    is converted and written back piece by piece here, through writer.
+    """
+    metrics.count('files_read')
+    metrics.count('bytes_read', st.st_size)
+
+    if data is None or (clean_hash is not None and digest == clean_hash):
+        metrics.count('files_prefiltered' if data is None else 'files_hash_clean')
+        return None, [], (st, digest)
+
+    if data is prefilter.STREAM:
+        changes = convert_streamed(filepath, note_index, metrics, writer)
+        if changes is not None:
+            return True, changes, None
+        return None, [], (st, digest)
+
+    with metrics.timer('convert'):
+        original_content = prefilter.decode(data)
+
+        # Apply conversions, counting patterns in the same pass
+        content, obsidian_links, space_links = convert_content(original_content, note_resolver(note_index, filepath),
+                                                               metrics)
+
+    if content != original_content:
+        return content, describe_changes(obsidian_links, space_links), None
+
+    return None, [], (st, digest)
+
+
+def convert_streamed(filepath, note_index=None, metrics=NULL_METRICS, writer=None):
+    """Convert a note too large to load in place, in bounded memory
+
+    Returns the changes made, or None if the note needed none.
+    """
+    resolve = note_resolver(note_index, filepath)
+    links = [0, 0]
+
+    def transform(text):
+        content, obsidian_links, space_links = convert_content(text, resolve, metrics)
+        links[0] += obsidian_links
+        links[1] += space_links
+        return content
+
+    with metrics.timer('convert'):
+        size = stream.rewrite_file(filepath, transform, writer=writer)
+    if size is None:
+        return None
+
+    metrics.count('files_written')
+    metrics.count('bytes_written', size)
+    return describe_changes(*links)
+
+
+def process_file(filepath, manifest=None, note_index=None, metrics=NULL_METRICS, writer=None):
+    """Process a single markdown file
+
+    With a manifest, files recorded as clean are skipped after one stat()
+    and files found clean are recorded for the next run.
+    """
+    try:
+        if manifest is not None and manifest.unchanged(filepath):
+            metrics.count('files_manifest_clean')
+            return False, []
+
+        clean_hash = manifest.clean_hash(filepath) if manifest is not None else None
+        was_modified, changes, clean_record = convert_file(filepath, clean_hash, note_index,
+                                                           want_hash=manifest is not None, metrics=metrics,
+                                                           writer=writer)
+
+        if manifest is not None:
+            if clean_record is not None:
+                manifest.record(filepath, *clean_record)
+            else:
+                manifest.forget(filepath)
+
+        return was_modified, changes
+
+    except Exception as e:
+        print(f"❌ Error processing {filepath}: {e}")
+        return False, []
+
+
+# Note index shared with pool workers through init_worker
+worker_note_index = None
+worker_collects_metrics = False
+
+
+def init_worker(note_index, collect_metrics=False):
+    """Pool initializer: install the run's note index in a worker process"""
+    global worker_note_index, worker_collects_metrics
+    worker_note_index = note_index
+    worker_collects_metrics = collect_metrics
+
+
+def process_file_job(filepath, clean_hash, want_hash):
+    """Worker-side process_file
+
+    Returns (filepath, was_modified, changes, clean_record, error, metrics,
+    staged), metrics being a Metrics.as_dict() for the parent to merge, or
+    None, and staged the converted notes for the parent to commit.
+    """
+    metrics = Metrics() if worker_collects_metrics else NULL_METRICS
+    stager = Stager()
+    try:
+        was_modified, changes, clean_record = convert_file(filepath, clean_hash, worker_note_index, want_hash,
+                                                           metrics, stager)
+        result = filepath, was_modified, changes, clean_record, None
+    except Exception as e:
+        result = filepath, False, [], None, str(e)
+    return result + (metrics.as_dict() if worker_collects_metrics else None, stager.staged)
+
+
+def process_files_threaded(target_files, manifest=None, note_index=None, metrics=NULL_METRICS, pool=None,
+                           writer=None):
+    """Process files serially with their I/O overlapped on an IOPool
+
+    The stat, manifest check and read of upcoming files run in the pool's
+    threads while this thread converts, and converted notes are staged
+    back in the pool, to be committed by `writer` here. Yields like
+    process_files.
+    """
+    def read(filepath):
+        # I/O thread: returns (stat, data, digest, error); data is False
+        # for a file the manifest has as clean
+        try:
+            if manifest is not None:
+                st = os.stat(filepath)
+                if manifest.unchanged(filepath, st):
+                    return st, False, None, None
+            return prefilter.read_note(filepath, CONVERT_TRIGGERS, want_hash=manifest is not None,
+                                       stream=True) + (None,)
+        except OSError as e:
+            return None, None, None, e
+
+    def converted():
+        reads = pool.imap(read, target_files)
+        for filepath in target_files:
+            with metrics.timer('read'):
+                st, data, digest, error = next(reads)
+            if error is not None or data is False:
+                yield filepath, None, [], None, error, data is False
+                continue
+
+            clean_hash = manifest.clean_hash(filepath) if manifest is not None else None
+            try:
+                content, changes, clean_record = convert_data(filepath, st, data, digest, clean_hash, note_index,
+                                                              metrics, writer)
+            except Exception as e:
+                yield filepath, None, [], None, e, False
+                continue
+            yield filepath, content, changes, clean_record, None, False
+
+    def write(item):
+        # I/O thread: stage a converted note, recording any error in the item
+        filepath, content, changes, clean_record, error, skipped = item
+        if isinstance(content, str):
+            try:
+                return item, writeback.stage(filepath, content)
+            except OSError as e:
+                return (filepath, None, [], None, e, False), None
+        return item, None
+
+    for (filepath, content, changes, clean_record, error, skipped), staged in pool.imap(write, converted()):
+        if error is not None:
+            print(f"❌ Error processing {filepath}: {error}")
+            yield filepath, False, []
+            continue
+        if skipped:
+            metrics.count('files_manifest_clean')
+            yield filepath, False, []
+            continue
+        if staged is not None:
+            writer.add(staged)
+            metrics.count('files_written')
+            metrics.count('bytes_written', staged.size)
+        if manifest is not None:
+            if clean_record is not None:
+                manifest.record(filepath, *clean_record)
+            else:
+                manifest.forget(filepath)
+        yield filepath, content is not None, changes
+
+
+def process_files(target_files, manifest=None, jobs=1, note_index=None, metrics=NULL_METRICS, pool=None,
+                  writer=None):
+    """Process files, in a process pool when jobs > 1
+
+    Yields (filepath, was_modified, changes) in the order of target_files,
+    so reports match a serial run. A serial run overlaps its file I/O on
+    `pool` when that is a threaded IOPool. Notes converted by workers are
+    committed through `writer`, by default one without a journal rooted at
+    the vault of `note_index` or `manifest`, else at the files' common folder.
+    """
+    if writer is None:
+        owner = note_index if note_index is not None else manifest
+        if owner is not None:
+            root = owner.root
+        elif target_files:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(filepath)) for filepath in target_files])
+        else:
+            return
+        with WriteBack(root, 'convert', journal=False) as writer:
+            yield from process_files(target_files, manifest, jobs, note_index, metrics, pool, writer)
+        return
+
+    if parallel.resolve_jobs(jobs) == 1:
+        if pool is not None and pool.io_jobs > 1:
+            yield from process_files_threaded(target_files, manifest, note_index, metrics, pool, writer)
+            return
+        for filepath in target_files:
+            yield (filepath,) + process_file(filepath, manifest, note_index, metrics, writer)
+        return
+
+    # Stat-only manifest checks stay in this process; workers only see
+    # files that actually need reading
+    tasks = []
+    skipped = set()
+    for filepath in target_files:
+        if manifest is not None and manifest.unchanged(filepath):
+            skipped.add(filepath)
+            metrics.count('files_manifest_clean')
+        else:
+            clean_hash = manifest.clean_hash(filepath) if manifest is not None else None
+            tasks.append((filepath, clean_hash, manifest is not None))
+
+    results = parallel.imap(process_file_job, tasks, jobs,
+                            sizes=parallel.file_sizes(task[0] for task in tasks),
+                            initializer=init_worker, initargs=(note_index, isinstance(metrics, Metrics)))
+
+    for filepath in target_files:
+        if filepath in skipped:
+            yield filepath, False, []
+            continue
+
+        _, was_modified, changes, clean_record, error, worker_metrics, staged = next(results)
+        if worker_metrics is not None:
+            metrics.merge(worker_metrics)
+        for note in staged:
+            writer.add(note)
+        if error is not None:
+            print(f"❌ Error processing {filepath}: {error}")
+        elif manifest is not None:
+            if clean_record is not None:
+                manifest.record(filepath, *clean_record)
+            else:
+                manifest.forget(filepath)
+        yield filepath, was_modified, changes
+
+
+def process_staged_files(note_index=None, metrics=NULL_METRICS, writer=None, blob_cache=None):
+    """Convert staged notes from their index blobs and re-stage the changed ones
+
+    Blob contents are read from git in one batch and converted in memory.
+    The working tree copy is rewritten too, through `writer`, unless it has
+    unstaged edits. Blobs `blob_cache` knows are clean are not read, and
+    known conversions are reused; new results are recorded in it.
+    New blobs are written to git in one batch at the end.
+    Returns (staged_count, [(filepath, changes), ...]) for the rewritten notes.
+    """
+    from .. import gitindex
+    from ..blobcache import CLEAN
+
+    top = gitindex.toplevel()
+    with metrics.timer('walk'):
+        staged = [entry for entry in gitindex.staged_markdown(top) if entry[0] in ('100644', '100755')]
+
+    known = {}
+    if blob_cache is not None:
+        known = {entry[1]: blob_cache.result(entry[1]) for entry in staged}
+    wanted = [blob_id for _, blob_id, _ in staged if known.get(blob_id) != CLEAN]
+    wanted.extend(result[0] for result in known.values() if result not in (None, CLEAN))
+    with metrics.timer('read'):
+        blobs = gitindex.read_blobs(wanted, top, missing_ok=True)
+    metrics.count('files_read', len(blobs))
+    metrics.count('bytes_read', sum(len(blob) for blob in blobs.values()))
+
+    index_updates = []
+    converted = []
+    # (index_updates position, original blob id, new blob, links fixed or None if not
+    # cacheable) of the blobs to write
+    new_blobs = []
+
+    for mode, blob_id, path in staged:
+        filepath = os.path.join(top, path)
+        result = known.get(blob_id)
+        if result == CLEAN:
+            metrics.count('files_blob_clean')
+            continue
+
+        original_blob = blobs[blob_id]
+        if result is not None and result[0] in blobs:
+            # Converted before, on this machine or another
+            metrics.count('files_blob_converted')
+            new_id, new_blob = result[0], blobs[result[0]]
+            changes = describe_changes(0, result[1])
+        else:
+            if not prefilter.found_in(CONVERT_TRIGGERS, original_blob):
+                metrics.count('files_prefiltered')
+                if blob_cache is not None:
+                    blob_cache.record(blob_id, CLEAN)
+                continue
+
+            try:
+                content = original_blob.decode('utf-8')
+            except UnicodeDecodeError as e:
+                print(f"❌ Error processing {os.path.relpath(filepath)}: {e}")
+                continue
+
+            with metrics.timer('convert'):
+                new_content, obsidian_links, space_links = convert_content(content,
+                                                                           note_resolver(note_index, filepath),
+                                                                           metrics)
+            if new_content == content:
+                if blob_cache is not None:
+                    blob_cache.record(blob_id, CLEAN)
+                continue
+
+            new_blob = new_content.encode('utf-8')
+            new_id = None
+            changes = describe_changes(obsidian_links, space_links)
+            # Resolved [[links]] depend on the rest of the vault, not only on the blob
+            new_blobs.append((len(index_updates), blob_id, new_blob, space_links if obsidian_links == 0 else None))
+
+        index_updates.append((mode, new_id, path))
+        metrics.count('files_written')
+        metrics.count('bytes_written', len(new_blob))
+        converted.append((filepath, changes))
+
+        # Only touch the working tree copy if it matches what was staged
+        try:
+            with open(filepath, 'rb') as f:
+                on_disk = f.read()
+        except OSError:
+            on_disk = None
+
+        if on_disk == original_blob:
+            writeback.write(filepath, new_blob, writer)
+        else:
+            print(f"⚠️  {os.path.relpath(filepath)} has unstaged edits; only the staged copy was converted")
+
+    with metrics.timer('write'):
+        new_ids = gitindex.write_blobs([new_blob for _, _, new_blob, _ in new_blobs], top)
+        for (position, blob_id, _, space_links), new_id in zip(new_blobs, new_ids):
+            mode, _, path = index_updates[position]
+            index_updates[position] = (mode, new_id, path)
+            if blob_cache is not None and space_links is not None:
+                blob_cache.record(blob_id, (new_id, space_links))
+        gitindex.update_index(index_updates, top)
+    return len(staged), converted
+
+
+def watch_vault(root, manifest=None, note_index=None, debounce=0.5, force_polling=False, quiet=False):
+    """Convert notes as they are saved until interrupted
+
+    Events are collected until the vault has been quiet for `debounce`
+    seconds, then only the notes that changed go through process_file;
+    attachments that appeared or went away only update the note index.
+    Events caused by the converter's own writes are ignored. Every batch
+    is committed as a run of its own, so undo restores the last one.
+    With quiet, a batch prints one line instead of one per note.
+    """
+    from .. import watch
+
+    watcher = watch.open_watcher(root, force_polling)
+    own_writes = watch.OwnWrites()
+    backend = 'inotify' if isinstance(watcher, watch.InotifyWatcher) else 'polling'
+    print(f"👀 Watching {os.path.relpath(root)} for changes ({backend}), Ctrl-C to stop")
+
+    try:
+        for changed, rescan in watch.batches(watcher, debounce):
+            if rescan:
+                # Events were lost; fall back to a full pass, which the
+                # manifest keeps cheap
+                changed = {os.path.join(root, relpath) for relpath, _ in walk_notes(root)}
+                if note_index is not None:
+                    note_index = NoteIndex.build(root, persist=manifest is not None)
+
+            changed = sorted(path for path in changed if not own_writes.is_own(path))
+            if note_index is not None and note_index.update(changed) and manifest is not None:
+                note_index.save()
+
+            modified = []
+            with WriteBack(root, 'convert') as writer:
+                for filepath in changed:
+                    if not filepath.endswith('.md'):
+                        continue
+                    if not os.path.isfile(filepath):
+                        if manifest is not None:
+                            manifest.forget(filepath)
+                        continue
+
+                    was_modified, changes = process_file(filepath, manifest, note_index, writer=writer)
+                    if was_modified:
+                        modified.append(filepath)
+                        if not quiet:
+                            print(f"✅ {os.path.relpath(filepath)}")
+                            for change in changes:
+                                print(f"   - Fixed {change}")
+            if quiet and modified:
+                print(f"✅ Converted {len(modified)} notes")
+            for filepath in modified:
+                own_writes.expect(filepath)
+
+            if manifest is not None:
+                manifest.save()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+        if manifest is not None:
+            manifest.save()
+
+    return 0
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('files', nargs='*', help="specific .md files (default: every note in the vault)")
+    parser.add_argument('--vault', default=os.getcwd(), help="vault root (default: current directory)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the manifest of clean files and re-read every note")
+    parser.add_argument('--staged', action='store_true',
+                        help="convert only staged notes, in memory, and re-stage the ones that change")
+    parser.add_argument('--notes-cache', action='store_true',
+                        help="share which committed notes are clean, and what staged notes convert to, as git "
+                             "notes under refs/notes/vaultlinks; a run that finds new results commits them to "
+                             f"that ref (default: off; `git config {NOTES_CACHE_CONFIG} true` turns it on)")
+    parser.add_argument('--no-index', action='store_true',
+                        help="do not resolve [[links]] against the vault; link to Name.md next to the note")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes for whole-vault runs (0 = one per CPU, default: 1)")
+    parser.add_argument('--io-jobs', type=int, default=1,
+                        help="file system calls kept in flight at once, for vaults on network or synced "
+                             "folders (0 = 32, default: 1)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after converting the vault, keep running and convert notes as they are saved")
+    parser.add_argument('--debounce', type=float, default=0.5, metavar='SECONDS',
+                        help="with --watch, wait this long after the last save before converting (default: 0.5)")
+    parser.add_argument('--poll', action='store_true',
+                        help="with --watch, poll for changes instead of using inotify")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="do not print a line per file; only the summary")
+    parser.add_argument('--metrics', choices=['json', 'text'],
+                        help="report stage times, bytes and link counts at the end of the run")
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help="write --metrics output to FILE instead of stdout")
+    parser.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                        help="run under cProfile; dump stats to FILE, or print the top calls to stderr")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    if args.watch and (args.files or args.staged):
+        print("❌ --watch converts the whole vault; it cannot be combined with files or --staged")
+        return 1
+
+    args.vault = os.path.abspath(args.vault)
+    metrics = Metrics() if args.metrics else NULL_METRICS
+
+    with IOPool(args.io_jobs) as pool:
+        if args.profile:
+            from ..metrics import profiled
+
+            with profiled(None if args.profile == '-' else args.profile):
+                status = convert_vault(args, metrics, pool)
+        else:
+            status = convert_vault(args, metrics, pool)
+
+    if args.metrics:
+        if args.metrics_file:
+            with open(args.metrics_file, 'w', encoding='utf-8') as f:
+                metrics.write(f, args.metrics)
+        else:
+            metrics.write(sys.stdout, args.metrics)
+    return status
+
+
+def convert_vault(args, metrics=NULL_METRICS, pool=None):
+    """Convert the notes selected by args and print the report
+
+    File system calls of the walk, the index build and a serial run go
+    through `pool`.
+    """
+    print("🔄 Obsidian to GitHub Link Converter")
+    print("=" * 50)
+
+    if args.staged:
+        note_index = build_note_index(args, metrics, pool)
+        blob_cache = load_blob_cache(args.vault) if use_notes_cache(args) else None
+        with WriteBack(args.vault, 'convert') as writer:
+            status = report_staged(note_index, args.quiet, metrics, writer, blob_cache)
+        if blob_cache is not None:
+            blob_cache.save()
+        return status
+
+    # Determine which files to process
+    if args.files:
+        # Specific files provided
+        target_files = []
+        for arg in args.files:
+            if os.path.isfile(arg) and arg.endswith('.md'):
+                target_files.append(arg)
+            else:
+                print(f"⚠️  Skipping {arg} (not a .md file)")
+
+        if not target_files:
+            print("❌ No valid .md files provided")
+            return 1
+
+    else:
+        # Find all .md files in the vault
+        with metrics.timer('walk'):
+            target_files = find_markdown_files(args.vault, pool)
+
+        if not target_files:
+            print("❌ No .md files found in the vault")
+            return 1
+
+        print(f"📁 Found {len(target_files)} markdown files to process")
+
+    # Skip notes that have not changed since they were last seen clean, and
+    # unmodified tracked notes whose blob was seen clean by any clone
+    manifest = None
+    blob_cache = None
+    tracked = {}
+    known_clean = set()
+    if not args.no_cache:
+        manifest = Manifest.load(args.vault, CACHE_NAME, CONVERTER_VERSION)
+        if not args.files and use_notes_cache(args):
+            from ..blobcache import CLEAN, NOTES_REF
+
+            with metrics.timer('walk'):
+                blob_cache, tracked = load_tracked_blobs(args.vault)
+            known_clean = {filepath for filepath, blob_id in tracked.items() if blob_cache.result(blob_id) == CLEAN}
+            if known_clean:
+                print(f"⚡ {len(known_clean)} notes already seen clean (from {NOTES_REF})")
+
+    # Resolve [[links]] to wherever the note actually lives in the vault,
+    # unless no note is left to read
+    note_index = None
+    if args.watch or len(known_clean) < len(target_files):
+        note_index = build_note_index(args, metrics, pool)
+
+    # Process files
+    modified_files = []
+    total_changes = []
+    metrics.count('files', len(target_files))
+
+    with WriteBack(args.vault, 'convert') as writer:
+        results = process_files([filepath for filepath in target_files if filepath not in known_clean], manifest,
+                                args.jobs, note_index, metrics, pool, writer)
+        for filepath, was_modified, changes in skip_known_clean(target_files, known_clean, results, metrics):
+            if was_modified:
+                filename = os.path.relpath(filepath)
+                modified_files.append(filename)
+                total_changes.extend(changes)
+                if not args.quiet:
+                    print(f"✅ {filename}")
+                    for change in changes:
+                        print(f"   - Fixed {change}")
+            elif not args.quiet:
+                filename = os.path.relpath(filepath)
+                print(f"✨ {filename} (already GitHub-compatible)")
+
+    if manifest is not None:
+        manifest.save()
+    if blob_cache is not None:
+        # Notes the manifest now holds as clean are clean in their index blob too
+        for filepath, blob_id in tracked.items():
+            if filepath not in known_clean and manifest.unchanged(filepath):
+                blob_cache.record(blob_id, CLEAN)
+        blob_cache.save()
+
+    status = report_summary(modified_files)
+    if args.watch:
+        return watch_vault(args.vault, manifest, note_index, args.debounce, args.poll, args.quiet)
+    return status
+
+
+def build_note_index(args, metrics=NULL_METRICS, pool=None):
+    """NoteIndex of the vault for resolving [[links]], or None with --no-index"""
+    if args.no_index:
+        return None
+    with metrics.timer('index'):
+        return NoteIndex.build(args.vault, persist=not args.no_cache, pool=pool)
+
+
+def use_notes_cache(args):
+    """Whether to read and update the shared blob cache: --notes-cache or the git config, never with --no-cache"""
+    if args.no_cache:
+        return False
+    if args.notes_cache:
+        return True
+    from ..gitindex import run_git
+
+    try:
+        return run_git(['config', '--bool', '--get', NOTES_CACHE_CONFIG], cwd=args.vault).strip() == b'true'
+    except (RuntimeError, OSError):
+        return False
+
+
+def load_blob_cache(root):
+    """This converter's shared BlobCache for the repository at root, or None outside git"""
+    from ..blobcache import BlobCache
+
+    return BlobCache.load(CACHE_NAME, CONVERTER_VERSION, root)
+
+
+def load_tracked_blobs(root):
+    """(BlobCache, {filepath: blob_id} of the unmodified tracked notes), or (None, {})"""
+    from .. import gitindex
+
+    blob_cache = load_blob_cache(root)
+    if blob_cache is None:
+        return None, {}
+    try:
+        unmodified = gitindex.unmodified_markdown(root)
+    except RuntimeError:
+        return None, {}
+    return blob_cache, {os.path.normpath(os.path.join(root, path)): blob_id for path, blob_id in unmodified.items()}
+
+
+def skip_known_clean(target_files, known_clean, results, metrics=NULL_METRICS):
+    """Yield like process_files for target_files, given `results` for the notes not in known_clean"""
+    for filepath in target_files:
+        if filepath in known_clean:
+            metrics.count('files_blob_clean')
+            yield filepath, False, []
+        else:
+            yield next(results)
+    # Let process_files finish, closing its pool
+    yield from results
+
+
+def report_staged(note_index=None, quiet=False, metrics=NULL_METRICS, writer=None, blob_cache=None):
+    """Run --staged mode and print its report"""
+    try:
+        staged_count, converted = process_staged_files(note_index, metrics, writer, blob_cache)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"📁 Found {staged_count} staged markdown files to process")
+
+    modified_files = []
+    for filepath, changes in converted:
+        filename = os.path.relpath(filepath)
+        modified_files.append(filename)
+        if not quiet:
+            print(f"✅ {filename} (re-staged)")
+            for change in changes:
+                print(f"   - Fixed {change}")
+
+    return report_summary(modified_files, staged=True)
+
+
+def report_summary(modified_files, staged=False):
+    """Print the closing summary and return the exit code"""
+    print("=" * 50)
+    if modified_files:
+        print(f"🎉 Successfully converted {len(modified_files)} files!")
+        print(f"🔗 All links are now GitHub and Obsidian compatible!")
+
+        if len(modified_files) <= 10:
+            print(f"\n📝 Modified files:")
+            for filename in modified_files:
+                print(f"   - {filename}")
+        else:
+            print(f"\n📝 Modified {len(modified_files)} files (showing first 10):")
+            for filename in modified_files[:10]:
+                print(f"   - {filename}")
+            print(f"   ... and {len(modified_files) - 10} more")
+
+        print(f"\n💡 Next steps:")
+        if staged:
+            print(f"   git diff --cached    # Review the re-staged conversions")
+        else:
+            print(f"   git add -u    # Stage the converted files")
+        print(f"   git commit    # Commit the changes")
+
+        return 2  # Return 2 to indicate "files changed, please auto-stage"
+
+    else:
+        print("✅ All files already use GitHub-compatible links!")
+
+    return 0
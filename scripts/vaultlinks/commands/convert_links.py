@@ -0,0 +1,73 @@
+"""
+`convert-links`: convert Obsidian [[double bracket]] links to standard
+markdown [text](file.md) format (convert-links.py)
+
+This makes links work in both Obsidian and GitHub.
+"""
+
+import os
+
+from .. import prefilter, stream, writeback
+from ..fixers import CONVERT_LINKS_TRIGGERS, convert_obsidian_links_to_markdown
+from ..writeback import WriteBack
+
+DESCRIPTION = "Convert [[links]] in the vault's top-level notes to [links](file.md)"
+
+
+def process_markdown_files(directory):
+    """Process all .md files in the directory"""
+    converted_files = []
+
+    with WriteBack(directory, 'convert-links') as writer:
+        for filename in os.listdir(directory):
+            if filename.endswith('.md'):
+                filepath = os.path.join(directory, filename)
+
+                # Read the file, unless it has no [[links]] at all
+                _, data, _ = prefilter.read_note(filepath, CONVERT_LINKS_TRIGGERS, stream=True)
+                if data is None:
+                    continue
+
+                # Convert links, only writing back if there were changes; notes
+                # too large to load are converted piece by piece
+                if data is prefilter.STREAM:
+                    converted = stream.rewrite_file(filepath, convert_obsidian_links_to_markdown,
+                                                    writer=writer) is not None
+                else:
+                    content = prefilter.decode(data)
+                    converted_content = convert_obsidian_links_to_markdown(content)
+                    converted = converted_content != content
+                    if converted:
+                        writeback.write(filepath, converted_content, writer)
+
+                if converted:
+                    converted_files.append(filename)
+                    print(f"Converted links in: {filename}")
+
+    return converted_files
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    vault_directory = args.vault_dir
+
+    print("Converting Obsidian [[links]] to markdown [links](file.md) format...")
+    print("This will make links work in both Obsidian and GitHub!")
+    print()
+
+    converted = process_markdown_files(vault_directory)
+
+    if converted:
+        print(f"\n✅ Successfully converted {len(converted)} files:")
+        for file in converted:
+            print(f"   - {file}")
+        print("\n🔗 Links now work in both Obsidian and GitHub!")
+    else:
+        print("✅ All files already use standard markdown link format!")
+    return 0
@@ -0,0 +1,150 @@
+"""
+`doctor`: all link fixers as stages of one pass (scripts/vault-doctor.py)
+
+Each note is read once, every enabled fixer is applied in memory, and the
+note is written at most once.
+"""
+
+import hashlib
+import json
+import os
+
+from .. import parallel, pipeline
+from ..manifest import Manifest
+from ..noteindex import NoteIndex, walk_notes
+from ..remap import LinkRemapper, load_mapping
+from ..writeback import WriteBack
+
+DESCRIPTION = "Fix links across the vault in one read and one write per note"
+EPILOG = ("Without stage flags, only --convert runs. The other stages replay the standalone scripts, "
+          "which predate vault-wide [[link]] resolution; name them to run them.")
+
+# Bump whenever a stage changes, so notes recorded as clean are re-read
+PIPELINE_VERSION = 1
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.epilog = EPILOG
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+
+    stages = parser.add_argument_group('stages')
+    stages.add_argument('--convert', action='store_true',
+                        help="pre-commit hook conversion with vault-wide [[link]] resolution "
+                             "(scripts/convert-obsidian-links.py)")
+    for name, description, _, _ in pipeline.FIXER_STAGES:
+        stages.add_argument(f'--{name}', action='store_true', help=description.replace('%', '%%'))
+    stages.add_argument('--mapping', metavar='FILE',
+                        help="remap moved notes with a JSON/CSV mapping (update-structure-links.py)")
+
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes (0 = one per CPU, default: 1)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the manifest of clean files and re-read every note")
+
+
+def build_stages(args):
+    """Stages selected on the command line, in pipeline order"""
+    selected = [name for name, _, _, _ in pipeline.FIXER_STAGES
+                if getattr(args, name.replace('-', '_'))]
+    # The legacy convert-links stage mangles aliases and embeds, so a bare
+    # run does what the pre-commit hook does
+    convert = args.convert or not (selected or args.mapping)
+
+    stages = []
+    if convert:
+        stages.append(pipeline.convert_stage(NoteIndex.build(args.vault_dir, persist=not args.no_cache)))
+    stages.extend(pipeline.fixer_stage(name) for name in selected)
+    if args.mapping:
+        remapper = LinkRemapper(load_mapping(args.mapping), root=args.vault_dir)
+        stages.append(pipeline.remap_stage(remapper))
+    return stages
+
+
+def stages_version(stages, args):
+    """Manifest version: clean means clean for exactly this set of stages"""
+    version = f"{PIPELINE_VERSION}:{'+'.join(stage.name for stage in stages)}"
+    if args.mapping:
+        mapping = load_mapping(args.mapping)
+        digest = hashlib.sha1(json.dumps(mapping, sort_keys=True).encode('utf-8')).hexdigest()
+        version += f":{digest[:12]}"
+    return version
+
+
+def run_pipeline(vault_dir, stages, manifest=None, jobs=1):
+    """Run the pipeline over every note; yields (relpath, changed_stages, error) in vault order
+
+    Rewritten notes are committed in batches and journaled for undo.
+    """
+    tasks = []
+
+    for relpath, st in walk_notes(vault_dir):
+        filepath = os.path.join(vault_dir, relpath)
+        if manifest is not None and manifest.unchanged(filepath, st):
+            continue
+        clean_hash = manifest.clean_hash(filepath) if manifest is not None else None
+        tasks.append((relpath, filepath, clean_hash, st.st_size))
+
+    results = parallel.imap(pipeline.process_file_job,
+                            [(filepath, clean_hash, manifest is not None)
+                             for _, filepath, clean_hash, _ in tasks], jobs,
+                            sizes=[size for _, _, _, size in tasks],
+                            initializer=pipeline.init_worker, initargs=(stages,))
+
+    with WriteBack(vault_dir, 'doctor') as writer:
+        for (relpath, filepath, _, _), (changed, clean_record, error, staged) in zip(tasks, results):
+            for note in staged:
+                writer.add(note)
+            if manifest is not None and error is None:
+                if clean_record is not None:
+                    manifest.record(filepath, *clean_record)
+                else:
+                    manifest.forget(filepath)
+            yield relpath, changed, error
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    args.vault_dir = os.path.abspath(args.vault_dir)
+
+    stages = build_stages(args)
+
+    print("🩺 Vault Doctor")
+    print("=" * 50)
+    print(f"🔧 Stages: {', '.join(stage.name for stage in stages)}")
+
+    manifest = None
+    if not args.no_cache:
+        manifest = Manifest.load(args.vault_dir, 'vault-doctor', stages_version(stages, args))
+
+    fixed_files = []
+    stage_counts = {stage.name: 0 for stage in stages}
+    errors = 0
+
+    for relpath, changed, error in run_pipeline(args.vault_dir, stages, manifest, args.jobs):
+        if error is not None:
+            errors += 1
+            print(f"❌ Error processing {relpath}: {error}")
+            continue
+        if changed:
+            fixed_files.append(relpath)
+            for name in changed:
+                stage_counts[name] += 1
+            print(f"✅ {relpath} ({', '.join(changed)})")
+
+    if manifest is not None:
+        manifest.save()
+
+    print("=" * 50)
+    if fixed_files:
+        print(f"🎉 Fixed {len(fixed_files)} files in a single pass!")
+        for name, count in stage_counts.items():
+            if count:
+                print(f"   - {name}: {count} files")
+    else:
+        print("✅ Nothing to fix!")
+
+    if errors:
+        return 1
+    return 2 if fixed_files else 0
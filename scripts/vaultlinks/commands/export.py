@@ -0,0 +1,109 @@
+"""
+`export`: write a GitHub-ready mirror of the vault without touching the vault
+
+Notes the conversion changes are written to the output folder; unchanged
+notes and attachments are hard-linked or reflinked. Re-exports refresh
+only the outputs whose source changed; see vaultlinks.export.
+"""
+
+import os
+from collections import Counter
+
+from .. import parallel
+from ..export import (CONVERTED, LINK_MODES, LINKED, ExportState, affected_keys, export_note_job, init_worker,
+                      note_snapshot, place, remove_output, walk_files)
+from ..noteindex import NoteIndex
+
+DESCRIPTION = "Export a GitHub-ready mirror of the vault to another folder"
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('--out', required=True, metavar='DIR', help="folder to write the mirror to")
+    parser.add_argument('--vault', default=os.getcwd(), help="vault root (default: current directory)")
+    parser.add_argument('--link', choices=LINK_MODES, default='hard',
+                        help="how unchanged files reach the mirror; falls back to the next method "
+                             "when unsupported (default: %(default)s)")
+    parser.add_argument('--no-index', action='store_true',
+                        help="do not resolve [[links]] against the vault; link to Name.md next to the note")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="refresh every output, not only those whose source changed")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes for the notes (0 = one per CPU, default: 1)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="do not print a line per converted note")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    root = os.path.abspath(args.vault)
+    out_dir = os.path.abspath(args.out)
+
+    print("📤 Vault Export")
+    print("=" * 50)
+
+    # A mirror inside the vault would be indexed and exported as notes itself
+    if out_dir == root or out_dir.startswith(root + os.sep) or root.startswith(out_dir + os.sep):
+        print("❌ The output folder must be outside the vault")
+        return 1
+
+    note_index = None if args.no_index else NoteIndex.build(root)
+    notes = note_snapshot(note_index)
+    previous = ExportState.load(root, out_dir)
+    # --no-cache refreshes every output, but what earlier exports wrote is
+    # still needed to remove the files deleted from the vault since
+    state = ExportState(root, out_dir) if args.no_cache else previous
+    affected = affected_keys(state.notes, notes)
+
+    files = dict(walk_files(root))
+    stale = [relpath for relpath, st in files.items() if not state.fresh(relpath, st, affected)]
+    removed = [relpath for relpath in previous.files if relpath not in files]
+    print(f"📁 {len(files)} files, {len(stale)} to refresh, {len(removed)} to remove")
+
+    for relpath in removed:
+        remove_output(out_dir, relpath)
+        state.files.pop(relpath, None)
+
+    for folder in sorted({os.path.dirname(relpath) for relpath in stale}):
+        os.makedirs(os.path.join(out_dir, folder), exist_ok=True)
+
+    counts = Counter()
+    errors = 0
+
+    stale_notes = [relpath for relpath in stale if relpath.endswith('.md')]
+    tasks = [(os.path.join(root, relpath), os.path.join(out_dir, relpath), args.link) for relpath in stale_notes]
+    results = parallel.imap(export_note_job, tasks, args.jobs, sizes=[files[r].st_size for r in stale_notes],
+                            initializer=init_worker, initargs=(note_index,))
+    for relpath, (kind, method, keys, error) in zip(stale_notes, results):
+        if error is not None:
+            print(f"❌ Error exporting {relpath}: {error}")
+            errors += 1
+            state.files.pop(relpath, None)
+            continue
+        counts[method] += 1
+        state.record(relpath, files[relpath], kind, keys)
+        if kind == CONVERTED and not args.quiet:
+            print(f"✅ {relpath}")
+
+    for relpath in stale:
+        if relpath.endswith('.md'):
+            continue
+        try:
+            counts[place(os.path.join(root, relpath), os.path.join(out_dir, relpath), args.link)] += 1
+        except OSError as e:
+            print(f"❌ Error exporting {relpath}: {e}")
+            errors += 1
+            state.files.pop(relpath, None)
+            continue
+        state.record(relpath, files[relpath], LINKED)
+
+    state.notes = notes
+    state.save()
+
+    print("=" * 50)
+    methods = ', '.join(f"{counts[method]} {label}" for method, label in
+                        (('write', 'converted'), ('hard', 'hard-linked'), ('reflink', 'reflinked'),
+                         ('copy', 'copied')) if counts[method])
+    print(f"🎉 Exported to {out_dir}: {methods or 'nothing to refresh'}")
+    if counts['hard']:
+        print("⚠️  Hard-linked files share their data with the vault; edit the vault, not the mirror")
+    return 1 if errors else 0
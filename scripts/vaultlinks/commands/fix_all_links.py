@@ -0,0 +1,106 @@
+"""
+`fix-all-links`: fix all markdown links to properly URL-encode spaces and
+special characters (fix-all-links.py)
+
+This ensures links work in both GitHub and Obsidian.
+"""
+
+import os
+
+from .. import prefilter, stream, writeback
+from ..fixers import FIX_ALL_LINKS_TRIGGERS, fix_markdown_links
+from ..manifest import Manifest
+from ..writeback import WriteBack
+
+DESCRIPTION = "URL-encode the targets of all markdown links"
+
+# Bump whenever fix_markdown_links changes, so cached clean notes are re-read
+CONVERTER_VERSION = 1
+
+
+def process_all_markdown_files(vault_dir, use_cache=True):
+    """Process all .md files recursively
+
+    Notes recorded as clean in the manifest are skipped after one stat(),
+    and notes without markdown links are skipped before being decoded.
+    """
+    fixed_files = []
+    manifest = Manifest.load(vault_dir, 'fix-all-links', CONVERTER_VERSION) if use_cache else None
+
+    with WriteBack(vault_dir, 'fix-all-links') as writer:
+        for root, dirs, files in os.walk(vault_dir):
+            # Skip .git and .obsidian directories
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+
+            for file in files:
+                if file.endswith('.md'):
+                    filepath = os.path.join(root, file)
+
+                    if manifest is not None and manifest.unchanged(filepath):
+                        continue
+
+                    # Read file
+                    st, data, digest = prefilter.read_note(filepath, FIX_ALL_LINKS_TRIGGERS,
+                                                           want_hash=manifest is not None, stream=True)
+
+                    if data is None or (manifest is not None and digest == manifest.clean_hash(filepath)):
+                        if manifest is not None:
+                            manifest.record(filepath, st, digest)
+                        continue
+
+                    # Fix links and write back if changed; notes too large to
+                    # load are fixed piece by piece
+                    if data is prefilter.STREAM:
+                        fixed = stream.rewrite_file(filepath, fix_markdown_links, writer=writer) is not None
+                    else:
+                        content = prefilter.decode(data)
+                        fixed_content = fix_markdown_links(content)
+                        fixed = fixed_content != content
+                        if fixed:
+                            writeback.write(filepath, fixed_content, writer)
+
+                    if fixed:
+                        rel_path = os.path.relpath(filepath, vault_dir)
+                        fixed_files.append(rel_path)
+                        print(f"Fixed links in: {rel_path}")
+
+                        if manifest is not None:
+                            manifest.forget(filepath)
+                    elif manifest is not None:
+                        manifest.record(filepath, st, digest)
+
+    if manifest is not None:
+        manifest.save()
+
+    return fixed_files
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the manifest of clean files and re-read every note")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    vault_dir = args.vault_dir
+
+    print("🔧 Fixing all markdown links to properly encode spaces...")
+    print("This ensures links work correctly in both GitHub and Obsidian!")
+    print()
+
+    fixed_files = process_all_markdown_files(vault_dir, use_cache=not args.no_cache)
+
+    if fixed_files:
+        print(f"\n✅ Fixed links in {len(fixed_files)} files:")
+        for file in fixed_files:
+            print(f"   - {file}")
+        print(f"\n🔗 All links now properly URL-encoded and should work everywhere!")
+    else:
+        print("✅ All links are already properly encoded!")
+
+    print(f"\n📝 Example of fixed link format:")
+    print(f"   [Authentication System](02-backend/auth/Authentication%20System.md)")
+    return 0
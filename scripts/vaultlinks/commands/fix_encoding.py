@@ -0,0 +1,84 @@
+"""
+`fix-encoding`: fix over-encoded URLs and ensure proper single encoding (fix-encoding.py)
+"""
+
+import os
+
+from .. import parallel, prefilter, stream, writeback
+from ..fixers import FIX_ENCODING_TRIGGERS, fix_links
+from ..noteindex import find_markdown_files
+from ..writeback import Stager, WriteBack
+
+DESCRIPTION = "Fix over-encoded links"
+
+
+def fix_file(filepath, writer=None):
+    """Fix one file, writing it back through writer; returns True if it was rewritten"""
+    # Skip notes without %25 or spaced .md links before decoding them
+    _, data, _ = prefilter.read_note(filepath, FIX_ENCODING_TRIGGERS, stream=True)
+    if data is None:
+        return False
+    if data is prefilter.STREAM:
+        return stream.rewrite_file(filepath, fix_links, writer=writer) is not None
+
+    content = prefilter.decode(data)
+    original_content = content
+
+    # Fix over-encoding, then remaining space issues, in one pass
+    content = fix_links(content)
+
+    if content != original_content:
+        writeback.write(filepath, content, writer)
+        return True
+
+    return False
+
+
+def fix_file_job(filepath):
+    """Worker-side fix_file: returns (was_fixed, staged)"""
+    stager = Stager()
+    return fix_file(filepath, stager), stager.staged
+
+
+def process_files(vault_dir, jobs=1):
+    """Process all markdown files, in a process pool when jobs > 1"""
+    fixed_files = []
+    md_files = find_markdown_files(vault_dir)
+
+    results = parallel.imap(fix_file_job, [(filepath,) for filepath in md_files], jobs,
+                            sizes=parallel.file_sizes(md_files))
+
+    with WriteBack(vault_dir, 'fix-encoding') as writer:
+        for filepath, (was_fixed, staged) in zip(md_files, results):
+            for note in staged:
+                writer.add(note)
+            if was_fixed:
+                rel_path = os.path.relpath(filepath, vault_dir)
+                fixed_files.append(rel_path)
+                print(f"Fixed: {rel_path}")
+
+    return fixed_files
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes (0 = one per CPU, default: 1)")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    vault_dir = args.vault_dir
+
+    print("🔧 Fixing over-encoded links...")
+
+    fixed = process_files(vault_dir, args.jobs)
+
+    if fixed:
+        print(f"\n✅ Fixed {len(fixed)} files")
+        print("🔗 Links should now work correctly!")
+    else:
+        print("✅ No fixes needed!")
+    return 0
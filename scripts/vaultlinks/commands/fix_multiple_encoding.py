@@ -0,0 +1,111 @@
+"""
+`fix-multiple-encoding`: fix triple and quadruple encoded URLs back to
+single encoding (fix-multiple-encoding.py)
+"""
+
+import os
+
+from .. import parallel, prefilter, stream, writeback
+from ..fixers import FIX_MULTIPLE_ENCODING_TRIGGERS, fix_multiple_encoding
+from ..noteindex import find_markdown_files
+from ..writeback import Stager, WriteBack
+
+DESCRIPTION = "Fix multiple URL encoding issues"
+
+
+def fix_file(filepath, writer=None):
+    """Fix one file, writing it back through writer (see vaultlinks.writeback)
+
+    Returns (was_fixed, had_deep_encoding), the latter flagging triple or
+    quadruple encoding in the original content.
+    """
+    # Skip notes without %25 before decoding them
+    _, data, _ = prefilter.read_note(filepath, FIX_MULTIPLE_ENCODING_TRIGGERS, stream=True)
+    if data is None:
+        return False, False
+    if data is prefilter.STREAM:
+        return fix_streamed(filepath, writer)
+
+    content = prefilter.decode(data)
+    fixed_content = fix_multiple_encoding(content)
+
+    if content != fixed_content:
+        writeback.write(filepath, fixed_content, writer)
+        return True, '%2525' in content
+
+    return False, False
+
+
+def fix_streamed(filepath, writer=None):
+    """fix_file for a note too large to load, in bounded memory"""
+    deep = False
+
+    def transform(text):
+        nonlocal deep
+        fixed_text = fix_multiple_encoding(text)
+        if fixed_text != text and '%2525' in text:
+            deep = True
+        return fixed_text
+
+    if stream.rewrite_file(filepath, transform, writer=writer) is None:
+        return False, False
+    return True, deep
+
+
+def fix_file_job(filepath):
+    """Worker-side fix_file: returns (was_fixed, had_deep_encoding, staged)"""
+    stager = Stager()
+    return fix_file(filepath, stager) + (stager.staged,)
+
+
+def fix_all_files(vault_dir, jobs=1):
+    """Process all markdown files, in a process pool when jobs > 1"""
+    fixed_files = []
+    md_files = find_markdown_files(vault_dir)
+
+    results = parallel.imap(fix_file_job, [(filepath,) for filepath in md_files], jobs,
+                            sizes=parallel.file_sizes(md_files))
+
+    with WriteBack(vault_dir, 'fix-multiple-encoding') as writer:
+        for filepath, (was_fixed, had_deep_encoding, staged) in zip(md_files, results):
+            for note in staged:
+                writer.add(note)
+            if was_fixed:
+                rel_path = os.path.relpath(filepath, vault_dir)
+                fixed_files.append(rel_path)
+                print(f"Fixed multiple encoding in: {rel_path}")
+
+                # Show what was changed
+                if had_deep_encoding:
+                    print(f"   - Removed triple/quadruple encoding")
+
+    return fixed_files
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes (0 = one per CPU, default: 1)")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    vault_dir = args.vault_dir
+
+    print("🔧 Fixing multiple URL encoding issues...")
+    print("Converting %252520 → %20, %2520 → %20, etc.")
+    print()
+
+    fixed = fix_all_files(vault_dir, args.jobs)
+
+    if fixed:
+        print(f"\n✅ Fixed multiple encoding in {len(fixed)} files")
+        for file in fixed:
+            print(f"   - {file}")
+    else:
+        print("✅ No multiple encoding issues found!")
+
+    print(f"\n🔗 Links should now work correctly in GitHub!")
+    return 0
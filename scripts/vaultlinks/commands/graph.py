@@ -0,0 +1,144 @@
+"""
+`graph`: query the vault's link graph
+
+The graph (see vaultlinks.graph) is built from the backlink index and
+stored in .cache/vaultlinks/graph.bin; queries load that file and print
+one vault path per line, so they can be piped or used in CI. `build`
+(or --refresh before a query) brings it up to date with the vault.
+"""
+
+import json
+import os
+import sys
+
+from ..graph import LinkGraph, graph_path
+from ..noteindex import NoteIndex
+
+DESCRIPTION = "Query the link graph of the vault"
+
+EXPORT_FORMATS = ('json', 'dot')
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('--vault', default=os.getcwd(), help="vault root (default: current directory)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="rescan the notes changed since the graph was built before querying")
+    queries = parser.add_subparsers(dest='query', required=True, metavar='QUERY')
+
+    queries.add_parser('build', help="build or refresh the graph and print its size")
+
+    query = queries.add_parser('neighbors', help="files a note links to")
+    query.add_argument('path', help="vault path of the note")
+
+    query = queries.add_parser('backlinks', help="notes linking to a file, or into a folder from outside it")
+    query.add_argument('path', help="vault path of a file or folder")
+
+    queries.add_parser('orphans', help="notes without links in either direction")
+
+    query = queries.add_parser('components', help="connected groups of notes, largest first")
+    query.add_argument('--min-size', type=int, default=2, metavar='N',
+                       help="skip components smaller than N (default: %(default)s)")
+    query.add_argument('--members', action='store_true', help="list the paths in each component")
+
+    query = queries.add_parser('reach', help="files reachable from a note or folder by following links")
+    query.add_argument('path', help="vault path of a file or folder")
+    query.add_argument('--reverse', action='store_true', help="follow links backwards: what can reach it")
+    query.add_argument('--depth', type=int, metavar='N', help="follow at most N links")
+
+    query = queries.add_parser('path', help="shortest chain of links from one file to another")
+    query.add_argument('source', help="vault path to start from")
+    query.add_argument('target', help="vault path to reach")
+
+    query = queries.add_parser('export', help="write the whole graph for other tools")
+    query.add_argument('--format', choices=EXPORT_FORMATS, default='json', help="(default: %(default)s)")
+    query.add_argument('-o', '--output', metavar='FILE', help="file to write (default: standard output)")
+
+
+def load_graph(root, refresh=False):
+    """The stored graph of the vault, built first if missing or refresh"""
+    graph = None if refresh else LinkGraph.load(graph_path(root))
+    if graph is None:
+        graph = LinkGraph.build(root, NoteIndex.build(root))
+    return graph
+
+
+def write_export(graph, fmt, f):
+    """Write every node and edge as JSON ({"nodes", "edges"}) or Graphviz DOT"""
+    if fmt == 'json':
+        edges = [[source, target] for source in range(len(graph)) for target in graph.neighbors(source)]
+        json.dump({'nodes': graph.paths, 'edges': edges}, f, ensure_ascii=False, separators=(',', ':'))
+        f.write('\n')
+        return
+    f.write('digraph vault {\n')
+    for node, path in enumerate(graph.paths):
+        f.write(f'  {node} [label={json.dumps(path, ensure_ascii=False)}];\n')
+    for source in range(len(graph)):
+        for target in graph.neighbors(source):
+            f.write(f'  {source} -> {target};\n')
+    f.write('}\n')
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    root = os.path.abspath(args.vault)
+    graph = load_graph(root, refresh=args.refresh or args.query == 'build')
+    paths = graph.paths
+
+    if args.query == 'build':
+        print(f"🕸️  {len(graph)} files, {graph.edge_count} links, "
+              f"{len(graph.components())} components, {len(graph.orphans())} orphan notes")
+        return 0
+
+    if args.query == 'orphans':
+        for node in graph.orphans():
+            print(paths[node])
+        return 0
+
+    if args.query == 'components':
+        for number, nodes in enumerate(graph.components(), 1):
+            if len(nodes) < args.min_size:
+                break
+            print(f"{number}: {len(nodes)} files, e.g. {paths[nodes[0]]}")
+            if args.members:
+                for node in nodes:
+                    print(f"   {paths[node]}")
+        return 0
+
+    if args.query == 'export':
+        if args.output is None:
+            write_export(graph, args.format, sys.stdout)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                write_export(graph, args.format, f)
+        return 0
+
+    if args.query == 'path':
+        source, target = graph.node(args.source.strip('/')), graph.node(args.target.strip('/'))
+        for name, node in ((args.source, source), (args.target, target)):
+            if node is None:
+                print(f"❌ {name} is not in the link graph", file=sys.stderr)
+                return 1
+        route = graph.path(source, target)
+        if route is None:
+            print(f"❌ No chain of links leads from {args.source} to {args.target}", file=sys.stderr)
+            return 1
+        for node in route:
+            print(paths[node])
+        return 0
+
+    nodes = graph.resolve(args.path)
+    if not nodes:
+        print(f"❌ {args.path} is not in the link graph", file=sys.stderr)
+        return 1
+
+    if args.query == 'neighbors':
+        found = sorted({target for node in nodes for target in graph.neighbors(node)})
+    elif args.query == 'backlinks':
+        found = graph.linking_into(nodes)
+    else:
+        depth = graph.reachable(nodes, reverse=args.reverse, max_depth=args.depth)
+        found = sorted(node for node in depth if node not in nodes)
+    for node in found:
+        print(paths[node])
+    return 0
@@ -0,0 +1,107 @@
+"""
+`move`: move a note or folder and fix the links to it (scripts/move-note.py)
+
+Only the notes that link to what moved (found through the persisted
+backlink index) are read and rewritten, plus the moved notes themselves.
+"""
+
+import os
+
+from ..backlinks import BacklinkIndex, patch_links, plan_moves
+from ..noteindex import NoteIndex
+from ..writeback import WriteBack
+
+DESCRIPTION = "Move a note or folder and update the links to it"
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('source', help="note, attachment or folder to move")
+    parser.add_argument('destination', help="new path, or an existing folder to move into")
+    parser.add_argument('--vault', default=os.getcwd(), help="vault root (default: current directory)")
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help="list the files that would be moved and patched without changing anything")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="rebuild the note and backlink indexes from scratch")
+
+
+def move_files(root, moves, writer=None):
+    """Rename every file in moves, creating folders and removing emptied ones
+
+    With a writer (see vaultlinks.writeback) the renames are journaled
+    and committed through it.
+    """
+    for old, new in moves.items():
+        if writer is None:
+            os.renames(os.path.join(root, old), os.path.join(root, new))
+        else:
+            writer.move(os.path.join(root, old), os.path.join(root, new))
+    if writer is not None:
+        writer.flush()
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    root = os.path.abspath(args.vault)
+
+    print("🚚 Move Note")
+    print("=" * 50)
+
+    try:
+        moves = plan_moves(root, args.source, args.destination)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if not moves:
+        print("❌ Nothing to move")
+        return 1
+
+    note_index = NoteIndex.build(root, persist=not args.no_cache)
+    backlinks = BacklinkIndex.build(root, note_index, persist=not args.no_cache)
+
+    # Notes to patch: everything linking to a moved file, plus moved notes
+    # whose own relative links change with their folder
+    referencing = set(backlinks.referencing(moves))
+    referencing.update(old for old in moves if old.endswith('.md'))
+
+    print(f"📦 Moving {len(moves)} files")
+    print(f"🔗 {len(referencing)} of {len(backlinks.notes)} notes to check for links")
+
+    if args.dry_run:
+        for old, new in moves.items():
+            print(f"   {old} → {new}")
+        for relpath in sorted(referencing):
+            print(f"   ✏️  {relpath}")
+        return 0
+
+    # Read the referencing notes before anything moves
+    contents = {}
+    for relpath in referencing:
+        with open(os.path.join(root, relpath), 'r', encoding='utf-8') as f:
+            contents[relpath] = f.read()
+
+    # Moves and patches form one run for `vault.py undo`
+    patched = []
+    with WriteBack(root, 'move') as writer:
+        move_files(root, moves, writer)
+
+        for old_source in sorted(referencing):
+            new_source = moves.get(old_source, old_source)
+            content, count = patch_links(contents[old_source], old_source, new_source, moves, note_index)
+            if count:
+                writer.write(os.path.join(root, new_source), content)
+                patched.append((new_source, count))
+                print(f"✅ {new_source} ({count} links)")
+
+    # Keep both indexes current for the next move
+    changed_paths = list(moves) + list(moves.values()) + [moves.get(r, r) for r in referencing]
+    note_index.update([os.path.join(root, relpath) for relpath in changed_paths])
+    backlinks.update(changed_paths)
+    if not args.no_cache:
+        note_index.save()
+        backlinks.save()
+
+    print("=" * 50)
+    print(f"🎉 Moved {len(moves)} files and updated links in {len(patched)} notes")
+    return 0
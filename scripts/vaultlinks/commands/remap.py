@@ -0,0 +1,102 @@
+"""
+`remap`: update all markdown links to use the new folder structure (update-structure-links.py)
+"""
+
+import os
+
+from .. import prefilter, stream, writeback
+from ..noteindex import find_markdown_files
+from ..remap import LinkRemapper, load_mapping
+from ..writeback import WriteBack
+
+DESCRIPTION = "Update cross-references after moving notes"
+
+# Mapping of old file references to new paths (without .md extension)
+DEFAULT_LINK_MAPPING = {
+    "Authentication%20System": "02-backend/auth/Authentication System",
+    "Authentication System": "02-backend/auth/Authentication System",
+    "JWT%20Token%20Manager": "02-backend/auth/JWT Token Manager",
+    "JWT Token Manager": "02-backend/auth/JWT Token Manager",
+    "Database%20Layer": "02-backend/database/Database Layer",
+    "Database Layer": "02-backend/database/Database Layer",
+    "API%20Design": "02-backend/api/API Design",
+    "API Design": "02-backend/api/API Design",
+    "User%20Management": "02-backend/User Management",
+    "User Management": "02-backend/User Management",
+    "Error%20Handling": "02-backend/Error Handling",
+    "Error Handling": "02-backend/Error Handling",
+    "Frontend%20Components": "03-frontend/Frontend Components",
+    "Frontend Components": "03-frontend/Frontend Components",
+    "Testing%20Strategy": "04-testing/Testing Strategy",
+    "Testing Strategy": "04-testing/Testing Strategy",
+    "Configuration": "05-operations/Configuration"
+}
+
+
+def update_links_in_file(filepath, link_mapping, writer=None):
+    """Update links in a single file based on the mapping
+
+    `link_mapping` is a LinkRemapper compiled once per run; a plain dict is
+    accepted too but is then compiled again for every file. The note is
+    written back through `writer` (see vaultlinks.writeback).
+    """
+    if not isinstance(link_mapping, LinkRemapper):
+        link_mapping = LinkRemapper(link_mapping)
+
+    # Notes without any markdown link cannot need remapping
+    _, data, _ = prefilter.read_note(filepath, prefilter.MARKDOWN_LINKS, stream=True)
+    if data is None:
+        return False
+
+    # Update all markdown links [Text](File.md) to new paths in one scan
+    current_dir = os.path.dirname(filepath)
+    if data is prefilter.STREAM:
+        # Too large to load: remapped and written back piece by piece
+        updated = stream.rewrite_file(filepath, lambda text: link_mapping.remap(text, current_dir)[0],
+                                      writer=writer) is not None
+    else:
+        original_content = prefilter.decode(data)
+        content, _ = link_mapping.remap(original_content, current_dir)
+
+        # Write back if changed
+        updated = content != original_content
+        if updated:
+            writeback.write(filepath, content, writer)
+
+    if updated:
+        print(f"Updated links in: {os.path.relpath(filepath, link_mapping.root or os.getcwd())}")
+        return True
+    return False
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+    parser.add_argument('--mapping', metavar='FILE',
+                        help="JSON object or two-column CSV of old link -> new path (without .md)")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    vault_dir = args.vault_dir
+    link_mapping = load_mapping(args.mapping) if args.mapping else DEFAULT_LINK_MAPPING
+
+    print("Updating all cross-references to use new folder structure...")
+    print(f"📋 {len(link_mapping)} mapping entries")
+
+    # Compile the mapping once for the whole run
+    remapper = LinkRemapper(link_mapping, root=vault_dir)
+
+    # Find all markdown files
+    md_files = find_markdown_files(vault_dir)
+
+    updated_count = 0
+    with WriteBack(vault_dir, 'remap') as writer:
+        for md_file in md_files:
+            if update_links_in_file(md_file, remapper, writer):
+                updated_count += 1
+
+    print(f"\n✅ Updated {updated_count} files with new folder structure paths!")
+    print("🗂️ Documentation now properly organized and cross-linked!")
+    return 0
@@ -0,0 +1,90 @@
+"""
+`rewrite-history`: apply the link conversion to every revision of every note
+
+Old commits are rewritten so they render on GitHub too. Each unique .md
+blob in the history is converted once, however many commits contain it;
+see vaultlinks.history. The refs as they were before are kept under
+refs/original/.
+"""
+
+import time
+
+from .. import gitindex, prefilter
+from ..convert import CONVERT_TRIGGERS, convert_content
+from ..history import BACKUP_PREFIX, backup_refs, delete_backup, rewrite_history
+
+DESCRIPTION = "Convert [[links]] and fix link encoding in every commit of the history"
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('revisions', nargs='*',
+                        help="refs or rev-list arguments to rewrite (default: every ref except backups, "
+                             "git notes and the stash)")
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help="count the note revisions that would change without rewriting anything")
+    parser.add_argument('--force', action='store_true',
+                        help=f"replace the {BACKUP_PREFIX} backup left by an earlier rewrite")
+
+
+def convert_blob(data):
+    """Converted note bytes, or None if the note needs no change
+
+    Wikilinks are not resolved against the vault: a blob is converted the
+    same way in every commit that contains it, whatever the tree around it.
+    """
+    if not prefilter.found_in(CONVERT_TRIGGERS, data):
+        return None
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    new_content, _, _ = convert_content(content)
+    if new_content == content:
+        return None
+    return new_content.encode('utf-8')
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    print("🕰️  History Link Converter")
+    print("=" * 50)
+
+    try:
+        top = gitindex.toplevel()
+        if not args.dry_run:
+            if gitindex.run_git(['status', '--porcelain', '--untracked-files=no'], cwd=top).strip():
+                print("❌ Commit or stash your changes first; the checkout is reset to the rewritten HEAD")
+                return 1
+            if args.force:
+                delete_backup(top)
+            print(f"💾 Backed up {backup_refs(top)} refs under {BACKUP_PREFIX}")
+
+        start = time.perf_counter()
+        stats = rewrite_history(convert_blob, args.revisions or None, args.dry_run, top)
+        seconds = time.perf_counter() - start
+
+        if not args.dry_run and stats['rewritten']:
+            gitindex.run_git(['reset', '--hard', '--quiet'], cwd=top)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"📜 {stats['commits']} commits, {stats['notes']} note changes, "
+          f"{stats['blobs']} unique note revisions read in {seconds:.1f}s")
+    print("=" * 50)
+
+    if not stats['rewritten']:
+        print("✅ Every revision already uses GitHub-compatible links!")
+        return 0
+
+    if args.dry_run:
+        print(f"🔎 {stats['rewritten']} note revisions would be converted")
+        return 0
+
+    print(f"🎉 Converted {stats['rewritten']} note revisions")
+    print("\n💡 Next steps:")
+    print(f"   git diff --stat {BACKUP_PREFIX}refs/heads/<branch> <branch>  # Compare with the originals")
+    print("   git push --force-with-lease                                  # Publish the new history")
+    print("   python3 scripts/vault.py rewrite-history --force             # Later runs replace the backup")
+    return 0
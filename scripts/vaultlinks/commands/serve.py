@@ -0,0 +1,129 @@
+"""
+`serve`: keep the commands loaded and run them for clients over a local socket
+
+The pre-commit hook otherwise pays for interpreter startup and imports on
+every commit. A server started once per vault keeps the modules imported;
+`vault.py --server convert --staged` (or VAULTLINKS_SERVER=1) then costs
+a single round trip. Requests are handled one at a time, each in the
+client's working directory and with the client's GIT_* variables passed
+to every git process it starts. Restart the server after updating the
+scripts.
+"""
+
+import contextlib
+import io
+import json
+import os
+import socket
+import traceback
+
+from .. import cli
+from ..client import END_OF_OUTPUT, connect, socket_path, stop
+from ..gitindex import environment
+
+DESCRIPTION = "Serve the vault commands over a local socket for fast hook runs"
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('--vault', default=os.getcwd(), help="vault root (default: current directory)")
+    parser.add_argument('--preload', default='convert',
+                        help="comma-separated commands to import at startup (default: %(default)s)")
+    parser.add_argument('--stop', action='store_true', help="stop the server running for the vault")
+
+
+def handle(conn, root):
+    """Serve one request; returns False when asked to stop"""
+    with conn.makefile('rb') as reader:
+        line = reader.readline()
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return True
+
+    if request.get('stop'):
+        conn.sendall(END_OF_OUTPUT + b'0\n')
+        return False
+
+    argv = request.get('argv') or []
+    output = io.TextIOWrapper(conn.makefile('wb'), encoding='utf-8', write_through=True)
+    status = 1
+    try:
+        os.chdir(request.get('cwd') or root)
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output), \
+                environment(request.get('env') or {}):
+            try:
+                if not argv or argv[0] not in cli.COMMANDS or argv[0] == 'serve':
+                    print(f"❌ Unknown command: {' '.join(argv[:1])}")
+                else:
+                    status = cli.run_command(argv[0], argv[1:], prog=f"vault.py {argv[0]}")
+            except SystemExit as e:
+                # argparse errors and --help
+                status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception:
+                traceback.print_exc()
+                status = 1
+        output.flush()
+        conn.sendall(END_OF_OUTPUT + f'{status or 0}\n'.encode('ascii'))
+    except OSError:
+        # The client went away; nothing left to report to
+        pass
+    finally:
+        os.chdir(root)
+        output.detach()
+    return True
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    root = os.path.abspath(args.vault)
+    path = socket_path(root)
+
+    if args.stop:
+        if stop(root):
+            print("🛑 Vault server stopped")
+            return 0
+        print("❌ No vault server is running")
+        return 1
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("❌ Server mode needs Unix domain sockets, which this platform lacks")
+        return 1
+
+    existing = connect(path)
+    if existing is not None:
+        existing.close()
+        print(f"❌ A vault server is already running on {os.path.relpath(path)}")
+        return 1
+    if os.path.exists(path):
+        os.unlink(path)  # left behind by a server that did not exit cleanly
+
+    for name in filter(None, (name.strip() for name in args.preload.split(','))):
+        cli.load_command(name)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # The socket is created accessible to its owner only, never to others
+        umask = os.umask(0o177)
+        try:
+            server.bind(path)
+        finally:
+            os.umask(umask)
+        server.listen()
+        print(f"🚀 Vault server listening on {os.path.relpath(path)}, Ctrl-C or --stop to quit")
+
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                if not handle(conn, root):
+                    break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+    print("👋 Vault server stopped")
+    return 0
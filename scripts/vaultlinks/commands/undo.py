@@ -0,0 +1,54 @@
+"""
+`undo`: restore the notes the last run changed
+
+Every command that rewrites or moves notes journals the run under
+.cache/vaultlinks/undo/, keeping the originals; see vaultlinks.writeback.
+Notes edited since that run are left alone unless --force is given.
+"""
+
+import os
+import time
+
+from ..writeback import load_journal, undo
+
+DESCRIPTION = "Restore the notes changed by the last run"
+
+
+def add_arguments(parser):
+    """Command line options"""
+    parser.add_argument('vault_dir', nargs='?', default=os.getcwd(),
+                        help="vault root (default: current directory)")
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help="list what would be restored without changing anything")
+    parser.add_argument('--force', action='store_true',
+                        help="also restore notes that were edited after the run")
+
+
+def run(args):
+    """Run the command; returns the exit code"""
+    root = os.path.abspath(args.vault_dir)
+
+    print("⏪ Undo Last Run")
+    print("=" * 50)
+
+    journal = load_journal(root)
+    if journal is None:
+        print("✅ Nothing to undo")
+        return 0
+
+    when = time.strftime('%Y-%m-%d %H:%M', time.localtime(journal.time)) if journal.time else "unknown time"
+    print(f"📜 {journal.command} at {when}: {len(journal.entries)} changes")
+
+    restored, skipped, moved_back = undo(root, force=args.force, dry_run=args.dry_run)
+
+    for new, old in moved_back:
+        print(f"↩️  {new} → {old}")
+    for relpath in restored:
+        print(f"✅ {relpath}")
+    for relpath in skipped:
+        print(f"⚠️  {relpath} changed since the run; left as it is (--force restores it)")
+
+    print("=" * 50)
+    verb = "Would restore" if args.dry_run else "Restored"
+    print(f"🎉 {verb} {len(restored)} notes and {len(moved_back)} moves")
+    return 1 if skipped else 0
@@ -0,0 +1,171 @@
+"""
+GitHub-compatible link conversion used by scripts/convert-obsidian-links.py
+
+Converts [[Obsidian links]] to [GitHub links](File%20Name.md) and fixes
+URL encoding in existing markdown links, all in one scan of the note.
+[[Note#Heading]] links point at the heading's GitHub anchor, and
+![[diagram.png]] embeds become images.
+"""
+
+import posixpath
+import re
+import urllib.parse
+
+from . import prefilter, scanner
+from .anchors import fragment_slug
+from .canonical import canonical_target
+from .metrics import NULL_METRICS
+
+WHITESPACE = re.compile(r'\s')
+
+# ![[embeds]] of these become images; other embedded files become links
+IMAGE_EXTENSIONS = frozenset(('avif', 'bmp', 'gif', 'jpeg', 'jpg', 'png', 'svg', 'webp'))
+
+# Extensions Obsidian opens as attachments rather than notes; an
+# unresolved [[name.pdf]] links to the file itself, not name.pdf.md
+ATTACHMENT_EXTENSIONS = IMAGE_EXTENSIONS | frozenset((
+    'flac', 'm4a', 'mp3', 'ogg', 'wav', '3gp',
+    'mkv', 'mov', 'mp4', 'ogv', 'webm',
+    'pdf', 'canvas',
+))
+
+# ![[image.png|300]] and ![[image.png|300x200]] give a size, not alt text
+EMBED_SIZE = re.compile(r'\d+(?:x\d+)?')
+
+# convert_content can only change notes containing one of these
+CONVERT_TRIGGERS = prefilter.union(prefilter.WIKILINKS, prefilter.MULTIPLE_ENCODING,
+                                   prefilter.SPACED_MD_LINK)
+
+
+def extension(name):
+    """Lower-case extension of a file name or link path, without the dot"""
+    return posixpath.splitext(name)[1][1:].lower()
+
+
+def wikilink_target(token, resolve=None):
+    """Build the Link.md target for a [[Link]] or [[Link|Display]] token
+
+    `resolve(name, fragment)` returns the encoded relative path of the
+    note or file a name refers to, with the anchor of the #fragment, or
+    None; unresolved links point at Link.md (or the attachment named)
+    next to the current file.
+    """
+    name, _, fragment = token.target.partition('#')
+    if resolve is not None:
+        link_path = resolve(name, fragment)
+        if link_path is not None:
+            return link_path
+
+    name = name.strip()
+    anchor = fragment_slug(fragment)
+    if not name:
+        return '#' + anchor
+    if extension(name) in ATTACHMENT_EXTENSIONS:
+        return urllib.parse.quote(name)
+    # URL encode the filename (spaces -> %20)
+    return urllib.parse.quote(name, safe='') + '.md' + ('#' + anchor if anchor else '')
+
+
+def wikilink_markdown(token, link_path):
+    """Markdown for a wikilink token pointing at link_path
+
+    [[Note#Heading]] reads "Note > Heading", as in Obsidian. Embedded
+    files become images; embedded notes become plain links, as GitHub
+    cannot show one note inside another.
+    """
+    name, _, fragment = token.target.partition('#')
+    image = token.embed and extension(urllib.parse.unquote(link_path.partition('#')[0])) in IMAGE_EXTENSIONS
+    if token.kind == scanner.ALIAS and not (image and EMBED_SIZE.fullmatch(token.text.strip())):
+        text = token.text.strip()
+    elif image:
+        text = posixpath.basename(name.strip().replace('\\', '/'))
+    elif fragment:
+        text = ' > '.join(part.strip() for part in [name] + fragment.split('#') if part.strip())
+    else:
+        text = token.text.strip()
+    return f'{"!" if image else ""}[{text}]({link_path})'
+
+
+def note_resolver(note_index, filepath):
+    """Wikilink resolver for notes linked from filepath, or None without an index"""
+    if note_index is None:
+        return None
+    return lambda name, fragment='': note_index.link_target(name, filepath, fragment)
+
+
+def fix_target_encoding(link_path):
+    """Fix multiple encoding and unencoded spaces in a single link target"""
+    link_path = canonical_target(link_path)
+
+    # Only fix .md links with spaces, skip external URLs
+    if not scanner.is_external(link_path) and link_path.endswith('.md') and ' ' in link_path:
+        link_path = link_path.replace(' ', '%20')
+
+    return link_path
+
+
+def convert_link(token, resolve=None):
+    """Return the GitHub-compatible form of a link token, or None to keep it"""
+    if token.kind in (scanner.WIKILINK, scanner.ALIAS):
+        # Handle pipe syntax [[Link|Display Text]] -> [Display Text](Link.md)
+        return wikilink_markdown(token, fix_target_encoding(wikilink_target(token, resolve)))
+
+    if token.text is not None:
+        return f'[{token.text}]({fix_target_encoding(token.target)})'
+
+    return None
+
+
+def convert_obsidian_to_markdown_links(content, resolve=None):
+    """Convert [[Link]] to [Link](Link.md) format with proper URL encoding"""
+
+    def replace_link(token):
+        if token.kind in (scanner.WIKILINK, scanner.ALIAS):
+            return wikilink_markdown(token, wikilink_target(token, resolve))
+        return None
+
+    return scanner.rewrite(content, replace_link)[0]
+
+
+def fix_url_encoding(content):
+    """Fix common URL encoding issues"""
+
+    def replace_link(token):
+        if token.kind in (scanner.LINK, scanner.URL) and token.text is not None:
+            return convert_link(token)
+        return None
+
+    return scanner.rewrite(content, replace_link)[0]
+
+
+def convert_content(content, resolve=None, metrics=NULL_METRICS):
+    """Apply both conversions in a single scan
+
+    Returns (new_content, obsidian_links, space_links), counting the
+    [[links]] found and the .md links with unencoded spaces. Links found
+    and rewritten per token kind are added to `metrics`.
+    """
+    space_links = 0
+
+    def replace_link(token):
+        nonlocal space_links
+        if token.kind == scanner.LINK and token.target.endswith('.md') \
+                and WHITESPACE.search(token.target):
+            space_links += 1
+        return convert_link(token, resolve)
+
+    content, found, rewritten = scanner.rewrite(content, replace_link)
+    metrics.add_links(found, rewritten)
+    metrics.count('space_links', space_links)
+    obsidian_links = found[scanner.WIKILINK] + found[scanner.ALIAS]
+    return content, obsidian_links, space_links
+
+
+def describe_changes(obsidian_links, space_links):
+    """Human-readable list of what a conversion fixed"""
+    changes = []
+    if obsidian_links > 0:
+        changes.append(f"{obsidian_links} Obsidian [[links]]")
+    if space_links > 0:
+        changes.append(f"{space_links} unencoded spaces")
+    return changes
@@ -0,0 +1,292 @@
+"""
+Out-of-place export of the vault as a GitHub-ready mirror
+
+Notes the conversion changes are written to the output folder; unchanged
+notes and attachments are hard-linked (or reflinked, or copied across
+filesystems) instead, so their bytes are never read or written. The
+source and output stat of every exported file are kept under
+.cache/vaultlinks/, and a re-export only refreshes outputs whose source
+changed, plus converted notes linking to a name whose notes or aliases
+changed.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+
+from . import prefilter, stream
+from .writeback import temp_path
+from .convert import CONVERT_TRIGGERS, convert_content, note_resolver
+from .manifest import CACHE_DIR
+
+# Bump whenever the conversion changes, so every converted note is redone
+EXPORT_VERSION = 2
+
+FORMAT_VERSION = 1
+
+# How the output of a file was produced
+CONVERTED = 'converted'
+LINKED = 'linked'
+
+LINK_MODES = ('hard', 'reflink', 'copy')
+
+# ioctl(dest, FICLONE, src) shares the extents of src on Btrfs, XFS and others
+FICLONE = 0x40049409
+
+# errno values meaning "this kind of link cannot be made here"
+_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP, errno.EINVAL,
+                errno.ENOTTY, errno.ENOSYS}
+
+
+def walk_files(root):
+    """Yield (relpath, stat) for every file, skipping hidden ones"""
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = list(os.scandir(os.path.join(root, rel_dir)))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            relpath = posixpath.join(rel_dir, entry.name) if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(relpath)
+            elif entry.is_file():
+                yield relpath, entry.stat()
+
+
+def link_key(name):
+    """Case-folded basename a [[link]] name is resolved by"""
+    name = name.strip().replace('\\', '/')
+    if name.endswith('.md'):
+        name = name[:-3]
+    return posixpath.basename(name).casefold()
+
+
+def note_snapshot(note_index):
+    """{relpath: what links can resolve to in it} of every file, or None without an index
+
+    Notes give [aliases, anchors]; the other files, which links can only
+    name, give [].
+    """
+    if note_index is None:
+        return None
+    snapshot = dict.fromkeys(note_index.attachments, [])
+    snapshot.update((relpath, entry[2:]) for relpath, entry in note_index.notes.items())
+    return snapshot
+
+
+def affected_keys(old_notes, new_notes):
+    """Link keys whose resolution may differ between two note snapshots
+
+    A [[link]] only resolves differently when a note or file with its
+    name (or alias) appeared, went away, or changed aliases or headings.
+    Returns None when every key is affected.
+    """
+    if (old_notes is None) != (new_notes is None):
+        return None
+    keys = set()
+    for relpath in (old_notes or {}).keys() | (new_notes or {}).keys():
+        old_entry = old_notes.get(relpath)
+        new_entry = new_notes.get(relpath)
+        if old_entry == new_entry:
+            continue
+        keys.add(link_key(relpath))
+        for entry in (old_entry, new_entry):
+            if entry:
+                keys.update(alias.casefold() for alias in entry[0])
+    return keys
+
+
+def reflink(source, dest):
+    """Clone source into dest sharing its data blocks; OSError where unsupported"""
+    import fcntl
+
+    with open(source, 'rb') as src, open(dest, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def place(source, dest, mode='hard'):
+    """Make dest a link to (or copy of) source; returns the method used
+
+    Falls back from a hard link to a reflink to a copy when the output
+    folder is on another filesystem or the filesystem lacks the feature.
+    dest is replaced atomically, so an earlier hard link is never written
+    through.
+    """
+    # Renaming a link over another link to the same file does nothing and
+    # would leave the temporary file behind
+    if mode == 'hard' and os.path.exists(dest) and os.path.samefile(source, dest):
+        return mode
+    tmp = temp_path(dest)
+    if os.path.lexists(tmp):
+        os.unlink(tmp)  # left behind by an interrupted export
+    for method in LINK_MODES[LINK_MODES.index(mode):]:
+        try:
+            if method == 'hard':
+                os.link(source, tmp)
+            elif method == 'reflink':
+                reflink(source, tmp)
+            else:
+                shutil.copyfile(source, tmp)
+            os.replace(tmp, dest)
+            return method
+        except (OSError, ImportError) as e:
+            if os.path.lexists(tmp):
+                os.unlink(tmp)
+            if method == 'copy' or (isinstance(e, OSError) and e.errno not in _UNSUPPORTED):
+                raise
+
+
+def write_output(dest, data):
+    """Write converted bytes to dest through a temporary file"""
+    tmp = temp_path(dest)
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, dest)
+
+
+def export_note(source, dest, note_index=None, mode='hard'):
+    """Export one note; returns (kind, method, link keys)
+
+    Notes without a trigger, or that convert to themselves, are linked
+    like attachments; the others are converted and written. The link keys
+    of the [[links]] a converted note resolved are returned for
+    affected_keys to match against later. Notes too large to load are
+    converted piece by piece.
+    """
+    _, data, _ = prefilter.read_note(source, CONVERT_TRIGGERS, stream=True)
+    if data is not None:
+        keys = set()
+        resolve_note = note_resolver(note_index, source)
+        resolve = None
+        if resolve_note is not None:
+            def resolve(name, fragment=''):
+                keys.add(link_key(name))
+                return resolve_note(name, fragment)
+
+        if data is prefilter.STREAM:
+            if stream.rewrite_file(source, lambda text: convert_content(text, resolve)[0], dest) is not None:
+                return CONVERTED, 'write', sorted(keys)
+            return LINKED, place(source, dest, mode), []
+
+        content = prefilter.decode(data)
+        new_content, _, _ = convert_content(content, resolve)
+        if new_content != content:
+            write_output(dest, new_content.encode('utf-8'))
+            return CONVERTED, 'write', sorted(keys)
+    return LINKED, place(source, dest, mode), []
+
+
+# Note index shared with pool workers through init_worker
+_worker_note_index = None
+
+
+def init_worker(note_index):
+    """Pool initializer: install the vault's note index in a worker process"""
+    global _worker_note_index
+    _worker_note_index = note_index
+
+
+def export_note_job(source, dest, mode):
+    """Worker-side export_note: returns (kind, method, link keys, error)"""
+    try:
+        return export_note(source, dest, _worker_note_index, mode) + (None,)
+    except (OSError, UnicodeDecodeError) as e:
+        return None, None, [], str(e)
+
+
+class ExportState:
+    """What was exported to one output folder, keyed by vault-relative path
+
+    Each entry is [source size, source mtime_ns, kind, output size,
+    output mtime_ns, link keys]. `notes` is the note snapshot the
+    converted notes were resolved against.
+    """
+
+    def __init__(self, root, out_dir):
+        self.root = os.path.abspath(root)
+        self.out_dir = os.path.abspath(out_dir)
+        name = hashlib.sha1(self.out_dir.encode('utf-8')).hexdigest()[:12]
+        self.path = os.path.join(self.root, CACHE_DIR, f'export-{name}.json')
+        self.files = {}
+        self.notes = None
+        self.written_ns = 0
+
+    @classmethod
+    def load(cls, root, out_dir):
+        """Load the state of earlier exports to out_dir, starting empty if unreadable"""
+        state = cls(root, out_dir)
+        try:
+            with open(state.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                written_ns = os.fstat(f.fileno()).st_mtime_ns
+        except (OSError, ValueError):
+            return state
+
+        if (data.get('format') == FORMAT_VERSION and data.get('version') == EXPORT_VERSION
+                and data.get('out') == state.out_dir):
+            state.files = data.get('files', {})
+            state.notes = data.get('notes')
+            state.written_ns = written_ns
+        return state
+
+    def fresh(self, relpath, st, affected):
+        """True if the output of relpath is still what an export would produce
+
+        `affected` holds the link keys whose resolution changed since the
+        last export, or None if all did. Like the manifest, entries not
+        older than the state file are racy and never trusted on stat alone.
+        """
+        entry = self.files.get(relpath)
+        if entry is None:
+            return False
+        size, mtime_ns, kind, out_size, out_mtime_ns, keys = entry
+        if size != st.st_size or mtime_ns != st.st_mtime_ns or mtime_ns >= self.written_ns:
+            return False
+        if kind == CONVERTED and (affected is None or not affected.isdisjoint(keys)):
+            return False
+        try:
+            out = os.stat(os.path.join(self.out_dir, relpath))
+        except OSError:
+            return False
+        return out.st_size == out_size and out.st_mtime_ns == out_mtime_ns
+
+    def record(self, relpath, st, kind, keys=()):
+        out = os.stat(os.path.join(self.out_dir, relpath))
+        self.files[relpath] = [st.st_size, st.st_mtime_ns, kind, out.st_size, out.st_mtime_ns, list(keys)]
+
+    def save(self):
+        """Write the state atomically"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            'format': FORMAT_VERSION,
+            'version': EXPORT_VERSION,
+            'out': self.out_dir,
+            'notes': self.notes,
+            'files': self.files,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+
+def remove_output(out_dir, relpath):
+    """Delete an exported file and the folders it leaves empty"""
+    try:
+        os.unlink(os.path.join(out_dir, relpath))
+    except FileNotFoundError:
+        pass
+    folder = posixpath.dirname(relpath)
+    while folder:
+        try:
+            os.rmdir(os.path.join(out_dir, folder))
+        except OSError:
+            break
+        folder = posixpath.dirname(folder)
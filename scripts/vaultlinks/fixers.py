@@ -0,0 +1,159 @@
+"""
+Content transforms of the standalone fixer scripts
+
+Each function takes a note's text and returns the fixed text, so the
+scripts and the fused vault doctor pipeline share one implementation.
+"""
+
+import urllib.parse
+
+from . import prefilter, scanner
+from .canonical import canonical_target
+
+
+# convert-links.py
+
+CONVERT_LINKS_TRIGGERS = prefilter.WIKILINKS
+
+
+def convert_obsidian_links_to_markdown(content):
+    """Convert [[Link]] to [Link](Link.md) format with URL encoding for spaces"""
+
+    def replace_link(token):
+        if token.kind not in (scanner.WIKILINK, scanner.ALIAS):
+            return None
+        # An ![[embed]] keeps its '!', which is part of the token
+        bang = '!' if token.embed else ''
+        link_text = content[token.start + len(bang) + 2:token.end - 2]
+        # URL encode the filename (replace spaces with %20, etc.)
+        filename = urllib.parse.quote(link_text.replace(' ', '%20')) + '.md'
+        return f'{bang}[{link_text}]({filename})'
+
+    # The scanner skips [[Link Text]] inside fenced and inline code
+    return scanner.rewrite(content, replace_link)[0]
+
+
+# fix-all-links.py
+
+FIX_ALL_LINKS_TRIGGERS = prefilter.MARKDOWN_LINKS
+
+
+def fix_markdown_links(content):
+    """Fix all [text](path) links to properly encode URLs"""
+
+    def fix_link(token):
+        # Only process relative paths (not external URLs)
+        if token.kind != scanner.LINK:
+            return None  # Leave unchanged
+
+        link_text = token.text
+        link_path = token.target
+
+        # Split path into directory and filename
+        if '/' in link_path:
+            path_parts = link_path.split('/')
+            # URL encode each part that might contain spaces
+            encoded_parts = []
+            for part in path_parts:
+                if part.endswith('.md'):
+                    # Encode the filename (without .md)
+                    filename = part[:-3]  # Remove .md
+                    encoded_filename = urllib.parse.quote(filename, safe='')
+                    encoded_parts.append(encoded_filename + '.md')
+                else:
+                    # Directory names - keep as is since they don't have spaces in our structure
+                    encoded_parts.append(part)
+            fixed_path = '/'.join(encoded_parts)
+        else:
+            # Just a filename
+            if link_path.endswith('.md'):
+                filename = link_path[:-3]
+                fixed_path = urllib.parse.quote(filename, safe='') + '.md'
+            else:
+                fixed_path = urllib.parse.quote(link_path, safe='')
+
+        return f'[{link_text}]({fixed_path})'
+
+    # Scan [text](path) links once, skipping code
+    return scanner.rewrite(content, fix_link)[0]
+
+
+# fix-encoding.py
+
+FIX_ENCODING_TRIGGERS = prefilter.union(prefilter.MULTIPLE_ENCODING, prefilter.SPACED_MD_LINK)
+
+
+def fix_target_encoding(link_path):
+    """Fix double (or deeper) encoding in a single link target"""
+    return canonical_target(link_path)
+
+
+def fix_target(link_path):
+    """Fix over-encoding and unencoded spaces in one .md link target"""
+    link_path = fix_target_encoding(link_path)
+
+    # Only fix relative paths ending in .md
+    if not scanner.is_external(link_path) and link_path.endswith('.md'):
+        # Simple replacement: space -> %20
+        link_path = link_path.replace(' ', '%20')
+
+    return link_path
+
+
+def fix_over_encoding(content):
+    """Fix %2520 (double encoded) back to %20 (single encoded)"""
+
+    def fix_link(token):
+        if token.text is None or token.kind not in (scanner.LINK, scanner.URL):
+            return None
+        return f'[{token.text}]({fix_target_encoding(token.target)})'
+
+    return scanner.rewrite(content, fix_link)[0]
+
+
+def fix_markdown_links_simple(content):
+    """Simple approach: just ensure spaces in .md links are %20"""
+
+    def fix_link(token):
+        # Only fix relative paths ending in .md
+        if token.kind == scanner.LINK and token.target.endswith('.md'):
+            # Simple replacement: space -> %20
+            fixed_path = token.target.replace(' ', '%20')
+            return f'[{token.text}]({fixed_path})'
+
+        return None
+
+    return scanner.rewrite(content, fix_link)[0]
+
+
+def fix_links(content):
+    """Fix over-encoding and spaces in a single scan"""
+
+    def fix_link(token):
+        if token.text is None or token.kind not in (scanner.LINK, scanner.URL):
+            return None
+        return f'[{token.text}]({fix_target(token.target)})'
+
+    return scanner.rewrite(content, fix_link)[0]
+
+
+# fix-multiple-encoding.py
+
+FIX_MULTIPLE_ENCODING_TRIGGERS = prefilter.MULTIPLE_ENCODING
+
+
+def fix_multiple_encoding(content):
+    """Fix multiple levels of URL encoding in link targets"""
+    if not prefilter.found_in(FIX_MULTIPLE_ENCODING_TRIGGERS, content):
+        return content
+
+    def fix_link(token):
+        if token.kind not in (scanner.LINK, scanner.URL):
+            return None
+        target = canonical_target(token.target)
+        if target == token.target:
+            return None
+        # Bare URLs have no [text]
+        return target if token.text is None else f'[{token.text}]({target})'
+
+    return scanner.rewrite(content, fix_link)[0]
@@ -0,0 +1,136 @@
+"""
+Bounded-concurrency file I/O for vaults on slow filesystems
+
+On sshfs, NFS or a sync client's folder every scandir(), stat(), open()
+and read() costs a network round trip. An IOPool overlaps those calls on
+a thread pool with at most `io_jobs` of them in flight, and hands the
+results back in order, so reports match a serial run. Only I/O runs in
+the threads: decoding and conversion stay with the caller. With
+io_jobs=1 everything runs inline and no thread is started.
+"""
+
+import os
+from collections import deque
+
+# --io-jobs 0 picks this many threads; they mostly wait on the network
+AUTO_IO_JOBS = 32
+
+
+def resolve_io_jobs(io_jobs):
+    """Map an --io-jobs value to a thread count (0 means AUTO_IO_JOBS)"""
+    if io_jobs is None or io_jobs < 0:
+        return 1
+    if io_jobs == 0:
+        return AUTO_IO_JOBS
+    return io_jobs
+
+
+def list_dir(root, rel_dir):
+    """[(name, is_dir, is_file)] for one folder in scandir order, [] if unreadable
+
+    is_dir does not follow symlinks, so linked folders are never entered.
+    """
+    try:
+        with os.scandir(os.path.join(root, rel_dir)) as entries:
+            return [(entry.name, entry.is_dir(follow_symlinks=False), entry.is_file()) for entry in entries]
+    except OSError:
+        return []
+
+
+def _join(rel_dir, name):
+    return f'{rel_dir}/{name}' if rel_dir else name
+
+
+class IOPool:
+    """Thread pool for file system calls, used as a context manager"""
+
+    def __init__(self, io_jobs=1):
+        self.io_jobs = resolve_io_jobs(io_jobs)
+        self.executor = None
+        if self.io_jobs > 1:
+            # Only threaded runs pay for importing concurrent.futures
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(max_workers=self.io_jobs, thread_name_prefix='vaultlinks-io')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def imap(self, func, items):
+        """Yield func(item) for every item, in order
+
+        At most io_jobs calls run at once, and only twice that many
+        results are held ahead of the consumer, so a slow consumer does not
+        make the whole vault pile up in memory. An exception raised by func
+        is re-raised at its item's position.
+        """
+        if self.executor is None:
+            for item in items:
+                yield func(item)
+            return
+
+        window = deque()
+        for item in items:
+            window.append(self.executor.submit(func, item))
+            if len(window) >= 2 * self.io_jobs:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+    def list_tree(self, root):
+        """{rel_dir: list_dir(root, rel_dir)} for every folder not starting with '.'
+
+        Subfolders are listed as soon as their parent is, so the listing
+        costs about the depth of the tree in round trips, not the number of
+        folders.
+        """
+        tree = {}
+        if self.executor is None:
+            stack = ['']
+            while stack:
+                rel_dir = stack.pop()
+                tree[rel_dir] = list_dir(root, rel_dir)
+                stack.extend(_join(rel_dir, name) for name, is_dir, _ in tree[rel_dir]
+                             if is_dir and not name.startswith('.'))
+            return tree
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pending = {self.executor.submit(list_dir, root, ''): ''}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel_dir = pending.pop(future)
+                tree[rel_dir] = future.result()
+                for name, is_dir, _ in tree[rel_dir]:
+                    if is_dir and not name.startswith('.'):
+                        subdir = _join(rel_dir, name)
+                        pending[self.executor.submit(list_dir, root, subdir)] = subdir
+        return tree
+
+
+def walk_order(tree):
+    """Folders of a list_tree result in os.walk's top-down order"""
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        yield rel_dir
+        subdirs = [_join(rel_dir, name) for name, is_dir, _ in tree.get(rel_dir, [])
+                   if is_dir and not name.startswith('.')]
+        stack.extend(reversed(subdirs))
+
+
+def stat_or_none(path):
+    """os.stat(path), or None if the file is gone"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
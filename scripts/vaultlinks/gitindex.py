@@ -0,0 +1,154 @@
+"""
+Batched access to staged notes in the git index
+
+Staged .md paths and their blob ids come from one `git diff --cached`
+call and all blob contents from one `git cat-file --batch` call, so a
+pre-commit run costs the size of the commit, not the size of the vault.
+The blob ids of unmodified tracked notes come from `git ls-files`, which
+relies on the index's stat data instead of reading the notes.
+
+Every git process gets git_env(): normally the process's own environment,
+but while the server runs a request inside environment(), the GIT_*
+variables of the client (GIT_INDEX_FILE in a `git commit -a` hook, for
+one) replace the server's.
+"""
+
+import contextlib
+import os
+import subprocess
+
+# GIT_* variables of the request being served, or None outside one
+_request_environment = None
+
+
+def git_env():
+    """env= for a git subprocess: None (inherit), or the request's GIT_* variables"""
+    if _request_environment is None:
+        return None
+    env = {name: value for name, value in os.environ.items() if not name.startswith('GIT_')}
+    env.update(_request_environment)
+    return env
+
+
+@contextlib.contextmanager
+def environment(variables):
+    """Run the git commands of the block with these GIT_* variables instead of the process's own"""
+    global _request_environment
+    saved, _request_environment = _request_environment, dict(variables)
+    try:
+        yield
+    finally:
+        _request_environment = saved
+
+
+def run_git(args, input=None, cwd=None):
+    """Run a git command and return its stdout as bytes"""
+    result = subprocess.run(['git'] + args, input=input, cwd=cwd, env=git_env(),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', 'replace').strip()
+        raise RuntimeError(f"git {args[0]} failed: {message}")
+    return result.stdout
+
+
+def toplevel(cwd=None):
+    """Absolute path of the repository's working tree"""
+    return run_git(['rev-parse', '--show-toplevel'], cwd=cwd).decode('utf-8').strip()
+
+
+def staged_markdown(cwd=None):
+    """List (mode, blob_id, path) for every added, copied or modified .md file
+
+    Paths are relative to the top of the working tree.
+    """
+    output = run_git(['diff', '--cached', '--raw', '-z', '--no-renames',
+                      '--diff-filter=ACM', '--', '*.md'], cwd=cwd)
+    fields = output.split(b'\0')
+    staged = []
+
+    # Records are ":oldmode newmode oldsha newsha status\0path\0"
+    for i in range(0, len(fields) - 1, 2):
+        meta, path = fields[i], fields[i + 1]
+        _, mode, _, blob_id, _ = meta.decode('ascii').split(' ')
+        staged.append((mode, blob_id, os.fsdecode(path)))
+
+    return staged
+
+
+def unmodified_markdown(cwd=None):
+    """{path: blob_id} for tracked .md files whose working tree copy matches the index
+
+    Paths are relative to cwd. Symlinks, submodules and conflicted paths
+    are left out.
+    """
+    listing = run_git(['ls-files', '--stage', '-z', '--', '*.md'], cwd=cwd)
+    modified = set(run_git(['ls-files', '--modified', '-z', '--', '*.md'], cwd=cwd).split(b'\0'))
+    unmodified = {}
+
+    # Records are "<mode> <sha> <stage>\t<path>\0"
+    for record in listing.split(b'\0'):
+        if not record:
+            continue
+        meta, path = record.split(b'\t', 1)
+        mode, blob_id, stage = meta.decode('ascii').split(' ')
+        if mode in ('100644', '100755') and stage == '0' and path not in modified:
+            unmodified[os.fsdecode(path)] = blob_id
+
+    return unmodified
+
+
+def read_blobs(blob_ids, cwd=None, missing_ok=False):
+    """Read many blobs with a single `git cat-file --batch`; returns {id: bytes}
+
+    With missing_ok, ids not in the object database are left out of the
+    result instead of raising.
+    """
+    if not blob_ids:
+        return {}
+
+    unique_ids = list(dict.fromkeys(blob_ids))
+    output = run_git(['cat-file', '--batch'], input=''.join(f'{b}\n' for b in unique_ids).encode('ascii'),
+                     cwd=cwd)
+    blobs = {}
+    pos = 0
+
+    # Each object is "<id> <type> <size>\n<content>\n"
+    for blob_id in unique_ids:
+        header_end = output.index(b'\n', pos)
+        header = output[pos:header_end].decode('ascii').split(' ')
+        if header[-1] == 'missing':
+            if missing_ok:
+                pos = header_end + 1
+                continue
+            raise RuntimeError(f"git object {blob_id} is missing")
+        size = int(header[2])
+        start = header_end + 1
+        blobs[blob_id] = output[start:start + size]
+        pos = start + size + 1
+
+    return blobs
+
+
+def write_blobs(contents, cwd=None):
+    """Store many blobs with a single `git fast-import`; returns their ids in order"""
+    if not contents:
+        return []
+
+    # Each blob gets a mark, and get-mark prints its id once it is written
+    stream = []
+    for mark, content in enumerate(contents, 1):
+        stream.append(b'blob\nmark :%d\ndata %d\n' % (mark, len(content)))
+        stream.append(content)
+        stream.append(b'\n')
+    stream.extend(b'get-mark :%d\n' % mark for mark in range(1, len(contents) + 1))
+    output = run_git(['fast-import', '--quiet'], input=b''.join(stream), cwd=cwd)
+    return output.decode('ascii').split()
+
+
+def update_index(entries, cwd=None):
+    """Point index entries at new blobs; entries are (mode, blob_id, path)"""
+    if not entries:
+        return
+    index_info = b''.join(f'{mode} {blob_id}\t'.encode('ascii') + os.fsencode(path) + b'\0'
+                          for mode, blob_id, path in entries)
+    run_git(['update-index', '-z', '--index-info'], input=index_info, cwd=cwd)
@@ -0,0 +1,285 @@
+"""
+Compact link graph of the vault, persisted in a binary file
+
+Every note, and every attachment some note links to, is a node with an
+integer id; ids follow the sorted vault paths, so the notes under a
+folder form one contiguous id range. Edges are stored in CSR form: for
+node i, its outgoing links are targets[offsets[i]:offsets[i + 1]], and
+a second pair of arrays holds the incoming links the same way. Weakly
+connected components are computed once, when the graph is built.
+
+The links come from the backlink index, so building only rescans notes
+that changed; their wikilinks are resolved again against the current
+note index. The graph is written to .cache/vaultlinks/graph.bin as a
+header followed by the paths and the uint32 arrays; loading it is one
+read, and the arrays are used in place through memoryviews, so queries
+on a vault of a million links take milliseconds and a few tens of MB.
+"""
+
+import bisect
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+from .backlinks import BacklinkIndex
+from .manifest import CACHE_DIR
+
+MAGIC = b'VLGRAPH\0'
+FORMAT_VERSION = 1
+
+GRAPH_NAME = 'graph.bin'
+
+# magic, format, nodes, edges, bytes of the path table
+_HEADER = struct.Struct('<8sIIII')
+
+
+def _reverse(node_count, offsets, values):
+    """CSR of the transposed graph, by counting sort; each list stays sorted"""
+    counts = array('I', bytes(4 * (node_count + 1)))
+    for value in values:
+        counts[value + 1] += 1
+    for node in range(node_count):
+        counts[node + 1] += counts[node]
+    reverse_offsets = array('I', counts)
+    reverse_values = array('I', bytes(4 * len(values)))
+    for node in range(node_count):
+        for value in values[offsets[node]:offsets[node + 1]]:
+            reverse_values[counts[value]] = node
+            counts[value] += 1
+    return reverse_offsets, reverse_values
+
+
+def _components(node_count, offsets, targets):
+    """Component id of every node (ids numbered from 0 by first member)"""
+    parent = array('I', range(node_count))
+
+    def find(node):
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for source in range(node_count):
+        for target in targets[offsets[source]:offsets[source + 1]]:
+            a, b = find(source), find(target)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    numbers = {}
+    component = array('I', bytes(4 * node_count))
+    for node in range(node_count):
+        component[node] = numbers.setdefault(find(node), len(numbers))
+    return component
+
+
+class LinkGraph:
+    """Link graph over vault paths; node ids index `paths`"""
+
+    def __init__(self, paths, out_offsets, out_targets, in_offsets, in_sources, component):
+        self.paths = paths
+        self.out_offsets = out_offsets
+        self.out_targets = out_targets
+        self.in_offsets = in_offsets
+        self.in_sources = in_sources
+        self.component = component
+
+    @classmethod
+    def from_links(cls, links, notes, exists=None):
+        """Graph of {source relpath: [target relpath, ...]} over the given notes
+
+        Link targets that are not notes become nodes if exists(target) says
+        so. Duplicate links and links from a note to itself are dropped.
+        """
+        exists = exists or (lambda relpath: False)
+        nodes = set(notes)
+        for targets in links.values():
+            for target in targets:
+                if target not in nodes and not target.endswith('.md') and exists(target):
+                    nodes.add(target)
+        paths = sorted(nodes)
+        ids = {path: node for node, path in enumerate(paths)}
+
+        out_offsets = array('I', [0])
+        out_targets = array('I')
+        for node, path in enumerate(paths):
+            targets = {ids.get(target) for target in links.get(path, ())}
+            targets.discard(None)
+            targets.discard(node)
+            out_targets.extend(sorted(targets))
+            out_offsets.append(len(out_targets))
+        in_offsets, in_sources = _reverse(len(paths), out_offsets, out_targets)
+        return cls(paths, out_offsets, out_targets, in_offsets, in_sources,
+                   _components(len(paths), out_offsets, out_targets))
+
+    @classmethod
+    def build(cls, root, note_index=None, persist=True):
+        """Bring the backlink index up to date and build the graph from it"""
+        root = os.path.abspath(root)
+        index = BacklinkIndex.build(root, note_index, persist=persist)
+        links = {source: [target for target, _, _ in note_links]
+                 for source, note_links in index.links.items()}
+        graph = cls.from_links(links, index.notes,
+                               lambda relpath: os.path.isfile(os.path.join(root, relpath)))
+        if persist:
+            graph.save(graph_path(root))
+        return graph
+
+    @classmethod
+    def load(cls, path):
+        """Read a graph written by save; None if it is missing or unreadable"""
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, node_count, edge_count, names_size = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+
+        start = _HEADER.size
+        paths = data[start:start + names_size].decode('utf-8').split('\0') if node_count else []
+        start += names_size + (-names_size % 4)
+
+        sizes = (node_count + 1, edge_count, node_count + 1, edge_count, node_count)
+        if start + 4 * sum(sizes) != len(data) or len(paths) != node_count:
+            return None
+        view = memoryview(data)
+        arrays = []
+        for size in sizes:
+            if sys.byteorder == 'little':
+                arrays.append(view[start:start + 4 * size].cast('I'))
+            else:
+                values = array('I', view[start:start + 4 * size])
+                values.byteswap()
+                arrays.append(values)
+            start += 4 * size
+        return cls(paths, *arrays)
+
+    def save(self, path):
+        """Write the graph atomically"""
+        names = '\0'.join(self.paths).encode('utf-8')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(self.paths), len(self.out_targets), len(names)))
+            f.write(names + bytes(-len(names) % 4))
+            for values in (self.out_offsets, self.out_targets, self.in_offsets, self.in_sources, self.component):
+                values = array('I', values)
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                f.write(values.tobytes())
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def edge_count(self):
+        return len(self.out_targets)
+
+    def node(self, relpath):
+        """Id of a vault path, or None"""
+        i = bisect.bisect_left(self.paths, relpath)
+        if i < len(self.paths) and self.paths[i] == relpath:
+            return i
+        return None
+
+    def folder(self, prefix):
+        """range of the ids of every path under the folder prefix"""
+        prefix = prefix.strip('/') + '/'
+        start = bisect.bisect_left(self.paths, prefix)
+        # '/' + 1 sorts right after every path starting with prefix
+        return range(start, bisect.bisect_left(self.paths, prefix[:-1] + '0', start))
+
+    def resolve(self, relpath):
+        """Ids a query argument names: one path, or every path under a folder"""
+        node = self.node(relpath.strip('/'))
+        if node is not None:
+            return range(node, node + 1)
+        return self.folder(relpath)
+
+    def neighbors(self, node):
+        """Ids the node links to"""
+        return self.out_targets[self.out_offsets[node]:self.out_offsets[node + 1]]
+
+    def backlinks(self, node):
+        """Ids linking to the node"""
+        return self.in_sources[self.in_offsets[node]:self.in_offsets[node + 1]]
+
+    def linking_into(self, nodes):
+        """Sorted ids outside `nodes` (a range) that link to any of them"""
+        sources = set()
+        for node in nodes:
+            sources.update(self.backlinks(node))
+        return sorted(source for source in sources if source not in nodes)
+
+    def orphans(self):
+        """Ids of the notes without links in either direction"""
+        out_offsets, in_offsets = self.out_offsets, self.in_offsets
+        return [node for node in range(len(self.paths))
+                if out_offsets[node] == out_offsets[node + 1] and in_offsets[node] == in_offsets[node + 1]]
+
+    def components(self):
+        """Node ids of every weakly connected component, largest first"""
+        groups = {}
+        for node, component in enumerate(self.component):
+            groups.setdefault(component, []).append(node)
+        return sorted(groups.values(), key=lambda nodes: (-len(nodes), nodes[0]))
+
+    def reachable(self, sources, reverse=False, max_depth=None):
+        """{id: depth} of every node reachable from the source ids along links
+
+        With reverse the links are followed backwards, giving every node
+        that can reach the sources. Nodes are visited a level at a time,
+        with a bytearray marking the ones seen.
+        """
+        offsets, edges = (self.in_offsets, self.in_sources) if reverse else (self.out_offsets, self.out_targets)
+        seen = bytearray(len(self.paths))
+        frontier = list(sources)
+        for node in frontier:
+            seen[node] = 1
+        depth = dict.fromkeys(frontier, 0)
+        level = 0
+        while frontier and (max_depth is None or level < max_depth):
+            level += 1
+            next_frontier = []
+            for node in frontier:
+                for neighbor in edges[offsets[node]:offsets[node + 1]]:
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        next_frontier.append(neighbor)
+            depth.update(dict.fromkeys(next_frontier, level))
+            frontier = next_frontier
+        return depth
+
+    def path(self, source, target):
+        """Shortest list of ids leading from source to target along links, or None"""
+        offsets, edges = self.out_offsets, self.out_targets
+        seen = bytearray(len(self.paths))
+        seen[source] = 1
+        parent = {}
+        queue = deque([source])
+        while queue and not seen[target]:
+            node = queue.popleft()
+            for neighbor in edges[offsets[node]:offsets[node + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    parent[neighbor] = node
+                    queue.append(neighbor)
+        if not seen[target]:
+            return None
+        route = [target]
+        while route[-1] != source:
+            route.append(parent[route[-1]])
+        return route[::-1]
+
+
+def graph_path(root):
+    """Where the graph of the vault at root is stored"""
+    return os.path.join(os.path.abspath(root), CACHE_DIR, GRAPH_NAME)
@@ -0,0 +1,209 @@
+"""
+Rewriting every revision of the vault's notes through git's batch plumbing
+
+`git fast-export --no-data` lists the paths each commit changes with
+their blob ids. Every .md blob is read from one long-running `git
+cat-file --batch`, transformed, and when it changed, written once into
+the `git fast-import` stream under a mark. Results are memoized by blob
+id, so a rewrite costs the number of unique note revisions, not commits
+times files.
+"""
+
+import fnmatch
+import subprocess
+from collections import Counter
+
+from .gitindex import git_env, run_git
+
+# Blob marks start here, far above the marks fast-export gives commits
+BLOB_MARK_BASE = 1 << 32
+
+# fast-export commands that start a new record
+TOP_LEVEL = (b'commit ', b'tag ', b'reset ', b'blob\n', b'feature ', b'option ',
+             b'progress ', b'checkpoint\n', b'done\n')
+
+FILE_MODES = (b'100644', b'100755')
+
+# Refs that do not hold the vault's history: git notes (among them the
+# conversion cache, see vaultlinks.blobcache) and the stash, which a
+# rewrite would corrupt or change under the user
+UNTOUCHED_REFS = ('refs/notes/*', 'refs/stash')
+
+# Every ref except those and the backups kept by a previous rewrite
+ALL_REFS = ['--exclude=refs/original/*'] + [f'--exclude={ref}' for ref in UNTOUCHED_REFS] + ['--all']
+
+BACKUP_PREFIX = 'refs/original/'
+
+
+class BlobReader:
+    """Long-running `git cat-file --batch`, asked for one blob at a time"""
+
+    def __init__(self, cwd=None):
+        self.process = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=cwd, env=git_env(),
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, blob_id):
+        self.process.stdin.write(blob_id + b'\n')
+        self.process.stdin.flush()
+        # "<id> <type> <size>\n<content>\n", or "<id> missing\n"
+        header = self.process.stdout.readline().split()
+        if len(header) != 3 or header[1] != b'blob':
+            raise RuntimeError(f"git object {blob_id.decode('ascii')} is not a readable blob")
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)
+        return data
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.process.wait()
+
+
+def records(stream):
+    """Split a fast-export stream into records, one per top-level command
+
+    Each record is a list of raw lines. A `data <n>` line carries its
+    payload, read by size, so commit messages are never parsed as commands.
+    """
+    record = []
+    while True:
+        line = stream.readline()
+        if not line:
+            break
+        if record and line.startswith(TOP_LEVEL):
+            yield record
+            record = []
+        if line.startswith(b'data '):
+            line += stream.read(int(line[5:]))
+        record.append(line)
+    if record:
+        yield record
+
+
+def is_note_path(path):
+    """True for a fast-export path (possibly C-quoted) ending in .md"""
+    return path.rstrip(b'\n').rstrip(b'"').endswith(b'.md')
+
+
+class HistoryRewriter:
+    """Rewrites note blobs in a fast-export stream, each unique blob once
+
+    `transform(data)` takes a blob's bytes and returns the new bytes, or
+    None to keep the blob.
+    """
+
+    def __init__(self, transform, reader):
+        self.transform = transform
+        self.reader = reader
+        self.memo = {}      # blob id -> dataref to write in its place
+        self.stats = Counter()
+
+    def _replacement(self, blob_id, out):
+        dataref = self.memo.get(blob_id)
+        if dataref is not None:
+            return dataref
+
+        data = self.reader.read(blob_id)
+        self.stats['blobs'] += 1
+        self.stats['bytes_read'] += len(data)
+        new_data = self.transform(data)
+        if new_data is None or new_data == data:
+            dataref = blob_id
+        else:
+            self.stats['rewritten'] += 1
+            self.stats['bytes_written'] += len(new_data)
+            dataref = b':%d' % (BLOB_MARK_BASE + self.stats['rewritten'])
+            if out is not None:
+                out.write(b'blob\nmark %s\ndata %d\n' % (dataref, len(new_data)))
+                out.write(new_data)
+                out.write(b'\n')
+        self.memo[blob_id] = dataref
+        return dataref
+
+    def commit(self, record, out):
+        """Rewrite the M lines of one commit record, emitting new blobs first"""
+        self.stats['commits'] += 1
+        for i, line in enumerate(record):
+            # "M <mode> <dataref> <path>\n"
+            if not line.startswith(b'M '):
+                continue
+            _, mode, dataref, path = line.split(b' ', 3)
+            if mode not in FILE_MODES or dataref.startswith(b':') or not is_note_path(path):
+                continue
+            self.stats['notes'] += 1
+            new_dataref = self._replacement(dataref, out)
+            if new_dataref != dataref:
+                record[i] = b'M %s %s %s' % (mode, new_dataref, path)
+        return record
+
+    def rewrite(self, stream, out=None):
+        """Copy a fast-export stream to `out` with note blobs rewritten
+
+        With out=None nothing is written, which makes a dry run.
+        """
+        for record in records(stream):
+            if record[0].startswith(b'commit '):
+                record = self.commit(record, out)
+            if out is not None:
+                out.writelines(record)
+        return self.stats
+
+
+def backup_refs(cwd=None):
+    """Record the current value of every ref a rewrite can move under refs/original/
+
+    Returns the number of refs backed up. Fails if a backup from an
+    earlier rewrite is still there.
+    """
+    listing = run_git(['for-each-ref', '--format=%(objectname) %(refname)'], cwd=cwd).decode('utf-8')
+    refs = [line.split(' ', 1) for line in listing.splitlines()]
+    if any(refname.startswith(BACKUP_PREFIX) for _, refname in refs):
+        raise RuntimeError(f"{BACKUP_PREFIX} already holds the backup of an earlier rewrite")
+    refs = [(oid, refname) for oid, refname in refs
+            if not any(fnmatch.fnmatchcase(refname, pattern) for pattern in UNTOUCHED_REFS)]
+    updates = ''.join(f'update {BACKUP_PREFIX}{refname} {oid}\n' for oid, refname in refs)
+    run_git(['update-ref', '--stdin'], input=updates.encode('utf-8'), cwd=cwd)
+    return len(refs)
+
+
+def delete_backup(cwd=None):
+    """Delete the refs/original/ backup of an earlier rewrite"""
+    listing = run_git(['for-each-ref', '--format=%(refname)', BACKUP_PREFIX], cwd=cwd).decode('utf-8')
+    updates = ''.join(f'delete {refname}\n' for refname in listing.splitlines())
+    run_git(['update-ref', '--stdin'], input=updates.encode('utf-8'), cwd=cwd)
+
+
+def rewrite_history(transform, revisions=None, dry_run=False, cwd=None):
+    """Rewrite note blobs in every commit reachable from `revisions`
+
+    Streams `git fast-export` through a HistoryRewriter into `git
+    fast-import`, which moves the exported refs to the rewritten commits.
+    Commits `revisions` exclude (as in `main..topic`) are kept, and the
+    rewritten ones still name them as parents. Returns the rewriter's stats.
+    """
+    export_args = ['git', 'fast-export', '--no-data', '--signed-tags=strip', '--tag-of-filtered-object=rewrite',
+                   '--reencode=yes', '--use-done-feature']
+    if revisions:
+        # Without this, the first exported commit of a range loses its parents
+        export_args.append('--reference-excluded-parents')
+    export = subprocess.Popen(export_args + (revisions or ALL_REFS), cwd=cwd, env=git_env(), stdout=subprocess.PIPE)
+    importer = None
+    if not dry_run:
+        importer = subprocess.Popen(['git', 'fast-import', '--force', '--quiet'], cwd=cwd, env=git_env(),
+                                    stdin=subprocess.PIPE)
+
+    reader = BlobReader(cwd)
+    try:
+        stats = HistoryRewriter(transform, reader).rewrite(export.stdout,
+                                                           importer.stdin if importer else None)
+    finally:
+        reader.close()
+        export.stdout.close()
+        if importer is not None:
+            importer.stdin.close()
+
+    if export.wait() != 0:
+        raise RuntimeError("git fast-export failed")
+    if importer is not None and importer.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+    return stats
@@ -0,0 +1,110 @@
+"""
+Persistent manifest of notes last seen as clean
+
+Each converter keeps its own manifest under <vault>/.cache/vaultlinks/.
+An entry records the size, mtime_ns and content hash of a file together
+with the converter version that found nothing to change in it. Later runs
+skip such files after a single stat() call, without opening them.
+"""
+
+import hashlib
+import json
+import os
+
+CACHE_DIR = os.path.join('.cache', 'vaultlinks')
+
+FORMAT_VERSION = 1
+
+
+def content_hash(content):
+    """Hash of a note's content, given as text or as raw bytes"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha1(content).hexdigest()
+
+
+class Manifest:
+    """Per-converter record of clean files, keyed by vault-relative path"""
+
+    def __init__(self, root, name, version):
+        self.root = os.path.abspath(root)
+        self.version = version
+        self.path = os.path.join(self.root, CACHE_DIR, f'{name}.json')
+        self.entries = {}
+        self.written_ns = 0
+        self.dirty = False
+
+    @classmethod
+    def load(cls, root, name, version):
+        """Load the manifest for a converter, starting empty if unreadable"""
+        manifest = cls(root, name, version)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                written_ns = os.fstat(f.fileno()).st_mtime_ns
+        except (OSError, ValueError):
+            return manifest
+
+        if data.get('format') == FORMAT_VERSION:
+            manifest.entries = data.get('files', {})
+            manifest.written_ns = written_ns
+        return manifest
+
+    def key(self, filepath):
+        return os.path.relpath(os.path.abspath(filepath), self.root)
+
+    def unchanged(self, filepath, st=None):
+        """True if the file is recorded clean and its stat still matches
+
+        Entries whose mtime is not older than the manifest file itself are
+        "racy": a second write within the same timestamp tick would go
+        unnoticed, so they are never trusted on stat alone.
+        """
+        entry = self.entries.get(self.key(filepath))
+        if entry is None:
+            return False
+        if st is None:
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                return False
+
+        size, mtime_ns, _, version = entry
+        return (version == self.version
+                and size == st.st_size
+                and mtime_ns == st.st_mtime_ns
+                and mtime_ns < self.written_ns)
+
+    def clean_hash(self, filepath):
+        """Content hash recorded as clean by this converter version, or None"""
+        entry = self.entries.get(self.key(filepath))
+        if entry is None or entry[3] != self.version:
+            return None
+        return entry[2]
+
+    def record(self, filepath, st, digest):
+        """Record a clean file from its stat result and content hash"""
+        self.entries[self.key(filepath)] = [st.st_size, st.st_mtime_ns, digest, self.version]
+        self.dirty = True
+
+    def forget(self, filepath):
+        """Drop a file whose content the converter changed"""
+        if self.entries.pop(self.key(filepath), None) is not None:
+            self.dirty = True
+
+    def save(self):
+        """Write the manifest atomically if anything changed"""
+        if not self.dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            'format': FORMAT_VERSION,
+            'files': self.entries,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.written_ns = os.stat(self.path).st_mtime_ns
+        self.dirty = False
@@ -0,0 +1,121 @@
+"""
+Timing and counters for the link scripts
+
+A Metrics object collects wall time per stage, byte and file counters and
+the links found and rewritten per token kind. Worker processes return
+their metrics as plain dicts, which the parent merges; with --jobs the
+stage times are therefore summed over all workers. NULL_METRICS is a
+no-op stand-in, so instrumented code needs no `if metrics` checks.
+"""
+
+import contextlib
+import json
+import sys
+import time
+from collections import Counter
+
+# Stages in the order a run goes through them
+STAGES = ('walk', 'index', 'read', 'convert', 'write')
+
+
+class Metrics:
+    """Wall time per stage, counters and link counts for one run"""
+
+    def __init__(self):
+        self.seconds = Counter()
+        self.counters = Counter()
+        self.links_found = Counter()
+        self.links_rewritten = Counter()
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def add_links(self, found, rewritten):
+        """Add the Counters returned by scanner.rewrite"""
+        self.links_found.update(found)
+        self.links_rewritten.update(rewritten)
+
+    def as_dict(self):
+        return {
+            'seconds': {stage: round(seconds, 6) for stage, seconds in self._ordered(self.seconds)},
+            'counters': dict(sorted(self.counters.items())),
+            'links': {'found': dict(sorted(self.links_found.items())),
+                      'rewritten': dict(sorted(self.links_rewritten.items()))},
+        }
+
+    def merge(self, other):
+        """Add another Metrics, or its as_dict() from a worker process"""
+        if isinstance(other, Metrics):
+            other = other.as_dict()
+        self.seconds.update(other['seconds'])
+        self.counters.update(other['counters'])
+        self.links_found.update(other['links']['found'])
+        self.links_rewritten.update(other['links']['rewritten'])
+
+    @staticmethod
+    def _ordered(seconds):
+        known = [(stage, seconds[stage]) for stage in STAGES if stage in seconds]
+        return known + sorted((s, v) for s, v in seconds.items() if s not in STAGES)
+
+    def write(self, stream, fmt='json'):
+        """Write the metrics as JSON or as an aligned text table"""
+        if fmt == 'json':
+            json.dump(self.as_dict(), stream, indent=2)
+            stream.write('\n')
+            return
+
+        stream.write("⏱️  Stage times\n")
+        for stage, seconds in self._ordered(self.seconds):
+            stream.write(f"   {stage:<12} {seconds:10.3f}s\n")
+        stream.write("📊 Counters\n")
+        for name, value in sorted(self.counters.items()):
+            stream.write(f"   {name:<24} {value:>12}\n")
+        stream.write("🔗 Links (found / rewritten)\n")
+        for kind in sorted(set(self.links_found) | set(self.links_rewritten)):
+            stream.write(f"   {kind:<12} {self.links_found[kind]:>10} / {self.links_rewritten[kind]}\n")
+
+
+class _NullMetrics:
+    """Metrics interface that records nothing"""
+
+    def timer(self, stage):
+        return contextlib.nullcontext()
+
+    def count(self, name, amount=1):
+        pass
+
+    def add_links(self, found, rewritten):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+
+
+@contextlib.contextmanager
+def profiled(path=None, limit=25):
+    """Run the body under cProfile
+
+    Stats are dumped to `path` for pstats/snakeviz, or, without a path,
+    the `limit` most expensive calls by cumulative time go to stderr.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        if path:
+            profiler.dump_stats(path)
+        else:
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(limit)
@@ -0,0 +1,404 @@
+"""
+Vault-wide note-name index for wikilink resolution
+
+Maps note paths, basenames and frontmatter aliases (exact and case-folded)
+to vault-relative paths, so [[Note]] resolves to wherever Note.md actually
+lives with a dictionary lookup. Every note's entry also holds its heading
+slugs and block ids (see vaultlinks.anchors), so [[Note#Heading]] gets
+the anchor GitHub renders, and the other files of the vault are indexed
+by path and name for ![[diagram.png]] embeds. The index is persisted under
+.cache/vaultlinks/ and refreshed incrementally: only notes whose size or
+mtime changed are opened again to re-read their aliases and headings.
+"""
+
+import itertools
+import json
+import os
+import posixpath
+import urllib.parse
+
+from . import prefilter
+from .anchors import fragment_slug, heading_key, read_anchors
+from .fsio import IOPool, stat_or_none, walk_order
+from .manifest import CACHE_DIR
+
+FORMAT_VERSION = 2
+
+INDEX_NAME = 'note-index.json'
+
+# Frontmatter longer than this is not scanned for aliases
+MAX_FRONTMATTER_LINES = 200
+
+
+def walk_notes(root, pool=None, attachments=None):
+    """Yield (relpath, stat) for every .md file, skipping hidden files and directories
+
+    With an IOPool, folders are listed and notes stat'ed concurrently. The
+    relpaths of the other files are appended to the attachments list when
+    one is given.
+    """
+    pool = pool or IOPool()
+    tree = pool.list_tree(root)
+    relpaths = []
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
+        for name, is_dir, is_file in sorted(tree.get(rel_dir, [])):
+            if name.startswith('.'):
+                continue
+            relpath = posixpath.join(rel_dir, name) if rel_dir else name
+            if is_dir:
+                stack.append(relpath)
+            elif name.endswith('.md') and is_file:
+                relpaths.append(relpath)
+            elif attachments is not None and is_file:
+                attachments.append(relpath)
+
+    stats = pool.imap(stat_or_none, (os.path.join(root, relpath) for relpath in relpaths))
+    for relpath, st in zip(relpaths, stats):
+        if st is not None:
+            yield relpath, st
+
+
+def find_markdown_files(directory, pool=None):
+    """Absolute paths of every .md file in os.walk order, skipping hidden directories
+
+    With an IOPool, folders are listed concurrently.
+    """
+    tree = (pool or IOPool()).list_tree(directory)
+    md_files = []
+    for rel_dir in walk_order(tree):
+        folder = os.path.join(directory, rel_dir.replace('/', os.sep)) if rel_dir else directory
+        md_files.extend(os.path.join(folder, name) for name, _, is_file in tree[rel_dir]
+                        if is_file and name.endswith('.md'))
+    return md_files
+
+
+def _unquote_scalar(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+
+def parse_aliases(text):
+    """Read `aliases:` (or `alias:`) from the YAML frontmatter at the start of a note
+
+    Handles the forms Obsidian writes: a flow list, a block list and a
+    single scalar. No YAML library is needed.
+    """
+    aliases = []
+    lines = iter(text.split('\n', MAX_FRONTMATTER_LINES + 1))
+    if next(lines).strip() != '---':
+        return aliases
+
+    in_aliases = False
+    for line in itertools.islice(lines, MAX_FRONTMATTER_LINES):
+        if line.strip() in ('---', '...'):
+            break
+
+        stripped = line.strip()
+        if in_aliases and stripped.startswith('- '):
+            aliases.append(_unquote_scalar(stripped[2:]))
+            continue
+        in_aliases = False
+
+        key, sep, value = line.partition(':')
+        if not sep or not line or line[0].isspace() or key.strip() not in ('aliases', 'alias'):
+            continue
+
+        value = value.strip()
+        if not value:
+            in_aliases = True
+        elif value.startswith('[') and value.endswith(']'):
+            aliases.extend(_unquote_scalar(v) for v in value[1:-1].split(',') if v.strip())
+        else:
+            aliases.append(_unquote_scalar(value))
+
+    return [alias for alias in aliases if alias]
+
+
+def read_link_names(filepath):
+    """(aliases, anchors) of a note: what a [[link]] can call it and its headings
+
+    Notes too large to load are read piece by piece.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < prefilter.STREAM_THRESHOLD:
+                text = prefilter.decode(f.read())
+                return parse_aliases(text), read_anchors([(text, False)])
+
+            from .stream import segments
+            pieces = segments(f)
+            first = next(pieces, ('', False))
+            return parse_aliases(first[0]), read_anchors(itertools.chain([first], pieces))
+    except (OSError, UnicodeDecodeError):
+        return [], {}
+
+
+class NoteIndex:
+    """Note names -> vault-relative paths (posix separators, with .md)"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, CACHE_DIR, INDEX_NAME)
+        self.notes = {}     # relpath -> [size, mtime_ns, aliases, anchors]
+        self.attachments = set()
+        self.by_path = {}
+        self.by_name = {}
+        self.by_alias = {}
+        self.by_file_path = {}
+        self.by_file_name = {}
+        self.dirty = False
+
+    @classmethod
+    def build(cls, root, persist=True, pool=None):
+        """Load the cached index and bring it up to date with the vault
+
+        With an IOPool, the vault is walked and changed notes are read
+        concurrently.
+        """
+        index = cls(root)
+        cached = {}
+        written_ns = 0
+        if persist:
+            try:
+                with open(index.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    written_ns = os.fstat(f.fileno()).st_mtime_ns
+                if data.get('format') == FORMAT_VERSION:
+                    cached = data.get('notes', {})
+            except (OSError, ValueError):
+                pass
+
+        pool = pool or IOPool()
+        stale = []
+        attachments = []
+        for relpath, st in walk_notes(index.root, pool, attachments):
+            entry = cached.get(relpath)
+            # Entries not older than the cache file itself are racy; re-read them
+            if (entry is None or entry[0] != st.st_size or entry[1] != st.st_mtime_ns
+                    or entry[1] >= written_ns):
+                stale.append((relpath, st))
+            index.notes[relpath] = entry
+
+        names = pool.imap(read_link_names, (os.path.join(index.root, relpath) for relpath, _ in stale))
+        for (relpath, st), (aliases, anchors) in zip(stale, names):
+            index.notes[relpath] = [st.st_size, st.st_mtime_ns, aliases, anchors]
+            index.dirty = True
+
+        if len(index.notes) != len(cached):
+            index.dirty = True
+        index.attachments = set(attachments)
+
+        index._build_maps()
+        if persist:
+            index.save()
+        return index
+
+    def _build_maps(self):
+        self.by_path = {}
+        self.by_name = {}
+        self.by_alias = {}
+        for relpath, (_, _, aliases, _) in self.notes.items():
+            self._add(relpath, aliases)
+
+        self.by_file_path = {}
+        self.by_file_name = {}
+        for relpath in self.attachments:
+            self.by_file_path[relpath] = relpath
+            self.by_file_path.setdefault(relpath.casefold(), relpath)
+            name = posixpath.basename(relpath)
+            for key in (name, name.casefold()):
+                candidates = self.by_file_name.setdefault(key, [])
+                if relpath not in candidates:
+                    candidates.append(relpath)
+
+        # Candidates in a stable order: shallowest first, then by path
+        for mapping in (self.by_name, self.by_alias, self.by_file_name):
+            for candidates in mapping.values():
+                candidates.sort(key=lambda p: (p.count('/'), p))
+
+    def _add(self, relpath, aliases):
+        stem = relpath[:-3]
+        name = posixpath.basename(stem)
+        self.by_path[stem] = relpath
+        self.by_path.setdefault(stem.casefold(), relpath)
+        for key in (name, name.casefold()):
+            candidates = self.by_name.setdefault(key, [])
+            if relpath not in candidates:
+                candidates.append(relpath)
+        for alias in aliases:
+            for key in (alias, alias.casefold()):
+                candidates = self.by_alias.setdefault(key, [])
+                if relpath not in candidates:
+                    candidates.append(relpath)
+
+    def update(self, filepaths):
+        """Refresh the entries of notes and files created, changed or deleted since the last build
+
+        Returns True if any entry changed, in which case the lookup maps
+        are rebuilt.
+        """
+        changed = False
+        for filepath in filepaths:
+            relpath = self.relpath(filepath)
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                st = None
+
+            if st is None or not relpath.endswith('.md'):
+                if self.notes.pop(relpath, None) is not None:
+                    changed = True
+                if st is None and relpath in self.attachments:
+                    self.attachments.discard(relpath)
+                    changed = True
+                elif st is not None and relpath not in self.attachments and os.path.isfile(filepath):
+                    self.attachments.add(relpath)
+                    changed = True
+                continue
+
+            entry = self.notes.get(relpath)
+            if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                continue
+            aliases, anchors = read_link_names(filepath)
+            if entry is None or entry[2:] != [aliases, anchors]:
+                changed = True
+            self.notes[relpath] = [st.st_size, st.st_mtime_ns, aliases, anchors]
+            self.dirty = True
+
+        if changed:
+            self.dirty = True
+            self._build_maps()
+        return changed
+
+    def save(self):
+        """Write the index atomically if anything changed"""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'format': FORMAT_VERSION, 'notes': self.notes}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def resolve(self, name, source_relpath=''):
+        """Vault-relative path of the note a wikilink name refers to, or None
+
+        Tries, in order: a vault path, a basename, an alias, then the same
+        with case folding. Among several notes with one name, a note in the
+        linking note's own folder wins, then the shallowest path.
+        """
+        name = name.strip().replace('\\', '/')
+        if name.endswith('.md'):
+            name = name[:-3]
+        if not name:
+            return None
+
+        source_dir = posixpath.dirname(source_relpath)
+        folded = name.casefold()
+
+        if '/' in name:
+            relpath = self.by_path.get(name.lstrip('/')) or self.by_path.get(folded.lstrip('/'))
+            if relpath is not None:
+                return relpath
+            # Partial paths match notes whose path ends with them
+            suffix = '/' + name.lstrip('/')
+            for key in (posixpath.basename(name), posixpath.basename(folded)):
+                for candidate in self.by_name.get(key, []):
+                    if ('/' + candidate[:-3]).endswith(suffix) \
+                            or ('/' + candidate[:-3]).casefold().endswith(suffix.casefold()):
+                        return candidate
+            return None
+
+        for mapping, key in ((self.by_name, name), (self.by_alias, name),
+                             (self.by_name, folded), (self.by_alias, folded)):
+            candidates = mapping.get(key)
+            if candidates:
+                for candidate in candidates:
+                    if posixpath.dirname(candidate) == source_dir:
+                        return candidate
+                return candidates[0]
+        return None
+
+    def resolve_file(self, name, source_relpath=''):
+        """Vault-relative path of the file other than a note a wikilink name refers to, or None
+
+        Tries a vault path, then a file name, each exactly and then case
+        folded. As with notes, a file in the linking note's own folder wins,
+        then the shallowest path.
+        """
+        name = name.strip().replace('\\', '/').lstrip('/')
+        if not name:
+            return None
+        folded = name.casefold()
+
+        if '/' in name:
+            relpath = self.by_file_path.get(name) or self.by_file_path.get(folded)
+            if relpath is not None:
+                return relpath
+            suffix = '/' + folded
+            for candidate in self.by_file_name.get(posixpath.basename(folded), []):
+                if ('/' + candidate).casefold().endswith(suffix):
+                    return candidate
+            return None
+
+        source_dir = posixpath.dirname(source_relpath)
+        for key in (name, folded):
+            candidates = self.by_file_name.get(key)
+            if candidates:
+                for candidate in candidates:
+                    if posixpath.dirname(candidate) == source_dir:
+                        return candidate
+                return candidates[0]
+        return None
+
+    def resolve_link(self, name, source_relpath=''):
+        """Vault-relative path of the note, or else the file, a wikilink name refers to"""
+        return self.resolve(name, source_relpath) or self.resolve_file(name, source_relpath)
+
+    def anchor(self, relpath, fragment):
+        """GitHub anchor for the #fragment of a link to a note (a heading or ^block id)
+
+        The last heading of a 'Heading#Subheading' fragment is looked up in
+        the note's entry; headings the index does not know are slugged as
+        written, and unknown block ids give '' (the top of the note).
+        """
+        entry = self.notes.get(relpath)
+        if entry is not None:
+            name = fragment.split('#')[-1].strip()
+            slug = entry[3].get(name if name.startswith('^') else heading_key(name))
+            if slug is not None:
+                return slug
+        return fragment_slug(fragment)
+
+    def relpath(self, filepath):
+        """Vault-relative posix path of a file on disk"""
+        return os.path.relpath(os.path.abspath(filepath), self.root).replace(os.sep, '/')
+
+    def link_target(self, name, source_filepath, fragment=''):
+        """URL-encoded relative link from source_filepath to the note or file `name`, or None
+
+        A fragment (the part of the link after '#') becomes the anchor of
+        the heading it names in the target note. An empty name refers to
+        the linking note itself, and gives a bare #anchor.
+        """
+        source_relpath = self.relpath(source_filepath)
+        relpath = self.resolve_link(name, source_relpath) if name.strip() else source_relpath
+        if relpath is None:
+            return None
+
+        if not fragment:
+            anchor = ''
+        elif relpath.endswith('.md'):
+            anchor = self.anchor(relpath, fragment)
+        else:
+            # e.g. report.pdf#page=3, which the browser handles
+            anchor = urllib.parse.quote(fragment.strip(), safe='=&')
+        if anchor and relpath == source_relpath:
+            return '#' + anchor
+        target = posixpath.relpath(relpath, posixpath.dirname(source_relpath) or '.')
+        return urllib.parse.quote(target) + ('#' + anchor if anchor else '')
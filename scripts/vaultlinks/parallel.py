@@ -0,0 +1,88 @@
+"""
+Process-pool execution for vault-wide passes
+
+Files are grouped into chunks of roughly equal byte size and handed to a
+process pool. Results are yielded in the original task order, so output
+and change reports are identical to a serial run.
+"""
+
+import os
+
+# Upper bound on the bytes of notes handled by one worker task
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def resolve_jobs(jobs):
+    """Map a --jobs value to a worker count (0 means one per CPU)"""
+    if jobs is None or jobs < 0:
+        return 1
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def file_sizes(paths):
+    """Size of each file in bytes, 0 for files that cannot be stat'ed"""
+    sizes = []
+    for path in paths:
+        try:
+            sizes.append(os.path.getsize(path))
+        except OSError:
+            sizes.append(0)
+    return sizes
+
+
+def chunk_by_bytes(tasks, sizes, chunk_bytes):
+    """Split tasks into consecutive chunks of about chunk_bytes each"""
+    chunk = []
+    chunk_size = 0
+    for task, size in zip(tasks, sizes):
+        chunk.append(task)
+        chunk_size += size
+        if chunk_size >= chunk_bytes:
+            yield chunk
+            chunk = []
+            chunk_size = 0
+    if chunk:
+        yield chunk
+
+
+def _run_chunk(func, chunk):
+    return [func(*task) for task in chunk]
+
+
+def imap(func, tasks, jobs=1, sizes=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+         initializer=None, initargs=()):
+    """Yield func(*task) for every task, in task order
+
+    With jobs > 1 the tasks run in a process pool; func must then be a
+    module-level function and its arguments and results picklable.
+    `sizes` gives the byte size of each task for chunking. `initializer`
+    is called with `initargs` once per process (including this one for a
+    serial run) to share run-wide state such as indexes.
+    """
+    tasks = list(tasks)
+    jobs = resolve_jobs(jobs)
+    if jobs == 1 or len(tasks) < 2:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield func(*task)
+        return
+
+    # Only pool runs pay for importing concurrent.futures/multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if sizes is None:
+        sizes = [1] * len(tasks)
+
+    # Keep several chunks per worker so one large note cannot leave the
+    # rest of the pool idle at the end of a run
+    total_bytes = sum(sizes)
+    chunk_bytes = max(1, min(chunk_bytes, total_bytes // (jobs * 4)))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        futures = [pool.submit(_run_chunk, func, chunk)
+                   for chunk in chunk_by_bytes(tasks, sizes, chunk_bytes)]
+        for future in futures:
+            yield from future.result()
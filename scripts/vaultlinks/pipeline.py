@@ -0,0 +1,149 @@
+"""
+Fused per-file pipeline behind scripts/vault-doctor.py
+
+Every fixer script used to walk the vault, read each note and possibly
+rewrite it. Here the fixers are stages applied in memory one after
+another, so each note is read once and written at most once no matter
+how many stages are enabled.
+"""
+
+import functools
+import os
+from collections import namedtuple
+
+from . import convert, fixers, prefilter, stream, writeback
+
+# transform(content, filepath) -> new content; the transform can only
+# change notes containing one of its triggers
+Stage = namedtuple('Stage', 'name transform triggers')
+
+
+def _plain(transform, content, filepath):
+    return transform(content)
+
+
+def _convert(note_index, content, filepath):
+    return convert.convert_content(content, convert.note_resolver(note_index, filepath))[0]
+
+
+def _remap(remapper, content, filepath):
+    return remapper.remap(content, os.path.dirname(os.path.abspath(filepath)))[0]
+
+
+# Stage name -> (description, transform taking content only, triggers), in
+# pipeline order. This is the order the standalone scripts were run in.
+FIXER_STAGES = [
+    ('convert-links', "Obsidian [[links]] -> [links](file.md) (convert-links.py)",
+     fixers.convert_obsidian_links_to_markdown, fixers.CONVERT_LINKS_TRIGGERS),
+    ('fix-all-links', "URL-encode markdown link targets (fix-all-links.py)",
+     fixers.fix_markdown_links, fixers.FIX_ALL_LINKS_TRIGGERS),
+    ('fix-encoding', "fix double encoding and unencoded spaces (fix-encoding.py)",
+     fixers.fix_links, fixers.FIX_ENCODING_TRIGGERS),
+    ('fix-multiple-encoding', "collapse %252520-style encoding (fix-multiple-encoding.py)",
+     fixers.fix_multiple_encoding, fixers.FIX_MULTIPLE_ENCODING_TRIGGERS),
+]
+
+
+def convert_stage(note_index=None):
+    """The pre-commit hook's conversion, resolving [[links]] through note_index"""
+    return Stage('convert', functools.partial(_convert, note_index), convert.CONVERT_TRIGGERS)
+
+
+def fixer_stage(name):
+    """One of the FIXER_STAGES by name"""
+    for stage_name, _, transform, triggers in FIXER_STAGES:
+        if stage_name == name:
+            return Stage(name, functools.partial(_plain, transform), triggers)
+    raise KeyError(name)
+
+
+def remap_stage(remapper):
+    """update-structure-links.py remapping with a compiled LinkRemapper"""
+    return Stage('update-structure-links', functools.partial(_remap, remapper), prefilter.MARKDOWN_LINKS)
+
+
+def run_stages(content, filepath, stages):
+    """Apply stages in order; returns (new_content, names of stages that changed it)
+
+    A stage is skipped when the content, as left by the previous stages,
+    holds none of its triggers.
+    """
+    changed = []
+    for stage in stages:
+        if not prefilter.found_in(stage.triggers, content):
+            continue
+        new_content = stage.transform(content, filepath)
+        if new_content != content:
+            changed.append(stage.name)
+            content = new_content
+    return content, changed
+
+
+def process_file(filepath, stages, clean_hash=None, want_hash=False, writer=None):
+    """Read a note once, run every stage and write it back at most once
+
+    Notes holding no trigger of any stage are skipped on their raw bytes,
+    and notes too large to load run through the stages piece by piece.
+    Returns (changed_stages, clean_record); clean_record is (stat, hash)
+    when no stage changed the note, for recording in a manifest (the hash
+    is only computed with want_hash). The note is written through
+    `writer` (see vaultlinks.writeback).
+    """
+    st, data, digest = prefilter.read_note(filepath, prefilter.union(*(s.triggers for s in stages)),
+                                           want_hash=want_hash or clean_hash is not None, stream=True)
+    if data is None or (clean_hash is not None and digest == clean_hash):
+        return [], (st, digest)
+
+    if data is prefilter.STREAM:
+        return process_streamed(filepath, stages, st, digest, writer)
+
+    content = prefilter.decode(data)
+
+    new_content, changed = run_stages(content, filepath, stages)
+    # Stages may undo each other (fix-all-links re-encodes what fix-encoding
+    # decodes); only a net change counts
+    if new_content == content:
+        return [], (st, digest)
+
+    writeback.write(filepath, new_content, writer)
+    return changed, None
+
+
+def process_streamed(filepath, stages, st, digest, writer=None):
+    """process_file for a note too large to load, in bounded memory"""
+    changed = []
+
+    def transform(text):
+        new_text, piece_changed = run_stages(text, filepath, stages)
+        if new_text != text:
+            changed.extend(name for name in piece_changed if name not in changed)
+        return new_text
+
+    if stream.rewrite_file(filepath, transform, writer=writer) is None:
+        return [], (st, digest)
+    # Keep the stage order of a whole-note run
+    order = [stage.name for stage in stages]
+    return sorted(changed, key=order.index), None
+
+
+# Stages shared with pool workers through init_worker
+_worker_stages = None
+
+
+def init_worker(stages):
+    """Pool initializer: install the run's stages in a worker process"""
+    global _worker_stages
+    _worker_stages = stages
+
+
+def process_file_job(filepath, clean_hash, want_hash):
+    """Worker-side process_file: returns (changed_stages, clean_record, error, staged)
+
+    staged holds the rewritten note for the parent to commit.
+    """
+    stager = writeback.Stager()
+    try:
+        changed, clean_record = process_file(filepath, _worker_stages, clean_hash, want_hash, stager)
+        return changed, clean_record, None, stager.staged
+    except Exception as e:
+        return [], None, str(e), []
@@ -0,0 +1,100 @@
+"""
+Byte-level pre-filter that skips notes with nothing to fix
+
+Every transform declares Triggers: literal substrings and regexes, at
+least one of which must occur in a note for the transform to change it.
+Notes are checked on their raw bytes with bytes.find (through mmap for
+large files) before any UTF-8 decoding or link scanning, so notes with
+no trigger, such as pasted logs or data dumps, cost almost nothing.
+"""
+
+import mmap
+import os
+import re
+from collections import namedtuple
+
+from .manifest import content_hash
+
+# Files at least this large are searched through mmap instead of read()
+MMAP_THRESHOLD = 1024 * 1024
+
+# Notes at least this large are rewritten piece by piece (see
+# vaultlinks.stream) instead of being loaded whole
+STREAM_THRESHOLD = 16 * 1024 * 1024
+
+# read_note's data for a note too large to load; stream it instead
+STREAM = object()
+
+Triggers = namedtuple('Triggers', 'literals patterns')
+Triggers.__doc__ = """Substrings and regex sources whose presence may need a fix"""
+
+_compiled = {}
+
+
+def union(*triggers):
+    """Triggers matching whenever any of the given ones match"""
+    literals = []
+    patterns = []
+    for trigger in triggers:
+        literals.extend(l for l in trigger.literals if l not in literals)
+        patterns.extend(p for p in trigger.patterns if p not in patterns)
+    return Triggers(tuple(literals), tuple(patterns))
+
+
+def _pattern(source, binary):
+    key = (source, binary)
+    pattern = _compiled.get(key)
+    if pattern is None:
+        pattern = re.compile(source.encode('utf-8') if binary else source)
+        _compiled[key] = pattern
+    return pattern
+
+
+def found_in(triggers, data):
+    """True if data (str, bytes or mmap) contains any trigger"""
+    binary = not isinstance(data, str)
+    for literal in triggers.literals:
+        if data.find(literal.encode('utf-8') if binary else literal) != -1:
+            return True
+    for source in triggers.patterns:
+        if _pattern(source, binary).search(data):
+            return True
+    return False
+
+
+def decode(data):
+    """Decode note bytes exactly as open(..., 'r', encoding='utf-8') would"""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def read_note(filepath, triggers, want_hash=False, stream=False):
+    """Read a note's bytes only if it contains a trigger
+
+    Returns (stat, data, digest). data is the raw bytes, or None when the
+    note has no trigger. With stream, a note of at least STREAM_THRESHOLD
+    bytes is searched but not loaded, and data is STREAM when it holds a
+    trigger. With want_hash, digest is the manifest content hash of the
+    raw bytes (computed over the mmap for large files), else None.
+    """
+    with open(filepath, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if st.st_size < MMAP_THRESHOLD:
+            data = f.read()
+            digest = content_hash(data) if want_hash else None
+            return st, (data if found_in(triggers, data) else None), digest
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest = content_hash(mapped) if want_hash else None
+            if not found_in(triggers, mapped):
+                return st, None, digest
+            if stream and st.st_size >= STREAM_THRESHOLD:
+                return st, STREAM, digest
+            return st, mapped[:], digest
+
+
+# Triggers shared by the transforms
+WIKILINKS = Triggers(('[[',), ())
+MULTIPLE_ENCODING = Triggers(('%25',), ())
+MARKDOWN_LINKS = Triggers(('](',), ())
+# A relative .md link target containing a space
+SPACED_MD_LINK = Triggers((), (r'\]\([^)]* [^)]*\.md\)',))
@@ -0,0 +1,78 @@
+"""
+Compiled link remapping for folder restructures
+
+The whole old-link -> new-path mapping is compiled into one dictionary, so
+each file is scanned once and every link is resolved with a single lookup
+instead of running two regex substitutions per mapping entry.
+"""
+
+import json
+import os
+
+from . import scanner
+
+
+def load_mapping(path):
+    """Load an old-link -> new-path mapping from a .json or .csv file
+
+    JSON files hold a single object. CSV files hold two columns per row:
+    the old link and the new vault path, both without the .md extension.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.json'):
+            mapping = json.load(f)
+            if not isinstance(mapping, dict):
+                raise ValueError(f"{path}: expected a JSON object of old -> new paths")
+            return mapping
+
+        import csv
+
+        mapping = {}
+        for row in csv.reader(f):
+            if len(row) >= 2 and row[0].strip():
+                mapping[row[0].strip()] = row[1].strip()
+        return mapping
+
+
+class LinkRemapper:
+    """Rewrites [text](old) links to relative paths of their new location"""
+
+    def __init__(self, link_mapping, root=None):
+        self.mapping = dict(link_mapping)
+        self.root = root
+        self._relpaths = {}
+
+    def lookup(self, link_path):
+        """Return the new vault path for a link target, or None"""
+        # Handle both with and without .md extension
+        if link_path.endswith('.md'):
+            new_path = self.mapping.get(link_path[:-3])
+            if new_path is not None:
+                return new_path
+        return self.mapping.get(link_path)
+
+    def relative_target(self, current_dir, new_path):
+        """Relative path from current_dir to new_path, cached per pair"""
+        key = (current_dir, new_path)
+        target_path = self._relpaths.get(key)
+        if target_path is None:
+            if self.root is not None:
+                new_path = os.path.join(self.root, new_path)
+            target_path = os.path.relpath(new_path, current_dir)
+            self._relpaths[key] = target_path
+        return target_path
+
+    def remap(self, content, current_dir):
+        """Rewrite mapped links in content; returns (new_content, count)"""
+
+        def replace_link(token):
+            if token.kind != scanner.LINK:
+                return None
+            new_path = self.lookup(token.target)
+            if new_path is None:
+                return None
+            target_path = self.relative_target(current_dir, new_path)
+            return f'[{token.text}]({target_path}.md)'
+
+        content, _, rewritten = scanner.rewrite(content, replace_link)
+        return content, rewritten[scanner.LINK]
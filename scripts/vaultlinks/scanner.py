@@ -0,0 +1,136 @@
+"""
+Single-pass, code-aware link scanner shared by every converter script
+
+The whole document is walked once with one compiled pattern. Fenced code
+blocks and inline code spans are matched as part of the same scan and
+skipped, so links shown as examples inside code are never rewritten.
+"""
+
+import re
+from collections import Counter, namedtuple
+
+WIKILINK = 'wikilink'   # [[Note]]
+ALIAS = 'alias'         # [[Note|Display text]]
+LINK = 'link'           # [text](relative/path.md)
+URL = 'url'             # [text](https://...) or a bare https:// URL
+
+Token = namedtuple('Token', 'kind start end text target embed', defaults=(False,))
+Token.__doc__ = """A link found in a document.
+
+`start`/`end` are offsets of the whole link in the scanned text. For
+wikilinks `target` is the note name and `text` the display text; for
+markdown links they are the path and the bracketed text. Bare URLs have
+no `text`. `embed` marks a ![[wikilink]] embed, whose span includes the
+'!'.
+"""
+
+_SCHEME = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:')
+
+_TOKEN_PATTERN = re.compile(r'''
+    # Fenced code block: runs to a closing fence of the same kind, or to EOF
+    (?P<fence>^[ ]{0,3}(?P<fence_open>(?P<fence_char>[`~])(?P=fence_char){2,})[^\n]*
+        (?:\n.*?)??
+        (?:(?P<fence_close>\n[ ]{0,3}(?P=fence_open)(?P=fence_char)*[ \t]*(?=\n|\Z))|\Z))
+    # Inline code span: closes on a backtick run of exactly the same length
+    |(?P<code>(?P<ticks>`+)(?!`)
+        (?:[^`\n]|`+(?!`)|\n(?![ \t]*\n))+?
+        (?<!`)(?P=ticks)(?!`))
+    # Obsidian wikilink, optionally with |alias
+    |\[\[(?P<wiki>[^\]]+)\]\]
+    # Inline markdown link
+    |\[(?P<text>[^\]]+)\]\((?P<target>[^)]+)\)
+    # Bare external URL
+    |(?P<url>\bhttps?://[^\s<>()\[\]`]+)
+''', re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+
+# A line that may open a fenced code block; cheap test before a full scan
+_FENCE_LINE = re.compile(r'^[ ]{0,3}(?:```|~~~)', re.MULTILINE)
+
+
+def is_external(target):
+    """True for targets with a URL scheme (http:, https:, mailto:, ...)"""
+    return _SCHEME.match(target) is not None
+
+
+def scan(content):
+    """Yield a Token for every link in content, skipping code"""
+    last_end = 0
+    for match in _TOKEN_PATTERN.finditer(content):
+        start, end = match.span()
+        previous_end, last_end = last_end, end
+        if match.group('fence') is not None or match.group('code') is not None:
+            continue
+
+        wiki = match.group('wiki')
+        if wiki is not None:
+            # The '!' of an ![[embed]] is checked here rather than matched by
+            # the pattern, which would slow down the scan of every character
+            embed = start > previous_end and content[start - 1] == '!'
+            if embed:
+                start -= 1
+            if '|' in wiki:
+                target, text = wiki.split('|', 1)
+                yield Token(ALIAS, start, end, text, target, embed)
+            else:
+                yield Token(WIKILINK, start, end, wiki, wiki, embed)
+            continue
+
+        target = match.group('target')
+        if target is not None:
+            kind = URL if is_external(target) else LINK
+            yield Token(kind, start, end, match.group('text'), target)
+            continue
+
+        yield Token(URL, start, end, None, match.group('url'))
+
+
+def rewrite(content, replace):
+    """Rewrite links in a single pass
+
+    `replace(token)` returns the replacement text for a token, or None to
+    leave it unchanged. Returns (new_content, found, rewritten), where the
+    last two are Counters of token kinds.
+    """
+    found = Counter()
+    rewritten = Counter()
+    pieces = []
+    pos = 0
+
+    for token in scan(content):
+        found[token.kind] += 1
+        replacement = replace(token)
+        if replacement is None or replacement == content[token.start:token.end]:
+            continue
+
+        pieces.append(content[pos:token.start])
+        pieces.append(replacement)
+        pos = token.end
+        rewritten[token.kind] += 1
+
+    if not pieces:
+        return content, found, rewritten
+
+    pieces.append(content[pos:])
+    return ''.join(pieces), found, rewritten
+
+
+def unclosed_fence(content):
+    """Opening fence (e.g. '```') of a code block content leaves open, or None"""
+    first = _FENCE_LINE.search(content)
+    if first is None:
+        return None
+    # Nothing can be open before the first fence line, and only code blocks
+    # cross blank lines, so the scan can start at the blank line before it
+    start = content.rfind('\n\n', 0, first.start()) + 1
+    last = None
+    for last in _TOKEN_PATTERN.finditer(content, start):
+        pass
+    if last is None or last.group('fence') is None or last.group('fence_close') is not None:
+        return None
+    return last.group('fence_open')
+
+
+def closing_fence(fence_open):
+    """Pattern of a line closing the code block opened by fence_open"""
+    return re.compile(r'^[ ]{0,3}%s%s*[ \t]*$' % (re.escape(fence_open), re.escape(fence_open[0])), re.MULTILINE)
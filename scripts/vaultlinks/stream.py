@@ -0,0 +1,152 @@
+"""
+Bounded-memory rewriting of notes too large to load whole
+
+Generated notes (exported logs, data tables) can run to hundreds of MB.
+Instead of reading one whole and building several full-size copies, it
+is read in blocks and cut into pieces after blank lines, which no link
+or inline code span crosses. Every piece is decoded, transformed and
+written on its own, so memory stays at a few blocks whatever the size
+of the note. A fenced code block left open at a cut is carried into the
+following pieces, which pass through untouched up to its closing fence,
+as a whole-note scan would leave them.
+
+Nothing is written until a piece changes. From then on the output goes
+to a temporary file next to the note, which replaces it once the last
+piece is written, so an interrupted run leaves the note as it was.
+"""
+
+import os
+import re
+import shutil
+from itertools import islice
+
+from . import prefilter, scanner
+from .writeback import temp_path
+
+# Bytes read at a time; pieces are usually about this large
+CHUNK_BYTES = 1024 * 1024
+
+# With no blank line in sight, a piece is cut after its last line break
+# once it holds this many blocks, and mid-line once it holds MAX_BLOCKS
+LINE_CUT_BLOCKS = 4
+MAX_BLOCKS = 16
+
+_BLANK_LINE = re.compile(rb'(?:\r\n|\r(?!\n)|\n)[ \t]*(?:\r\n|\r|\n)')
+
+
+def _boundary(buffer, cut):
+    # Never split a \r\n pair, which would decode to two line breaks, or a
+    # UTF-8 sequence
+    if cut and buffer[cut - 1] == 0x0D:
+        if cut == len(buffer):
+            cut -= 1
+        elif buffer[cut] == 0x0A:
+            cut += 1
+    while 0 < cut < len(buffer) and buffer[cut] & 0xC0 == 0x80:
+        cut -= 1
+    return cut
+
+
+def _cut(buffer, start, chunk_bytes):
+    """Offset the next piece of buffer ends at, or 0 to read on"""
+    last = None
+    for last in _BLANK_LINE.finditer(buffer, start):
+        pass
+    if last is not None:
+        return _boundary(buffer, last.end())
+    if len(buffer) >= LINE_CUT_BLOCKS * chunk_bytes:
+        line_break = max(buffer.rfind(b'\n'), buffer.rfind(b'\r'))
+        if line_break != -1:
+            return _boundary(buffer, line_break + 1)
+    if len(buffer) >= MAX_BLOCKS * chunk_bytes:
+        return _boundary(buffer, len(buffer) - 1)
+    return 0
+
+
+def pieces(f, chunk_bytes=CHUNK_BYTES):
+    """Yield the raw bytes of a binary file in pieces cut after blank lines"""
+    buffer = b''
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            if buffer:
+                yield buffer
+            return
+        # Only the new block (and a few bytes before it) can hold a blank
+        # line not searched yet
+        start = max(0, len(buffer) - 16)
+        buffer += block
+        cut = _cut(buffer, start, chunk_bytes)
+        if cut:
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+
+
+def segments(f, chunk_bytes=CHUNK_BYTES):
+    """Yield (text, in_code) for a binary file, decoded piece by piece
+
+    in_code marks the text of a fenced code block opened in an earlier
+    piece, up to and including its closing fence line; it is passed
+    through untouched. Other text starts at the start of a line and can
+    be scanned like a note of its own.
+    """
+    fence = None
+    for raw in pieces(f, chunk_bytes):
+        text = prefilter.decode(raw)
+        if fence is not None:
+            close = scanner.closing_fence(fence).search(text)
+            if close is None:
+                yield text, True
+                continue
+            yield text[:close.end()], True
+            text = text[close.end():]
+        if text:
+            yield text, False
+        fence = scanner.unclosed_fence(text)
+
+
+def rewrite_file(filepath, transform, dest=None, chunk_bytes=CHUNK_BYTES, writer=None):
+    """Apply transform(text) -> text to a note piece by piece
+
+    The note is rewritten in place, or written to dest when one is given,
+    but only if some piece changes. With a writer (see
+    vaultlinks.writeback) the finished temporary file is handed to it
+    instead of being renamed over the note. Returns the size of the file
+    written, or None when nothing changed.
+    """
+    target = dest or filepath
+    tmp = temp_path(target)
+    out = None
+    unchanged = 0
+    try:
+        with open(filepath, 'rb') as f:
+            for text, in_code in segments(f, chunk_bytes):
+                new_text = text if in_code else transform(text)
+                if out is None:
+                    if new_text == text:
+                        unchanged += 1
+                        continue
+                    # First change: copy what came before it, decoded the same way
+                    out = open(tmp, 'w', encoding='utf-8')
+                    with open(filepath, 'rb') as again:
+                        for prefix, _ in islice(segments(again, chunk_bytes), unchanged):
+                            out.write(prefix)
+                out.write(new_text)
+        if out is not None:
+            out.close()
+    except BaseException:
+        if out is not None:
+            out.close()
+            os.unlink(tmp)
+        raise
+
+    if out is None:
+        return None
+    size = os.path.getsize(tmp)
+    if writer is not None and dest is None:
+        writer.add_file(filepath, tmp)
+        return size
+    if dest is None:
+        shutil.copymode(filepath, tmp)
+    os.replace(tmp, target)
+    return size
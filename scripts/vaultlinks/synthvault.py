@@ -0,0 +1,148 @@
+"""
+Reproducible synthetic vaults for benchmarking the converters
+
+A vault is fully determined by its VaultSpec: the same spec and seed
+always produce byte-identical notes, so timings taken on different
+commits are comparable. Notes mix every link form the scripts handle:
+[[wikilinks]] with and without aliases, markdown links with unencoded
+spaces, %252520-style multiply-encoded links, links to moved notes
+covered by a remapping, external URLs and code fences holding links
+that must be left alone.
+"""
+
+import json
+import os
+import random
+import urllib.parse
+from collections import namedtuple
+
+VaultSpec = namedtuple('VaultSpec', 'notes seed links_per_note depth fanout unicode '
+                                    'encoded_ratio fence_ratio moved_ratio paragraphs')
+VaultSpec.__new__.__defaults__ = (0, 8, 3, 8, True, 0.1, 0.2, 0.05, 4)
+VaultSpec.__doc__ = """Parameters of a synthetic vault; `notes` is the only required one"""
+
+WORDS = ['Architecture', 'Backend', 'Cache', 'Deploy', 'Events', 'Frontend', 'Gateway',
+         'Handlers', 'Index', 'Jobs', 'Kernel', 'Logging', 'Metrics', 'Network', 'Overview',
+         'Patterns', 'Queue', 'Routing', 'Schema', 'Testing', 'Upgrades', 'Validation',
+         'Workers', 'Auth', 'Billing', 'Config', 'Database', 'Errors', 'Flags', 'Graph']
+
+UNICODE_WORDS = ['Café', 'Über', 'Niño', 'Δelta', 'Ωmega', 'Straße', 'Résumé', '日本語',
+                 'Заметки', 'Żółw']
+
+FILLER = ('The service reads its configuration at startup and caches the result. '
+          'Requests are routed through the gateway before reaching any handler. '
+          'Every change is reviewed and deployed behind a feature flag. ')
+
+# Name of the remapping file written next to the notes
+MAPPING_NAME = 'moves.json'
+
+
+def _folders(spec, rng):
+    """Nested folder paths, `depth` levels of up to `fanout` folders each"""
+    folders = ['']
+    level = ['']
+    for depth in range(spec.depth):
+        next_level = []
+        for parent in level:
+            for i in range(spec.fanout):
+                name = f"{rng.choice(WORDS)} {depth + 1}{i:02d}"
+                next_level.append(f"{parent}/{name}" if parent else name)
+        folders.extend(next_level)
+        level = next_level
+    return folders
+
+
+def _note_names(spec, rng):
+    names = []
+    seen = set()
+    words = WORDS + (UNICODE_WORDS if spec.unicode else [])
+    for i in range(spec.notes):
+        name = f"{rng.choice(words)} {rng.choice(WORDS).lower()} {i}"
+        if name in seen:
+            name = f"{name}b"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def layout(spec):
+    """Vault-relative note paths (posix, with .md) in generation order"""
+    rng = random.Random(spec.seed)
+    folders = _folders(spec, rng)
+    paths = []
+    for name in _note_names(spec, rng):
+        folder = rng.choice(folders)
+        paths.append(f"{folder}/{name}.md" if folder else f"{name}.md")
+    return paths
+
+
+def _relative(source, target):
+    return os.path.relpath(target, os.path.dirname(source) or '.').replace(os.sep, '/')
+
+
+def _link(rng, spec, source, target, moved):
+    """One random link from note `source` to note `target`"""
+    name = os.path.basename(target)[:-3]
+    roll = rng.random()
+    if target in moved and roll < spec.moved_ratio * 4:
+        return f"[{name}]({moved[target]}.md)"
+    if roll < spec.encoded_ratio:
+        encoded = urllib.parse.quote(_relative(source, target)).replace('%20', '%252520')
+        return f"[{name}]({encoded})"
+    if roll < 0.55:
+        return f"[[{name}]]"
+    if roll < 0.65:
+        return f"[[{name}|{name.lower()}]]"
+    if roll < 0.8:
+        return f"[{name}]({_relative(source, target)})"
+    if roll < 0.9:
+        return f"[{name}]({urllib.parse.quote(_relative(source, target))})"
+    return f"[docs](https://example.com/{urllib.parse.quote(name)})"
+
+
+def render_note(spec, rng, path, paths, moved):
+    """Content of the note at `path`"""
+    lines = [f"# {os.path.basename(path)[:-3]}", ""]
+    links_left = spec.links_per_note
+    for paragraph in range(spec.paragraphs):
+        count = links_left // (spec.paragraphs - paragraph)
+        links_left -= count
+        links = [_link(rng, spec, path, rng.choice(paths), moved) for _ in range(count)]
+        lines.append(FILLER + ' '.join(f"See {link}." for link in links))
+        lines.append("")
+        if rng.random() < spec.fence_ratio:
+            lines.extend(["```markdown", f"Example: [[{rng.choice(WORDS)}]] and [a](b c.md)",
+                          "```", ""])
+    return '\n'.join(lines)
+
+
+def generate(root, spec):
+    """Write the vault described by spec under root
+
+    Also writes MAPPING_NAME, a remapping of old link names to the moved
+    notes' new paths for update-structure-links.py. Returns the note
+    paths relative to root.
+    """
+    paths = layout(spec)
+    rng = random.Random(spec.seed + 1)
+
+    # A fraction of notes is linked under a legacy flat name that the
+    # remapping points to the note's real location
+    moved = {}
+    for path in paths:
+        if rng.random() < spec.moved_ratio:
+            moved[path] = f"legacy {len(moved)}"
+
+    made = set()
+    for path in paths:
+        folder = os.path.join(root, os.path.dirname(path))
+        if folder not in made:
+            os.makedirs(folder, exist_ok=True)
+            made.add(folder)
+        with open(os.path.join(root, path), 'w', encoding='utf-8') as f:
+            f.write(render_note(spec, rng, path, paths, moved))
+
+    with open(os.path.join(root, MAPPING_NAME), 'w', encoding='utf-8') as f:
+        json.dump({old: path[:-3] for path, old in moved.items()}, f, ensure_ascii=False, indent=0)
+
+    return paths
@@ -0,0 +1,219 @@
+"""
+File watching for scripts/convert-obsidian-links.py --watch
+
+Uses Linux inotify through ctypes when available and falls back to
+polling stat() snapshots elsewhere. Bursts of editor saves are debounced
+into one batch, and the converter's own writes are recognised by their
+stat signature so they do not trigger another round. Watchers report
+attachments as well as notes, so the note index learns about the files
+links can point to.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from .fsio import stat_or_none
+from .noteindex import walk_notes
+
+# inotify event bits (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Recursive inotify watch on every non-hidden directory of the vault"""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        self._add_tree(self.root)
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith('linux') and ctypes.util.find_library('c') is not None
+
+    def _add_dir(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_tree(self, path, found=None):
+        """Watch path and its subdirectories; collect their files into found"""
+        self._add_dir(path)
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                self._add_tree(entry.path, found)
+            elif found is not None and entry.is_file():
+                found.add(entry.path)
+
+    def read(self, timeout):
+        """Wait up to timeout seconds; returns (changed file paths, rescan)"""
+        changed = set()
+        rescan = False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed, rescan
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed, rescan
+
+        pos = 0
+        while pos < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+            pos += _EVENT_HEADER.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b'\0'))
+            pos += length
+
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None or not name or name.startswith('.'):
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & IN_ISDIR:
+                # A folder moved or created inside the vault: watch it and
+                # treat every file already in it as changed
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path, changed)
+                elif mask & IN_MOVED_FROM:
+                    rescan = True
+            else:
+                changed.add(path)
+
+        return changed, rescan
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback comparing (size, mtime_ns) snapshots of every note and attachment"""
+
+    def __init__(self, root, interval=1.0):
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + interval
+
+    def _take_snapshot(self):
+        attachments = []
+        snapshot = {relpath: (st.st_size, st.st_mtime_ns)
+                    for relpath, st in walk_notes(self.root, attachments=attachments)}
+        for relpath in attachments:
+            st = stat_or_none(os.path.join(self.root, relpath))
+            if st is not None:
+                snapshot[relpath] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def read(self, timeout):
+        """Wait up to timeout seconds; returns (changed file paths, rescan)"""
+        delay = self._next_poll - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return set(), False
+        if delay > 0:
+            time.sleep(delay)
+        self._next_poll = time.monotonic() + self.interval
+
+        snapshot = self._take_snapshot()
+        changed = {relpath for relpath, signature in snapshot.items()
+                   if self._snapshot.get(relpath) != signature}
+        changed.update(relpath for relpath in self._snapshot if relpath not in snapshot)
+        self._snapshot = snapshot
+        return {os.path.join(self.root, relpath) for relpath in changed}, False
+
+    def close(self):
+        pass
+
+
+def open_watcher(root, force_polling=False, interval=1.0):
+    """inotify watcher when possible, else a polling one"""
+    if not force_polling and InotifyWatcher.available():
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval)
+
+
+class OwnWrites:
+    """Remembers files the converter wrote, to ignore the events they cause"""
+
+    def __init__(self):
+        self._signatures = {}
+
+    def expect(self, path):
+        """Call right after writing path"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        self._signatures[os.path.abspath(path)] = (st.st_size, st.st_mtime_ns)
+
+    def is_own(self, path):
+        """True if path is still exactly as the converter left it"""
+        path = os.path.abspath(path)
+        signature = self._signatures.pop(path, None)
+        if signature is None:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return signature == (st.st_size, st.st_mtime_ns)
+
+
+def batches(watcher, debounce=0.5, idle_timeout=3600.0):
+    """Yield (changed_paths, rescan) once events stop for `debounce` seconds"""
+    while True:
+        changed, rescan = watcher.read(idle_timeout)
+        if not changed and not rescan:
+            continue
+
+        deadline = time.monotonic() + debounce
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more, more_rescan = watcher.read(remaining)
+            if more or more_rescan:
+                changed |= more
+                rescan = rescan or more_rescan
+                deadline = time.monotonic() + debounce
+
+        yield changed, rescan
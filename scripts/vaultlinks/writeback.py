@@ -0,0 +1,367 @@
+"""
+Crash-safe, batched write-back of rewritten notes, with an undo journal
+
+Notes are never rewritten in place. A new version is staged as a
+temporary file next to the note, which can happen in pool workers or
+I/O threads; nothing is synced at that point. A WriteBack in the main
+process commits staged notes in batches:
+
+1. every original is kept by hard-linking it into the undo store under
+   .cache/vaultlinks/undo/objects/ (the rename in step 4 leaves that
+   inode alone, so no data is copied or read);
+2. one journal line per note records its relative path, the name of the
+   kept original and the content hash of the new version;
+3. the batch's temporary files, the journal, the kept originals and
+   each folder holding a temporary file or store link are fsynced, as
+   one barrier before any rename, every folder once per batch;
+4. each temporary file is renamed over its note, and the folders of the
+   renamed notes are fsynced once when the WriteBack closes.
+
+An interrupted run therefore leaves every note either as it was or
+completely rewritten, never truncated, and `vault.py undo` restores the
+notes of the last run that changed anything from the store.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+from collections import namedtuple
+
+from .manifest import CACHE_DIR, content_hash
+
+UNDO_DIR = os.path.join(CACHE_DIR, 'undo')
+JOURNAL_NAME = 'journal'
+
+FORMAT_VERSION = 1
+
+# Notes committed per batch
+BATCH_FILES = 256
+BATCH_BYTES = 64 * 1024 * 1024
+
+TEMP_SUFFIX = '.vaultlinks-tmp'
+
+Staged = namedtuple('Staged', 'path tmp new size')
+Staged.__doc__ = """A note staged for write-back: its path, temporary file, and
+the content hash and size of the new version"""
+
+
+def temp_path(dest):
+    """Temporary file next to dest, to be renamed over it"""
+    return os.path.join(os.path.dirname(dest), f'.{os.path.basename(dest)}{TEMP_SUFFIX}')
+
+
+def file_hash(path):
+    """content_hash of a file's bytes, read in blocks"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_temp(filepath, data, sync=False):
+    # The temporary file takes the note's permissions, as an in-place
+    # write would have kept them
+    mode = os.stat(filepath).st_mode
+    tmp = temp_path(filepath)
+    with open(tmp, 'wb') as f:
+        os.fchmod(f.fileno(), stat.S_IMODE(mode))
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    return tmp
+
+
+def stage(filepath, content):
+    """Write the new version of a note (text or bytes) next to it; returns a Staged"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    tmp = _write_temp(filepath, data)
+    return Staged(os.path.abspath(filepath), tmp, content_hash(data), len(data))
+
+
+def stage_file(filepath, tmp):
+    """Staged for a new version already written to tmp (see vaultlinks.stream)"""
+    shutil.copymode(filepath, tmp)
+    return Staged(os.path.abspath(filepath), tmp, file_hash(tmp), os.path.getsize(tmp))
+
+
+def replace(filepath, content):
+    """Atomically replace one note on its own, synced, without a journal"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    os.replace(_write_temp(filepath, data, sync=True), filepath)
+
+
+def write(filepath, content, writer=None):
+    """Write a note through writer (a WriteBack or Stager), or replace it right away"""
+    if writer is None:
+        replace(filepath, content)
+    else:
+        writer.write(filepath, content)
+
+
+class Stager:
+    """Writer for pool workers: stages notes and keeps them for the parent to commit"""
+
+    def __init__(self):
+        self.staged = []
+
+    def write(self, filepath, content):
+        self.staged.append(stage(filepath, content))
+
+    def add_file(self, filepath, tmp):
+        self.staged.append(stage_file(filepath, tmp))
+
+
+def _fsync(path):
+    """Flush a file's data to disk"""
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dirs(paths):
+    """Flush the entries of each folder in paths to disk, once per folder"""
+    for path in sorted(set(paths)):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except (FileNotFoundError, PermissionError):
+            # Folders cannot be opened on Windows; a pruned one has no entries left
+            continue
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _keep(path, dest):
+    """Hard-link path to dest, copying (and syncing the copy) where links are not supported"""
+    try:
+        os.link(path, dest)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copy2(path, dest)
+        _fsync(dest)
+
+
+class WriteBack:
+    """Commits staged notes in batches, journaling them for undo
+
+    Used as a context manager; `write` and `add_file` stage and queue a
+    note, `add` queues a Staged coming from a worker, and `move` queues a
+    rename. Leaving the context commits what is queued, unless it is left
+    through an exception, in which case the queued temporary files are
+    removed and the notes stay as they were.
+    """
+
+    def __init__(self, root, command, journal=True, batch_files=BATCH_FILES, batch_bytes=BATCH_BYTES):
+        self.root = os.path.abspath(root)
+        self.command = command
+        self.journal = journal
+        self.batch_files = batch_files
+        self.batch_bytes = batch_bytes
+        self.undo_dir = os.path.join(self.root, UNDO_DIR)
+        self.journal_file = None
+        self.pending = []
+        self.pending_bytes = 0
+        self.committed = 0
+        self.kept = 0
+        # Folders whose entries the renames changed, synced on close
+        self.renamed_dirs = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+            self.close()
+
+    def write(self, filepath, content):
+        self.add(stage(filepath, content))
+
+    def add_file(self, filepath, tmp):
+        self.add(stage_file(filepath, tmp))
+
+    def add(self, staged):
+        self.pending.append(('write', staged))
+        self.pending_bytes += staged.size
+        if len(self.pending) >= self.batch_files or self.pending_bytes >= self.batch_bytes:
+            self.flush()
+
+    def move(self, old, new):
+        """Queue renaming old to new (both under root), creating and pruning folders"""
+        self.pending.append(('move', os.path.abspath(old), os.path.abspath(new)))
+
+    def _relpath(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def _open_journal(self):
+        # A new run replaces the journal of the previous one, so undo
+        # always restores the last run that changed anything
+        if os.path.isdir(self.undo_dir):
+            shutil.rmtree(self.undo_dir)
+        os.makedirs(os.path.join(self.undo_dir, 'objects'))
+        self.journal_file = open(os.path.join(self.undo_dir, JOURNAL_NAME), 'w', encoding='utf-8')
+        header = {'format': FORMAT_VERSION, 'command': self.command, 'time': int(time.time())}
+        self.journal_file.write(json.dumps(header, separators=(',', ':')) + '\n')
+
+    def flush(self):
+        """Commit the queued notes and renames, syncing their files and each affected folder once"""
+        if not self.pending:
+            return
+        ops = []
+        for op in self.pending:
+            # A note deleted since it was staged is not brought back
+            if op[0] == 'write' and not os.path.exists(op[1].path):
+                os.unlink(op[1].tmp)
+                continue
+            ops.append(op)
+        self.pending = []
+        self.pending_bytes = 0
+
+        # Staging does not sync; the whole batch is synced here, before any rename
+        dirs = set()
+        for op in ops:
+            if op[0] == 'write':
+                _fsync(op[1].tmp)
+                dirs.add(os.path.dirname(op[1].tmp))
+        if self.journal and ops:
+            if self.journal_file is None:
+                self._open_journal()
+            objects = os.path.join(self.undo_dir, 'objects')
+            for op in ops:
+                if op[0] == 'write':
+                    staged = op[1]
+                    self.kept += 1
+                    kept = str(self.kept)
+                    _keep(staged.path, os.path.join(objects, kept))
+                    line = ['w', self._relpath(staged.path), kept, staged.new]
+                else:
+                    line = ['m', self._relpath(op[1]), self._relpath(op[2])]
+                self.journal_file.write(json.dumps(line, ensure_ascii=False) + '\n')
+            self.journal_file.flush()
+            os.fsync(self.journal_file.fileno())
+            dirs.update((self.undo_dir, objects))
+
+        _fsync_dirs(dirs)
+
+        for op in ops:
+            if op[0] == 'write':
+                os.replace(op[1].tmp, op[1].path)
+                self.renamed_dirs.add(os.path.dirname(op[1].path))
+            else:
+                os.renames(op[1], op[2])
+                self.renamed_dirs.update((os.path.dirname(op[1]), os.path.dirname(op[2])))
+            self.committed += 1
+
+    def discard(self):
+        """Drop the queued notes, removing their temporary files"""
+        for op in self.pending:
+            if op[0] == 'write':
+                try:
+                    os.unlink(op[1].tmp)
+                except FileNotFoundError:
+                    pass
+        self.pending = []
+        self.pending_bytes = 0
+
+    def close(self):
+        """Commit what is queued and make the renames durable"""
+        self.flush()
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+        _fsync_dirs(self.renamed_dirs)
+        self.renamed_dirs = set()
+
+
+def remove_temp_files(root):
+    """Delete the temporary files an interrupted run left in the vault"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in ('.git', '.cache')]
+        for filename in filenames:
+            if filename.startswith('.') and filename.endswith(TEMP_SUFFIX):
+                os.unlink(os.path.join(dirpath, filename))
+
+
+Journal = namedtuple('Journal', 'command time entries')
+Journal.__doc__ = """The last run's journal: its command, start time and entries in commit order"""
+
+
+def load_journal(root):
+    """The journal of the last run that changed anything, or None"""
+    path = os.path.join(root, UNDO_DIR, JOURNAL_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            entries = [json.loads(line) for line in f if line.endswith('\n')]
+    except (OSError, ValueError):
+        return None
+    if header.get('format') != FORMAT_VERSION:
+        return None
+    return Journal(header.get('command'), header.get('time'), entries)
+
+
+def undo(root, force=False, dry_run=False):
+    """Restore what the last run changed; returns (restored, skipped, moved_back)
+
+    Entries are undone newest first. A note is only restored if it still
+    holds what the run wrote, unless `force`; `skipped` lists the notes
+    edited since, other than back to their original. Restored notes are committed through a WriteBack
+    without a journal. The journal is deleted afterwards, unless notes
+    were skipped, so that a later run with `force` can still restore them.
+    """
+    root = os.path.abspath(root)
+    journal = load_journal(root)
+    if journal is None:
+        return None
+    objects = os.path.join(root, UNDO_DIR, 'objects')
+
+    if not dry_run:
+        remove_temp_files(root)
+
+    restored = []
+    skipped = []
+    moved_back = []
+    with WriteBack(root, 'undo', journal=False) as writeback:
+        for entry in reversed(journal.entries):
+            if entry[0] == 'm':
+                _, old, new = entry
+                old_path, new_path = os.path.join(root, old), os.path.join(root, new)
+                if os.path.lexists(new_path) and not os.path.lexists(old_path):
+                    moved_back.append((new, old))
+                    if not dry_run:
+                        writeback.move(new_path, old_path)
+                        # Later entries may restore notes at their old paths
+                        writeback.flush()
+                continue
+
+            _, relpath, kept, new = entry
+            path = os.path.join(root, relpath)
+            original = os.path.join(objects, kept)
+            try:
+                current = file_hash(path)
+            except FileNotFoundError:
+                skipped.append(relpath)
+                continue
+            if current != new:
+                if current == file_hash(original):
+                    continue
+                if not force:
+                    skipped.append(relpath)
+                    continue
+            restored.append(relpath)
+            if not dry_run:
+                tmp = temp_path(path)
+                _keep(original, tmp)
+                writeback.add(Staged(path, tmp, None, 0))
+
+    if not dry_run and not skipped:
+        shutil.rmtree(os.path.join(root, UNDO_DIR), ignore_errors=True)
+    return restored, skipped, moved_back
@@ -0,0 +1,57 @@
+"""
+Shared fixtures for the vaultlinks tests
+
+The package lives in scripts/ and is run from there, so the tests put
+that folder on the import path the same way scripts/vault.py does.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+
+@pytest.fixture
+def vault(tmp_path):
+    """Empty vault folder; call it with {relpath: text} to add notes, returns its path"""
+
+    def add(notes):
+        for relpath, text in notes.items():
+            path = tmp_path / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding='utf-8')
+        return str(tmp_path)
+
+    return add
+
+
+@pytest.fixture
+def repo(vault, monkeypatch):
+    """vault, in a new git repository that is also the working directory
+
+    Call it with {relpath: text} to add notes; returns (root, git), where
+    git(*args) runs a git command in the repository and returns its output.
+    """
+    for variable in [name for name in os.environ if name.startswith('GIT_')]:
+        monkeypatch.delenv(variable)
+    for role in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{role}_NAME', 'Test')
+        monkeypatch.setenv(f'GIT_{role}_EMAIL', 'test@example.com')
+
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=root, check=True, capture_output=True,
+                              text=True).stdout
+
+    root = vault({})
+    monkeypatch.chdir(root)
+    git('init', '-q')
+    git('config', 'commit.gpgsign', 'false')
+
+    def add(notes):
+        vault(notes)
+        return root, git
+
+    return add
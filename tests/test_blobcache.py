@@ -0,0 +1,71 @@
+import subprocess
+
+from vaultlinks.blobcache import CLEAN, NOTES_REF, BlobCache, blob_id
+from vaultlinks.cli import main
+
+CLEAN_NOTES = {'A.md': 'plain text\n', 'B.md': 'see [A](A.md)\n', 'image.png': 'png'}
+
+
+def committed(repo):
+    root, git = repo(CLEAN_NOTES)
+    git('add', '.')
+    git('commit', '-qm', 'init')
+    return root, git
+
+
+def notes_commits(git):
+    """Commits on the notes ref, or None without one"""
+    try:
+        return int(git('rev-list', '--count', NOTES_REF))
+    except subprocess.CalledProcessError:
+        return None
+
+
+def test_blob_id_matches_git(repo):
+    root, git = repo({'A.md': 'some note\n'})
+    assert blob_id(b'some note\n') == git('hash-object', 'A.md').strip()
+
+
+def test_results_round_trip_and_unchanged_results_are_not_saved(repo):
+    root, git = committed(repo)
+    clean_blob, converted_blob = blob_id(b'plain text\n'), blob_id(b'see [A](A.md)\n')
+
+    cache = BlobCache.load('conv', 1, root)
+    cache.record(clean_blob, CLEAN)
+    cache.record(converted_blob, (clean_blob, 2))
+    assert cache.save()
+
+    cache = BlobCache.load('conv', 1, root)
+    assert cache.result(clean_blob) == CLEAN
+    assert cache.result(converted_blob) == (clean_blob, 2)
+    assert BlobCache.load('conv', 2, root).result(clean_blob) is None
+    cache.record(clean_blob, CLEAN)
+    assert not cache.save()
+    assert notes_commits(git) == 1
+
+
+def test_convert_leaves_the_notes_ref_alone_by_default(repo):
+    root, git = committed(repo)
+
+    assert main(['convert', '--vault', root]) == 0
+
+    assert notes_commits(git) is None
+
+
+def test_notes_cache_records_clean_blobs_once_and_reuses_them(repo, capsys):
+    root, git = committed(repo)
+
+    assert main(['convert', '--vault', root, '--notes-cache', '--no-index']) == 0
+    assert notes_commits(git) == 1
+    cache = BlobCache.load('convert-obsidian-links', 1, root)
+    assert cache.result(blob_id(b'plain text\n')) == CLEAN
+    capsys.readouterr()
+
+    # Enabled through git config this time; nothing new is found, so nothing is committed
+    git('config', 'vaultlinks.notesCache', 'true')
+    assert main(['convert', '--vault', root, '--no-index']) == 0
+    assert '2 notes already seen clean' in capsys.readouterr().out
+    assert notes_commits(git) == 1
+
+    assert main(['convert', '--vault', root, '--no-cache']) == 0
+    assert 'already seen clean' not in capsys.readouterr().out
@@ -0,0 +1,57 @@
+import urllib.parse
+
+import pytest
+
+from vaultlinks.canonical import canonical_target
+from vaultlinks.convert import convert_obsidian_to_markdown_links
+
+NAMES = ['My Note.md', 'dir/Sub Note.md', 'Café Résumé.md', 'a:b #1.md', '100% done.md', '日本語/ノート.md']
+
+
+def encode(target, times):
+    for _ in range(times):
+        target = urllib.parse.quote(target, safe='/')
+    return target
+
+
+@pytest.mark.parametrize('name', NAMES)
+@pytest.mark.parametrize('times', [2, 3, 5])
+def test_nested_encoding_collapses_to_one_layer(name, times):
+    once = encode(name, 1)
+    assert canonical_target(encode(name, times)) == once
+    assert urllib.parse.unquote(canonical_target(encode(name, times))) == name
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_canonical_form_is_stable(name):
+    target = canonical_target(encode(name, 3))
+    assert canonical_target(target) == target
+
+
+@pytest.mark.parametrize('target', ['dir%2FNote.md', 'dir%252FNote.md', 'dir%25252FNote.md'])
+def test_one_rule_for_every_nesting_depth(target):
+    # An encoded '/' stays encoded, however many layers it came with
+    assert canonical_target(target) == 'dir%2FNote.md'
+
+
+def test_single_escapes_and_plain_characters_are_left_alone():
+    assert canonical_target('My%20Note.md') == 'My%20Note.md'
+    assert canonical_target('Café%2520x.md') == 'Café%20x.md'
+    assert canonical_target('100%25 done.md') == '100%25 done.md'
+
+
+def test_external_urls_keep_their_single_escapes():
+    assert canonical_target('https://example.com/a%252Fb?q=%2520') == 'https://example.com/a%2Fb?q=%20'
+    assert canonical_target('https://example.com/a%20b') == 'https://example.com/a%20b'
+
+
+def test_fragment_keeps_its_encoding():
+    assert canonical_target('My%2520Note.md#Some%2520Heading') == 'My%20Note.md#Some%20Heading'
+
+
+@pytest.mark.parametrize('name', ['My Note', 'Café', 'a (b) c'])
+def test_wikilink_target_decodes_back_to_the_note(name):
+    content = convert_obsidian_to_markdown_links(f'[[{name}]]')
+    target = content[content.index('](') + 2:-1]
+    assert urllib.parse.unquote(target) == name + '.md'
+    assert canonical_target(target) == target
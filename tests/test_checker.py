@@ -0,0 +1,57 @@
+from vaultlinks import checker
+from vaultlinks.cli import main
+from vaultlinks.noteindex import NoteIndex
+
+
+def test_check_content_finds_broken_links_with_line_numbers(vault):
+    root = vault({'docs/Guide.md': '', 'docs/img/a b.png': ''})
+    paths = checker.vault_paths(root)
+    content = ('[ok](Guide.md) [ok](img/a%20b.png) [ok](../docs/Guide.md#intro)\n'
+               '[web](https://example.com/missing.md)\n'
+               '`[code](Missing.md)`\n'
+               '[gone](Gone.md)\n'
+               '```\n[fenced](Missing.md)\n```\n'
+               '[up](../Nowhere.md)\n')
+
+    broken = checker.check_content(content, 'docs/Source.md', paths)
+
+    assert [(link.line, link.link, link.target) for link in broken] == [
+        (4, '[gone](Gone.md)', 'docs/Gone.md'),
+        (8, '[up](../Nowhere.md)', 'Nowhere.md'),
+    ]
+
+
+def test_wikilinks_are_checked_against_the_note_index(vault):
+    root = vault({'Home.md': '', 'files/report.pdf': ''})
+    index = NoteIndex.build(root, persist=False)
+    content = '[[Home]] [[home#Intro]] [[report.pdf]] [[Missing|x]] [[#Local]]\n'
+
+    broken = checker.check_content(content, 'Source.md', checker.vault_paths(root), index)
+
+    assert [link.target for link in broken] == ['Missing']
+    assert checker.check_content(content, 'Source.md', checker.vault_paths(root)) == []
+
+
+def test_report_is_sorted_with_case_hints(vault, capsys):
+    root = vault({
+        'z.md': '[x](nope.md)\n\n[y](readme.md)\n',
+        'b/n.md': '[q](../z.md) [q](no.md)\n',
+        'a/n.md': '[q](no.md)\n',
+        'README.md': '',
+    })
+
+    assert main(['check', root, '--jobs', '2']) == 1
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line for line in lines if ': broken link ' in line] == [
+        'a/n.md:1: broken link [q](no.md)',
+        'b/n.md:1: broken link [q](no.md)',
+        'z.md:1: broken link [x](nope.md)',
+        'z.md:3: broken link [y](readme.md) (did you mean README.md?)',
+    ]
+    assert lines[-1] == '💥 4 broken links in 3 notes'
+
+
+def test_clean_vault_passes(vault):
+    root = vault({'A.md': '[b](B.md)\n', 'B.md': '[a](A.md)\n'})
+    assert main(['check', root]) == 0
@@ -0,0 +1,32 @@
+import os
+
+from vaultlinks.cli import main
+
+
+def read(root, relpath):
+    with open(os.path.join(root, relpath), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_default_run_converts_like_the_hook(vault):
+    root = vault({
+        'auth/Auth.md': '# Login\n',
+        'assets/pic.png': 'png',
+        'notes/Source.md': 'see [[Auth|the auth]], [[Auth#Login]] and ![[pic.png]]\n'
+                           '[spaced](My%2520Note.md)\n```\n[[Auth]]\n```\n',
+    })
+
+    # 2: notes were fixed, as with convert
+    assert main(['doctor', root]) == 2
+
+    assert read(root, 'notes/Source.md') == (
+        'see [the auth](../auth/Auth.md), [Auth > Login](../auth/Auth.md#login) and ![pic.png](../assets/pic.png)\n'
+        '[spaced](My%20Note.md)\n```\n[[Auth]]\n```\n')
+
+
+def test_named_stages_run_without_convert(vault):
+    root = vault({'A.md': '[[Note]] and [x](My%252520Note.md)\n'})
+
+    assert main(['doctor', root, '--fix-multiple-encoding']) == 2
+
+    assert read(root, 'A.md') == '[[Note]] and [x](My%20Note.md)\n'
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from vaultlinks.cli import main
+
+
+@pytest.fixture
+def out_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('mirror'))
+
+
+def read(root, relpath):
+    with open(os.path.join(root, relpath), encoding='utf-8') as f:
+        return f.read()
+
+
+def export(root, out_dir, *options):
+    return main(['export', '--vault', root, '--out', out_dir, *options])
+
+
+def test_export_converts_notes_and_links_the_rest(vault, out_dir):
+    root = vault({'docs/Guide.md': 'see [[Home]]\n', 'Home.md': 'plain\n', 'img/pic.png': 'png'})
+
+    assert export(root, out_dir) == 0
+
+    assert read(out_dir, 'docs/Guide.md') == 'see [Home](../Home.md)\n'
+    assert read(root, 'docs/Guide.md') == 'see [[Home]]\n'
+    for relpath in ('Home.md', 'img/pic.png'):
+        assert os.path.samefile(os.path.join(root, relpath), os.path.join(out_dir, relpath))
+
+
+def test_export_refuses_a_folder_inside_the_vault(vault):
+    root = vault({'A.md': ''})
+    assert export(root, os.path.join(root, 'mirror')) == 1
+
+
+def test_reexport_follows_renamed_link_targets(vault, out_dir):
+    root = vault({'A.md': 'see [[Target]]\n', 'old/Target.md': ''})
+    assert export(root, out_dir) == 0
+    os.renames(os.path.join(root, 'old', 'Target.md'), os.path.join(root, 'new', 'Target.md'))
+
+    assert export(root, out_dir) == 0
+
+    assert read(out_dir, 'A.md') == 'see [Target](new/Target.md)\n'
+    assert not os.path.exists(os.path.join(out_dir, 'old'))
+
+
+@pytest.mark.parametrize('options', [(), ('--no-cache',)])
+def test_reexport_removes_files_deleted_from_the_vault(vault, out_dir, options):
+    root = vault({'A.md': 'see [[B]]\n', 'B.md': '', 'sub/C.md': '', 'sub/pic.png': 'png'})
+    assert export(root, out_dir) == 0
+    os.unlink(os.path.join(root, 'sub', 'C.md'))
+    os.unlink(os.path.join(root, 'sub', 'pic.png'))
+    os.rmdir(os.path.join(root, 'sub'))
+
+    assert export(root, out_dir, *options) == 0
+
+    assert sorted(os.listdir(out_dir)) == ['A.md', 'B.md']
+    # A later export still knows what it wrote
+    os.unlink(os.path.join(root, 'B.md'))
+    assert export(root, out_dir, *options) == 0
+    assert os.listdir(out_dir) == ['A.md']
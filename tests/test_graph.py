@@ -0,0 +1,108 @@
+import json
+import os
+
+from vaultlinks.cli import main
+from vaultlinks.graph import LinkGraph, graph_path
+from vaultlinks.noteindex import NoteIndex
+
+NOTES = {
+    'Home.md': '[[Plan]] and [Guide](docs/Guide.md) ![[img/logo.png]]',
+    'Plan.md': '[[Guide]] [[Plan]]',
+    'docs/Guide.md': '[[Home]]',
+    'docs/Extra.md': '[[Guide]]',
+    'island/One.md': '[[Two]]',
+    'island/Two.md': 'no links',
+    'Lonely.md': 'nothing here',
+    'img/logo.png': '',
+}
+
+
+def build(root):
+    return LinkGraph.build(root, NoteIndex.build(root, persist=False), persist=False)
+
+
+def names(graph, nodes):
+    return [graph.paths[node] for node in nodes]
+
+
+def test_graph_edges_backlinks_and_folders(vault):
+    graph = build(vault(NOTES))
+
+    home = graph.node('Home.md')
+    assert names(graph, graph.neighbors(home)) == ['Plan.md', 'docs/Guide.md', 'img/logo.png']
+    # Self links are dropped
+    assert names(graph, graph.neighbors(graph.node('Plan.md'))) == ['docs/Guide.md']
+    assert names(graph, graph.backlinks(graph.node('docs/Guide.md'))) == ['Home.md', 'Plan.md', 'docs/Extra.md']
+    # Links inside the folder do not count as linking into it
+    assert names(graph, graph.linking_into(graph.resolve('docs'))) == ['Home.md', 'Plan.md']
+    assert names(graph, graph.resolve('island/')) == ['island/One.md', 'island/Two.md']
+    assert graph.node('Missing.md') is None
+
+
+def test_orphans_components_reach_and_path(vault):
+    graph = build(vault(NOTES))
+
+    assert names(graph, graph.orphans()) == ['Lonely.md']
+    assert [names(graph, nodes) for nodes in graph.components()] == [
+        ['Home.md', 'Plan.md', 'docs/Extra.md', 'docs/Guide.md', 'img/logo.png'],
+        ['island/One.md', 'island/Two.md'],
+        ['Lonely.md'],
+    ]
+
+    extra = graph.node('docs/Extra.md')
+    depth = graph.reachable([extra])
+    assert {graph.paths[node]: level for node, level in depth.items()} == {
+        'docs/Extra.md': 0, 'docs/Guide.md': 1, 'Home.md': 2, 'Plan.md': 3, 'img/logo.png': 3}
+    assert sorted(names(graph, graph.reachable([extra], max_depth=1))) == ['docs/Extra.md', 'docs/Guide.md']
+    assert sorted(names(graph, graph.reachable([graph.node('island/Two.md')], reverse=True))) == [
+        'island/One.md', 'island/Two.md']
+
+    assert names(graph, graph.path(extra, graph.node('img/logo.png'))) == [
+        'docs/Extra.md', 'docs/Guide.md', 'Home.md', 'img/logo.png']
+    assert graph.path(extra, graph.node('island/One.md')) is None
+
+
+def test_saved_graph_loads_back_unchanged(vault):
+    root = vault(NOTES)
+    graph = LinkGraph.build(root, NoteIndex.build(root, persist=False))
+
+    loaded = LinkGraph.load(graph_path(root))
+
+    assert loaded.paths == graph.paths
+    for name in ('out_offsets', 'out_targets', 'in_offsets', 'in_sources', 'component'):
+        assert list(getattr(loaded, name)) == list(getattr(graph, name))
+
+    with open(graph_path(root), 'r+b') as f:
+        f.truncate(os.path.getsize(graph_path(root)) - 4)
+    assert LinkGraph.load(graph_path(root)) is None
+
+
+def test_rebuild_resolves_links_again_against_new_notes(vault):
+    root = vault({'A.md': '[[B]]', 'C.md': 'c'})
+    graph = LinkGraph.build(root, NoteIndex.build(root))
+    assert list(graph.neighbors(graph.node('A.md'))) == []
+
+    # A.md is unchanged, but its link now has a target
+    vault({'B.md': 'b'})
+    graph = LinkGraph.build(root, NoteIndex.build(root))
+
+    assert names(graph, graph.neighbors(graph.node('A.md'))) == ['B.md']
+
+
+def test_graph_command_queries_and_export(vault, capsys):
+    root = vault(NOTES)
+
+    assert main(['graph', '--vault', root, 'backlinks', 'docs']) == 0
+    assert capsys.readouterr().out.splitlines() == ['Home.md', 'Plan.md']
+
+    assert main(['graph', '--vault', root, 'path', 'island/One.md', 'Home.md']) == 1
+    assert 'No chain of links' in capsys.readouterr().err
+
+    output = os.path.join(root, 'graph.json')
+    assert main(['graph', '--vault', root, 'export', '-o', output]) == 0
+    with open(output, encoding='utf-8') as f:
+        exported = json.load(f)
+    assert 'Lonely.md' in exported['nodes']
+    edges = {(exported['nodes'][a], exported['nodes'][b]) for a, b in exported['edges']}
+    assert ('island/One.md', 'island/Two.md') in edges
+    assert len(edges) == 7
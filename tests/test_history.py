@@ -0,0 +1,74 @@
+import pytest
+
+from vaultlinks.cli import main
+
+
+@pytest.fixture
+def history(repo):
+    """Three commits, the first two sharing an unchanged note; yields git"""
+    root, git = repo({'A.md': 'see [[B]]\n', 'B.md': '# B\n'})
+    git('add', '.')
+    git('commit', '-qm', 'one')
+    repo({'C.md': 'and [x](My%2520Note.md)\n'})
+    git('add', '.')
+    git('commit', '-qm', 'two')
+    repo({'D.md': 'plain\n'})
+    git('add', '.')
+    git('commit', '-qm', 'three')
+    return git
+
+
+def test_rewrites_every_commit_and_keeps_a_backup(history):
+    git = history
+    before = git('rev-parse', 'HEAD').strip()
+
+    assert main(['rewrite-history']) == 0
+
+    assert git('log', '--format=%s') == 'three\ntwo\none\n'
+    for revision in ('HEAD~2', 'HEAD~1', 'HEAD'):
+        assert git('show', f'{revision}:A.md') == 'see [B](B.md)\n'
+    assert git('show', 'HEAD:C.md') == 'and [x](My%20Note.md)\n'
+    assert git('show', 'HEAD:D.md') == 'plain\n'
+    branch = git('symbolic-ref', 'HEAD').strip()
+    assert git('rev-parse', f'refs/original/{branch}').strip() == before
+    assert git('status', '--porcelain') == ''
+
+
+def test_dry_run_changes_nothing(history, capsys):
+    git = history
+    before = git('for-each-ref')
+
+    assert main(['rewrite-history', '--dry-run']) == 0
+
+    assert git('for-each-ref') == before
+    assert '2 note revisions would be converted' in capsys.readouterr().out
+
+
+def test_range_keeps_the_commits_it_excludes(history):
+    git = history
+    base = git('rev-parse', 'HEAD~2').strip()
+    branch = git('symbolic-ref', '--short', 'HEAD').strip()
+
+    assert main(['rewrite-history', f'HEAD~2..{branch}']) == 0
+
+    # The first rewritten commit still has the excluded one as its parent;
+    # notes it did not change keep the excluded commit's version
+    assert git('rev-parse', 'HEAD~2').strip() == base
+    assert git('show', 'HEAD~2:A.md') == 'see [[B]]\n'
+    assert git('show', 'HEAD:A.md') == 'see [[B]]\n'
+    assert git('show', 'HEAD~1:C.md') == 'and [x](My%20Note.md)\n'
+
+
+def test_leaves_git_notes_and_the_stash_alone(history):
+    git = history
+    git('notes', '--ref=vaultlinks', 'add', '-m', 'cache entry', 'HEAD:A.md')
+    with open('D.md', 'w') as f:
+        f.write('work in [[progress]]\n')
+    git('stash', '-q')
+    notes, stash = git('rev-parse', 'refs/notes/vaultlinks', 'refs/stash').split()
+
+    assert main(['rewrite-history']) == 0
+
+    assert git('rev-parse', 'refs/notes/vaultlinks', 'refs/stash').split() == [notes, stash]
+    assert git('for-each-ref', '--format=%(refname)', 'refs/original/refs/notes/', 'refs/original/refs/stash') == ''
+    assert git('stash', 'list', '--format=%gs').count('WIP') == 1
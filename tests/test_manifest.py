@@ -0,0 +1,71 @@
+import os
+
+from vaultlinks.manifest import Manifest, content_hash
+
+
+def record_clean(root, relpath, version=1):
+    manifest = Manifest.load(root, 'test', version)
+    path = os.path.join(root, relpath)
+    with open(path, 'rb') as f:
+        manifest.record(path, os.stat(path), content_hash(f.read()))
+    manifest.save()
+    return path
+
+
+def age(path, seconds=10):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+def test_recorded_file_is_unchanged_after_reload(vault):
+    root = vault({'A.md': 'clean\n'})
+    path = os.path.join(root, 'A.md')
+    age(path)
+    record_clean(root, 'A.md')
+
+    manifest = Manifest.load(root, 'test', 1)
+    assert manifest.unchanged(path)
+    assert manifest.clean_hash(path) == content_hash('clean\n')
+    assert not Manifest.load(root, 'test', 2).unchanged(path)
+    assert Manifest.load(root, 'test', 2).clean_hash(path) is None
+
+
+def test_edit_keeping_the_mtime_is_caught_by_size(vault):
+    root = vault({'A.md': 'clean\n'})
+    path = os.path.join(root, 'A.md')
+    age(path)
+    record_clean(root, 'A.md')
+    st = os.stat(path)
+    with open(path, 'w') as f:
+        f.write('[[changed]]\n')
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert not Manifest.load(root, 'test', 1).unchanged(path)
+
+
+def test_racy_entry_is_not_trusted_on_stat_alone(vault):
+    # The note was written in the same tick as the manifest (or later), so
+    # a second write with the same size and mtime could have gone unseen
+    root = vault({'A.md': 'clean\n'})
+    path = os.path.join(root, 'A.md')
+    record_clean(root, 'A.md')
+    manifest = Manifest.load(root, 'test', 1)
+    os.utime(path, ns=(manifest.written_ns, manifest.written_ns))
+    manifest.record(path, os.stat(path), content_hash('clean\n'))
+
+    assert not manifest.unchanged(path)
+    # The content hash still lets a reader skip the conversion
+    assert manifest.clean_hash(path) == content_hash('clean\n')
+
+
+def test_forget_drops_the_entry(vault):
+    root = vault({'A.md': 'clean\n'})
+    path = os.path.join(root, 'A.md')
+    age(path)
+    record_clean(root, 'A.md')
+    manifest = Manifest.load(root, 'test', 1)
+    manifest.forget(path)
+    manifest.save()
+
+    assert not Manifest.load(root, 'test', 1).unchanged(path)
+    assert Manifest.load(root, 'test', 1).clean_hash(path) is None
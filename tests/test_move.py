@@ -0,0 +1,40 @@
+import os
+
+from vaultlinks.cli import main
+
+
+def read(root, relpath):
+    with open(os.path.join(root, relpath), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_move_patches_wikilinks_and_relative_links(vault, monkeypatch):
+    root = vault({
+        'Foo.md': 'foo',
+        'A.md': 'see [[Foo]], [[Foo|the foo]] and [foo](Foo.md)\n',
+        'sub/B.md': 'up [[Foo#Heading]] and [foo](../Foo.md)\n',
+        'Code.md': '`[[Foo]]`\n',
+    })
+    monkeypatch.chdir(root)
+
+    assert main(['move', 'Foo.md', 'notes/Bar.md', '--vault', root]) == 0
+
+    assert os.path.exists(os.path.join(root, 'notes', 'Bar.md'))
+    assert not os.path.exists(os.path.join(root, 'Foo.md'))
+    assert read(root, 'A.md') == 'see [[Bar]], [[Bar|the foo]] and [foo](notes/Bar.md)\n'
+    assert read(root, 'sub/B.md') == 'up [[Bar#Heading]] and [foo](../notes/Bar.md)\n'
+    assert read(root, 'Code.md') == '`[[Foo]]`\n'
+
+
+def test_move_patches_links_cached_before_their_target_existed(vault, monkeypatch):
+    # The backlink cache must keep [[Foo]] by name: it was written while
+    # Foo.md did not exist, and is still fresh for A.md afterwards
+    root = vault({'A.md': 'see [[Foo]]\n'})
+    monkeypatch.chdir(root)
+    assert main(['graph', '--vault', root, 'build']) == 0
+    with open(os.path.join(root, 'Foo.md'), 'w', encoding='utf-8') as f:
+        f.write('foo')
+
+    assert main(['move', 'Foo.md', 'Bar.md', '--vault', root]) == 0
+
+    assert read(root, 'A.md') == 'see [[Bar]]\n'
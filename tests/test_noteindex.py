@@ -0,0 +1,48 @@
+import os
+
+from vaultlinks.noteindex import NoteIndex
+
+
+def build(vault, notes):
+    return NoteIndex.build(vault(notes), persist=False)
+
+
+def test_resolves_names_paths_and_aliases(vault):
+    index = build(vault, {
+        'Home.md': 'home',
+        'projects/Plan.md': '---\naliases: [Roadmap, "Q3 plan"]\n---\nplan',
+        'archive/Old Plan.md': 'old',
+    })
+    assert index.resolve('Home') == 'Home.md'
+    assert index.resolve('Home.md') == 'Home.md'
+    assert index.resolve('projects/Plan') == 'projects/Plan.md'
+    assert index.resolve('Roadmap') == 'projects/Plan.md'
+    assert index.resolve('Q3 plan') == 'projects/Plan.md'
+    assert index.resolve('old plan') == 'archive/Old Plan.md'
+    assert index.resolve('Missing') is None
+
+
+def test_prefers_the_linking_notes_folder_then_the_shallowest(vault):
+    index = build(vault, {
+        'Notes.md': 'top',
+        'a/Notes.md': 'a',
+        'a/b/Notes.md': 'b',
+    })
+    assert index.resolve('Notes', 'a/b/Source.md') == 'a/b/Notes.md'
+    assert index.resolve('Notes', 'c/Source.md') == 'Notes.md'
+    assert index.resolve('b/Notes') == 'a/b/Notes.md'
+
+
+def test_link_target_is_relative_encoded_and_anchored(vault):
+    root = vault({
+        'docs/Setup Guide.md': '# Install it\n\ntext ^step\n',
+        'notes/Source.md': 'see [[Setup Guide]]',
+        'img/diagram one.png': '',
+    })
+    index = NoteIndex.build(root, persist=False)
+    source = os.path.join(root, 'notes', 'Source.md')
+    assert index.link_target('Setup Guide', source) == '../docs/Setup%20Guide.md'
+    assert index.link_target('Setup Guide', source, 'Install it') == '../docs/Setup%20Guide.md#install-it'
+    assert index.link_target('Setup Guide', source, '^step') == '../docs/Setup%20Guide.md#install-it'
+    assert index.link_target('diagram one.png', source) == '../img/diagram%20one.png'
+    assert index.link_target('Nowhere', source) is None
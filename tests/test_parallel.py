@@ -0,0 +1,40 @@
+import os
+
+from vaultlinks import parallel
+from vaultlinks.cli import main
+from vaultlinks.synthvault import VaultSpec, generate
+
+
+def square(x):
+    return x * x
+
+
+def test_imap_keeps_task_order_across_workers():
+    tasks = [(i,) for i in range(50)]
+    assert list(parallel.imap(square, tasks, jobs=3, sizes=[1] * 50, chunk_bytes=4)) == [i * i for i in range(50)]
+
+
+def convert(root, jobs, capsys, monkeypatch):
+    monkeypatch.chdir(root)
+    status = main(['convert', '--vault', root, '--no-cache', '--jobs', str(jobs)])
+    output = capsys.readouterr().out
+    notes = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != '.cache']
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                notes[os.path.relpath(path, root)] = f.read()
+    return status, output, notes
+
+
+def test_jobs_run_matches_the_serial_run(tmp_path, capsys, monkeypatch):
+    spec = VaultSpec(notes=120, seed=3)
+    generate(str(tmp_path / 'serial'), spec)
+    generate(str(tmp_path / 'pool'), spec)
+
+    serial = convert(str(tmp_path / 'serial'), 1, capsys, monkeypatch)
+    pooled = convert(str(tmp_path / 'pool'), 3, capsys, monkeypatch)
+
+    assert serial[0] == 2
+    assert pooled == serial
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from vaultlinks import fixers, prefilter
+from vaultlinks.convert import CONVERT_TRIGGERS, convert_content
+from vaultlinks.manifest import content_hash
+from vaultlinks.synthvault import VaultSpec, generate
+
+
+def test_found_in_matches_literals_and_patterns_in_text_and_bytes():
+    triggers = prefilter.union(prefilter.WIKILINKS, prefilter.SPACED_MD_LINK, prefilter.WIKILINKS)
+    assert triggers.literals == ('[[',)
+    for data in ('a [[b]]', 'a [x](my note.md)', b'a [[b]]', 'Café [x](my note.md)'.encode('utf-8')):
+        assert prefilter.found_in(triggers, data)
+    for data in ('plain text', b'[x](my%20note.md)', '[x](note.md) and a space'):
+        assert not prefilter.found_in(triggers, data)
+
+
+@pytest.mark.parametrize('threshold', [prefilter.MMAP_THRESHOLD, 1])
+def test_read_note_skips_notes_without_triggers(tmp_path, monkeypatch, threshold):
+    monkeypatch.setattr(prefilter, 'MMAP_THRESHOLD', threshold)
+    plain = tmp_path / 'plain.md'
+    plain.write_bytes(b'nothing here\n')
+    linked = tmp_path / 'linked.md'
+    linked.write_bytes(b'see [[Note]]\r\n')
+
+    st, data, digest = prefilter.read_note(str(plain), prefilter.WIKILINKS, want_hash=True)
+    assert data is None
+    assert st.st_size == 13
+    assert digest == content_hash(b'nothing here\n')
+
+    _, data, digest = prefilter.read_note(str(linked), prefilter.WIKILINKS)
+    assert data == b'see [[Note]]\r\n'
+    assert digest is None
+    assert prefilter.decode(data) == 'see [[Note]]\n'
+
+
+def test_read_note_streams_large_notes(tmp_path, monkeypatch):
+    monkeypatch.setattr(prefilter, 'MMAP_THRESHOLD', 1)
+    monkeypatch.setattr(prefilter, 'STREAM_THRESHOLD', 10)
+    path = tmp_path / 'big.md'
+    path.write_bytes(b'a long note with [[Link]]\n')
+
+    assert prefilter.read_note(str(path), prefilter.WIKILINKS, stream=True)[1] is prefilter.STREAM
+    assert prefilter.read_note(str(path), prefilter.WIKILINKS)[1] == b'a long note with [[Link]]\n'
+
+
+def test_skipped_notes_are_ones_the_transforms_leave_alone(tmp_path):
+    # The filter may let through notes with nothing to fix, but must never
+    # skip one a transform would change
+    root = str(tmp_path)
+    paths = generate(root, VaultSpec(notes=150, seed=5, encoded_ratio=0.3))
+    transforms = [
+        (CONVERT_TRIGGERS, lambda text: convert_content(text)[0]),
+        (fixers.CONVERT_LINKS_TRIGGERS, fixers.convert_obsidian_links_to_markdown),
+        (fixers.FIX_ALL_LINKS_TRIGGERS, fixers.fix_markdown_links),
+        (fixers.FIX_ENCODING_TRIGGERS, fixers.fix_links),
+        (fixers.FIX_MULTIPLE_ENCODING_TRIGGERS, fixers.fix_multiple_encoding),
+    ]
+    skipped = 0
+    for path in paths:
+        with open(os.path.join(root, path), 'rb') as f:
+            data = f.read()
+        text = prefilter.decode(data)
+        # Also a note whose links were all stripped, as most of a real vault is
+        plain = text.replace('[', '(')
+        for triggers, transform in transforms:
+            for candidate in (text, plain):
+                if not prefilter.found_in(triggers, candidate.encode('utf-8')):
+                    skipped += 1
+                    assert transform(candidate) == candidate
+    assert skipped
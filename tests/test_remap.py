@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from vaultlinks.commands.remap import update_links_in_file
+from vaultlinks.remap import LinkRemapper, load_mapping
+
+
+def test_load_mapping_reads_json_and_csv(tmp_path):
+    json_path = tmp_path / 'moves.json'
+    json_path.write_text('{"Old Note": "new/Old Note"}', encoding='utf-8')
+    csv_path = tmp_path / 'moves.csv'
+    csv_path.write_text('Old Note,new/Old Note\n"A, B",x/A B\n,ignored\n', encoding='utf-8')
+
+    assert load_mapping(str(json_path)) == {'Old Note': 'new/Old Note'}
+    assert load_mapping(str(csv_path)) == {'Old Note': 'new/Old Note', 'A, B': 'x/A B'}
+
+
+def test_load_mapping_rejects_a_json_list(tmp_path):
+    path = tmp_path / 'moves.json'
+    path.write_text('[["Old", "New"]]', encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_mapping(str(path))
+
+
+def test_remap_rewrites_mapped_links_relative_to_the_note(tmp_path):
+    remapper = LinkRemapper({'Auth': '02-backend/auth/Auth', 'API%20Design': '02-backend/api/API Design'},
+                            str(tmp_path))
+    content = ('[auth](Auth.md) [api](API%20Design.md) [other](Other.md)\n'
+               '`[auth](Auth.md)`\n```\n[auth](Auth.md)\n```\n')
+
+    new_content, count = remapper.remap(content, str(tmp_path / '03-frontend'))
+
+    assert count == 2
+    assert new_content == ('[auth](../02-backend/auth/Auth.md) [api](../02-backend/api/API Design.md) '
+                           '[other](Other.md)\n`[auth](Auth.md)`\n```\n[auth](Auth.md)\n```\n')
+
+
+def test_update_links_in_file_writes_only_changed_notes(vault):
+    root = vault({'a/Note.md': 'see [x](Old.md)\n', 'a/Plain.md': 'see [y](Kept.md)\n'})
+    remapper = LinkRemapper({'Old': 'b/New'}, root)
+    plain = os.path.join(root, 'a', 'Plain.md')
+    mtime = os.stat(plain).st_mtime_ns
+
+    assert update_links_in_file(os.path.join(root, 'a', 'Note.md'), remapper)
+    assert not update_links_in_file(plain, remapper)
+
+    assert open(os.path.join(root, 'a', 'Note.md')).read() == 'see [x](../b/New.md)\n'
+    assert os.stat(plain).st_mtime_ns == mtime
@@ -0,0 +1,47 @@
+from vaultlinks import scanner
+
+
+def kinds(content):
+    return [(token.kind, token.target) for token in scanner.scan(content)]
+
+
+def test_finds_each_kind_of_link():
+    content = 'see [[Note]], [[Other|shown]], [text](a%20b.md) and https://example.com/x'
+    assert kinds(content) == [
+        (scanner.WIKILINK, 'Note'),
+        (scanner.ALIAS, 'Other'),
+        (scanner.LINK, 'a%20b.md'),
+        (scanner.URL, 'https://example.com/x'),
+    ]
+
+
+def test_skips_fenced_code():
+    content = '[[Before]]\n```python\nx = "[[Inside]]"\n```\n~~~\n[t](inside.md)\n~~~\n[[After]]\n'
+    assert kinds(content) == [(scanner.WIKILINK, 'Before'), (scanner.WIKILINK, 'After')]
+
+
+def test_skips_inline_code():
+    content = 'use `[[Not a link]]` or ``[x](y.md)`` but [[Link]]'
+    assert kinds(content) == [(scanner.WIKILINK, 'Link')]
+
+
+def test_unclosed_fence_hides_the_rest():
+    content = '[[Seen]]\n```\n[[Hidden]]\n'
+    assert kinds(content) == [(scanner.WIKILINK, 'Seen')]
+    assert scanner.unclosed_fence(content) == '```'
+    assert scanner.unclosed_fence('```\ncode\n```\n') is None
+
+
+def test_embed_span_includes_the_bang():
+    content = 'x ![[image.png]] y'
+    token, = scanner.scan(content)
+    assert token.embed
+    assert content[token.start:token.end] == '![[image.png]]'
+
+
+def test_rewrite_leaves_code_alone():
+    content = '[[A]] `[[B]]`\n```\n[[C]]\n```\n'
+    new_content, found, rewritten = scanner.rewrite(content, lambda token: f'<{token.target}>')
+    assert new_content == '<A> `[[B]]`\n```\n[[C]]\n```\n'
+    assert found[scanner.WIKILINK] == 1
+    assert rewritten[scanner.WIKILINK] == 1
@@ -0,0 +1,81 @@
+import io
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from vaultlinks import client
+
+VAULT_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts', 'vault.py')
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def server(repo):
+    """Start `vault.py serve` in a new repository; yields (root, git)"""
+    root, git = repo({})
+    process = subprocess.Popen([sys.executable, VAULT_PY, 'serve', '--vault', root],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    path = client.socket_path(root)
+    for _ in range(100):
+        sock = client.connect(path)
+        if sock is not None:
+            sock.close()
+            break
+        time.sleep(0.05)
+    else:
+        process.kill()
+        pytest.fail("server did not start")
+    try:
+        yield root, git
+    finally:
+        client.stop(root)
+        process.wait(5)
+
+
+def test_server_runs_commands_and_returns_their_status(server):
+    root, _ = server
+    with open(os.path.join(root, 'A.md'), 'w') as f:
+        f.write('[x](missing.md)\n')
+    out = io.BytesIO()
+
+    status = client.request(['check'], cwd=root, out=out)
+
+    assert status == 1
+    assert 'A.md:1: broken link [x](missing.md)' in out.getvalue().decode('utf-8')
+    assert client.request(['no-such-command'], cwd=root, out=io.BytesIO()) == 1
+    assert stat.S_IMODE(os.stat(client.socket_path(root)).st_mode) == 0o600
+
+
+def test_server_uses_the_clients_git_index(server, monkeypatch):
+    # As in `git commit -a`, the hook runs against a temporary index
+    root, git = server
+    with open(os.path.join(root, 'Target.md'), 'w') as f:
+        f.write('# T\n')
+    with open(os.path.join(root, 'A.md'), 'w') as f:
+        f.write('see [[Target]]\n')
+    git('add', 'Target.md')
+    other_index = os.path.join(root, '.git', 'other-index')
+    subprocess.run(['git', 'read-tree', '--empty'], cwd=root, check=True,
+                   env=dict(os.environ, GIT_INDEX_FILE=other_index))
+    subprocess.run(['git', 'add', 'A.md', 'Target.md'], cwd=root, check=True,
+                   env=dict(os.environ, GIT_INDEX_FILE=other_index))
+    monkeypatch.setenv('GIT_INDEX_FILE', os.path.relpath(other_index, root))
+    out = io.BytesIO()
+
+    assert client.request(['convert', '--staged'], cwd=root, out=out) == 2
+
+    assert 'Found 2 staged markdown files' in out.getvalue().decode('utf-8')
+    monkeypatch.delenv('GIT_INDEX_FILE')
+    assert git('diff', '--cached', '--name-only') == 'Target.md\n'
+
+
+def test_no_server_means_run_locally(repo):
+    root, _ = repo({})
+    assert client.request(['check'], cwd=root, out=io.BytesIO()) is None
+    assert not client.stop(root)
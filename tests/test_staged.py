@@ -0,0 +1,57 @@
+import os
+
+from vaultlinks import gitindex
+from vaultlinks.blobcache import blob_id
+from vaultlinks.cli import main
+
+
+def test_staged_markdown_lists_added_and_modified_notes(repo):
+    root, git = repo({'A.md': 'a\n', 'B.md': 'b\n', 'image.png': 'png'})
+    git('add', '.')
+    git('commit', '-qm', 'init')
+    with open(os.path.join(root, 'A.md'), 'a') as f:
+        f.write('more\n')
+    repo({'new/C.md': 'c\n'})
+    git('add', 'A.md', 'new/C.md')
+
+    staged = gitindex.staged_markdown(root)
+
+    assert sorted(path for _, _, path in staged) == ['A.md', 'new/C.md']
+    blobs = gitindex.read_blobs([blob_id for _, blob_id, _ in staged], root)
+    assert sorted(blobs.values()) == [b'a\nmore\n', b'c\n']
+
+
+def test_write_blobs_and_update_index(repo):
+    root, git = repo({'A.md': 'a\n'})
+    git('add', 'A.md')
+
+    ids = gitindex.write_blobs([b'one\n', b'two\n', b''], root)
+
+    assert ids == [blob_id(data) for data in (b'one\n', b'two\n', b'')]
+    gitindex.update_index([('100644', ids[1], 'A.md')], root)
+    assert git('show', ':A.md') == 'two\n'
+    assert gitindex.write_blobs([], root) == []
+
+
+def test_convert_staged_rewrites_index_and_working_copy(repo):
+    root, git = repo({'Target.md': '# T\n', 'A.md': 'see [[Target]]\n', 'B.md': 'no links\n'})
+    git('add', '.')
+
+    # 2 tells the hook that notes were converted
+    assert main(['convert', '--staged']) == 2
+
+    assert git('show', ':A.md') == 'see [Target](Target.md)\n'
+    assert open(os.path.join(root, 'A.md')).read() == 'see [Target](Target.md)\n'
+    assert git('show', ':B.md') == 'no links\n'
+
+
+def test_convert_staged_keeps_unstaged_edits(repo):
+    root, git = repo({'Target.md': '# T\n', 'A.md': 'see [[Target]]\n'})
+    git('add', '.')
+    with open(os.path.join(root, 'A.md'), 'w') as f:
+        f.write('see [[Target]]\nunstaged line\n')
+
+    assert main(['convert', '--staged']) == 2
+
+    assert git('show', ':A.md') == 'see [Target](Target.md)\n'
+    assert open(os.path.join(root, 'A.md')).read() == 'see [[Target]]\nunstaged line\n'
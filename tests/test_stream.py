@@ -0,0 +1,47 @@
+import pytest
+
+from vaultlinks import stream
+from vaultlinks.convert import convert_content
+
+NOTE = ''.join(
+    f'## Part {i}\n\nSee [[Note {i}]] and [spaced](Other Note {i}.md).\n\n'
+    + ('```\n[[Not a link]]\n\nstill code [x](a b.md)\n```\n\n' if i % 3 == 0 else '')
+    + ('`[[inline]]` code\n\n' if i % 4 == 0 else '')
+    for i in range(60)
+)
+
+
+def transform(text):
+    return convert_content(text)[0]
+
+
+@pytest.mark.parametrize('chunk_bytes', [64, 200, 1024, 1 << 20])
+def test_streamed_rewrite_matches_whole_file(tmp_path, chunk_bytes):
+    source = tmp_path / 'big.md'
+    source.write_text(NOTE, encoding='utf-8')
+    dest = tmp_path / 'out.md'
+
+    size = stream.rewrite_file(str(source), transform, dest=str(dest), chunk_bytes=chunk_bytes)
+
+    expected = transform(NOTE)
+    assert size == len(expected.encode('utf-8'))
+    assert dest.read_text(encoding='utf-8') == expected
+    assert source.read_text(encoding='utf-8') == NOTE
+
+
+def test_segments_join_back_to_the_note(tmp_path):
+    source = tmp_path / 'big.md'
+    source.write_bytes(NOTE.encode('utf-8'))
+    with open(source, 'rb') as f:
+        pieces = list(stream.segments(f, 64))
+    assert len(pieces) > 1
+    # Some fences span pieces, so code is carried over from one to the next
+    assert any(in_code for _, in_code in pieces)
+    assert ''.join(text for text, _ in pieces) == NOTE
+
+
+def test_unchanged_note_is_not_written(tmp_path):
+    source = tmp_path / 'plain.md'
+    source.write_text('nothing to convert\n' * 100, encoding='utf-8')
+    assert stream.rewrite_file(str(source), transform, chunk_bytes=64) is None
+    assert [p.name for p in tmp_path.iterdir()] == ['plain.md']
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from vaultlinks import watch
+from vaultlinks.commands.convert import watch_vault
+from vaultlinks.noteindex import NoteIndex
+
+WATCHERS = [lambda root: watch.PollingWatcher(root, interval=0)]
+if watch.InotifyWatcher.available():
+    WATCHERS.append(watch.InotifyWatcher)
+
+
+@pytest.mark.parametrize('open_watcher', WATCHERS)
+def test_watchers_report_notes_and_attachments(vault, open_watcher):
+    root = vault({'A.md': 'a\n', 'assets/old.png': 'png'})
+    watcher = open_watcher(root)
+    try:
+        vault({'B.md': 'b\n', 'assets/new.png': 'png', 'sub/C.md': 'c\n'})
+        os.unlink(os.path.join(root, 'assets', 'old.png'))
+
+        changed = set()
+        for _ in range(5):
+            changed |= watcher.read(0.2)[0]
+    finally:
+        watcher.close()
+
+    assert {os.path.relpath(path, root) for path in changed} >= {
+        'B.md', os.path.join('assets', 'new.png'), os.path.join('assets', 'old.png'), os.path.join('sub', 'C.md')}
+
+
+def run_one_batch(root, monkeypatch, paths, quiet):
+    def batches(watcher, debounce):
+        yield {os.path.join(root, path) for path in paths}, False
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(watch, 'batches', batches)
+    note_index = NoteIndex.build(root, persist=False)
+    return note_index, watch_vault(root, None, note_index, force_polling=True, quiet=quiet)
+
+
+def test_attachments_saved_during_a_watch_reach_the_index(vault, monkeypatch):
+    root = vault({'notes/A.md': 'a\n'})
+    vault({'assets/pic.png': 'png', 'notes/B.md': 'see ![[pic.png]]\n'})
+
+    note_index, status = run_one_batch(root, monkeypatch, ['assets/pic.png', 'notes/B.md'], quiet=False)
+
+    assert status == 0
+    assert 'assets/pic.png' in note_index.attachments
+    assert open(os.path.join(root, 'notes', 'B.md')).read() == 'see ![pic.png](../assets/pic.png)\n'
+
+
+def test_quiet_watch_prints_one_line_per_batch(vault, monkeypatch, capsys):
+    root = vault({'A.md': 'a\n'})
+    vault({'B.md': 'see [[A]]\n', 'C.md': 'see [[B]]\n'})
+
+    run_one_batch(root, monkeypatch, ['B.md', 'C.md'], quiet=True)
+
+    output = capsys.readouterr().out
+    assert 'B.md' not in output
+    assert '✅ Converted 2 notes' in output
@@ -0,0 +1,92 @@
+import os
+
+from vaultlinks import writeback
+
+
+def test_undo_restores_rewritten_and_moved_notes(vault):
+    root = vault({'A.md': 'original a\n', 'dir/B.md': 'original b\n', 'C.md': 'untouched\n'})
+
+    with writeback.WriteBack(root, 'test', batch_files=1) as writer:
+        writer.write(os.path.join(root, 'A.md'), 'new a\n')
+        writer.write(os.path.join(root, 'dir', 'B.md'), 'new b\n')
+        writer.move(os.path.join(root, 'dir', 'B.md'), os.path.join(root, 'moved', 'B.md'))
+
+    assert open(os.path.join(root, 'A.md')).read() == 'new a\n'
+    assert open(os.path.join(root, 'moved', 'B.md')).read() == 'new b\n'
+    assert not os.path.exists(os.path.join(root, 'dir'))
+    assert writeback.load_journal(root).command == 'test'
+
+    restored, skipped, moved_back = writeback.undo(root)
+
+    assert sorted(restored) == ['A.md', 'dir/B.md']
+    assert skipped == []
+    assert moved_back == [('moved/B.md', 'dir/B.md')]
+    assert open(os.path.join(root, 'A.md')).read() == 'original a\n'
+    assert open(os.path.join(root, 'dir', 'B.md')).read() == 'original b\n'
+    assert open(os.path.join(root, 'C.md')).read() == 'untouched\n'
+    assert not os.path.exists(os.path.join(root, 'moved'))
+    assert writeback.load_journal(root) is None
+
+
+def test_undo_skips_notes_edited_since(vault):
+    root = vault({'A.md': 'original\n'})
+    path = os.path.join(root, 'A.md')
+    with writeback.WriteBack(root, 'test') as writer:
+        writer.write(path, 'converted\n')
+    with open(path, 'w') as f:
+        f.write('edited by hand\n')
+
+    restored, skipped, _ = writeback.undo(root)
+
+    assert restored == []
+    assert skipped == ['A.md']
+    assert open(path).read() == 'edited by hand\n'
+    assert writeback.undo(root, force=True)[0] == ['A.md']
+    assert open(path).read() == 'original\n'
+
+
+def test_failed_run_leaves_notes_and_no_temp_files(vault):
+    root = vault({'A.md': 'original\n'})
+    try:
+        with writeback.WriteBack(root, 'test') as writer:
+            writer.write(os.path.join(root, 'A.md'), 'half done\n')
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        pass
+    assert open(os.path.join(root, 'A.md')).read() == 'original\n'
+    assert sorted(os.listdir(root)) == ['A.md']
+
+
+def test_staged_files_are_synced_in_one_barrier_before_renames(vault, monkeypatch):
+    root = vault({'A.md': 'a\n', 'B.md': 'b\n'})
+    events = []
+    monkeypatch.setattr(writeback, '_fsync', lambda path: events.append(('sync', os.path.basename(path))))
+    real_replace = os.replace
+    monkeypatch.setattr(writeback.os, 'replace',
+                        lambda src, dst: events.append(('rename', os.path.basename(dst))) or real_replace(src, dst))
+
+    with writeback.WriteBack(root, 'test', journal=False) as writer:
+        writer.write(os.path.join(root, 'A.md'), 'new a\n')
+        writer.write(os.path.join(root, 'B.md'), 'new b\n')
+        assert events == []
+
+    assert events == [('sync', '.A.md.vaultlinks-tmp'), ('sync', '.B.md.vaultlinks-tmp'),
+                      ('rename', 'A.md'), ('rename', 'B.md')]
+    assert open(os.path.join(root, 'B.md')).read() == 'new b\n'
+
+
+def test_default_convert_writer_is_rooted_at_the_vault(vault, monkeypatch, tmp_path):
+    from vaultlinks.commands import convert
+    from vaultlinks.noteindex import NoteIndex
+
+    root = vault({'A.md': '[[B]]\n', 'B.md': 'b\n'})
+    roots = []
+    real = convert.WriteBack
+    monkeypatch.setattr(convert, 'WriteBack', lambda path, *args, **kwargs: roots.append(path) or real(path, *args, **kwargs))
+    monkeypatch.chdir(tmp_path)
+
+    files = [os.path.join(root, 'A.md'), os.path.join(root, 'B.md')]
+    results = list(convert.process_files(files, note_index=NoteIndex.build(root, persist=False)))
+
+    assert roots == [os.path.abspath(root)]
+    assert [modified for _, modified, _ in results] == [True, False]